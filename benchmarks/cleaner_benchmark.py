@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la etapa de limpieza de transacciones.
+
+Compara, por batch recibido desde el cliente, la proyeccion de columnas del
+Cleaner (slices sobre el payload, sin decodificar filas) contra decodificar
+a filas/columnas y volver a codificar, tomando como referencia la copia del
+mensaje crudo (decode/encode utf-8 que el middleware hace de todas formas).
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/cleaner_benchmark.py [--batch-size N] [--batches M]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from shared import communication_protocol
+
+SESSION_ID = "0123456789abcdef0123456789abcdef"
+
+COLUMNS_TO_KEEP = [
+    "created_at",
+    "store_id",
+    "final_amount",
+    "transaction_id",
+    "user_id",
+]
+
+
+def build_transactions_message(batch_size: int) -> str:
+    rng = random.Random(42)
+    batch = [
+        {
+            "transaction_id": f"{rng.getrandbits(128):032x}",
+            "store_id": str(rng.randrange(1, 11)),
+            "payment_method_id": str(rng.randrange(1, 5)),
+            "voucher_id": "",
+            "user_id": f"{rng.randrange(1, 1_000_000)}.0",
+            "original_amount": f"{rng.uniform(1, 100):.2f}",
+            "discount_applied": "0.0",
+            "final_amount": f"{rng.uniform(1, 100):.2f}",
+            "created_at": "2024-07-01 07:00:00",
+        }
+        for _ in range(batch_size)
+    ]
+    return communication_protocol.encode_batch_message(
+        communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE, SESSION_ID, batch
+    )
+
+
+def raw_copy(message: str) -> str:
+    return message.encode("utf-8").decode("utf-8")
+
+
+def rows_projection(message: str) -> str:
+    batch = [
+        {column: row[column] for column in COLUMNS_TO_KEEP}
+        for row in communication_protocol.decode_batch_message(message)
+    ]
+    return communication_protocol.encode_batch_message(
+        communication_protocol.get_message_type(message),
+        communication_protocol.get_message_session_id(message),
+        batch,
+    )
+
+
+def columns_projection(message: str) -> str:
+    batch = communication_protocol.decode_batch(message).project(COLUMNS_TO_KEEP)
+    return communication_protocol.encode_batch(
+        communication_protocol.get_message_type(message),
+        communication_protocol.get_message_session_id(message),
+        batch,
+    )
+
+
+def payload_projection(message: str) -> str:
+    return communication_protocol.project_batch_message(message, COLUMNS_TO_KEEP)
+
+
+def measure(
+    name: str,
+    transform: Callable[[str], str],
+    message: str,
+    batch_size: int,
+    batches_amount: int,
+) -> None:
+    start = time.perf_counter()
+    for _ in range(batches_amount):
+        transform(message)
+    rows_per_second = batch_size * batches_amount / (time.perf_counter() - start)
+    print(f"{name:<18} | {rows_per_second:>12,.0f} rows/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--batches", type=int, default=5_000)
+    args = parser.parse_args()
+
+    message = build_transactions_message(args.batch_size)
+    assert rows_projection(message) == payload_projection(message)
+    assert columns_projection(message) == payload_projection(message)
+    print(f"dataset: {args.batches} batches of {args.batch_size} transactions")
+
+    measure("raw copy", raw_copy, message, args.batch_size, args.batches)
+    measure("rows projection", rows_projection, message, args.batch_size, args.batches)
+    measure(
+        "columns projection",
+        columns_projection,
+        message,
+        args.batch_size,
+        args.batches,
+    )
+    measure(
+        "payload projection",
+        payload_projection,
+        message,
+        args.batch_size,
+        args.batches,
+    )
+
+
+if __name__ == "__main__":
+    main()
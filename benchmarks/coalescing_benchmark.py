@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark del buffer de coalescencia de filtros y mappers.
+
+Simula la salida de un filtro muy selectivo (la Query 1 deja pasar pocas
+filas de cada batch) y compara los mensajes enviados al broker, las filas
+por mensaje y el llenado promedio de cada batch sin coalescer (un mensaje
+por batch recibido) contra el CoalescingProducer, junto con su throughput.
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/coalescing_benchmark.py [--batches N] [--selectivity S]
+"""
+
+import argparse
+import random
+import time
+
+from controllers.shared.coalescing_producer import CoalescingProducer
+from shared import communication_protocol
+
+SESSION_ID = "0123456789abcdef0123456789abcdef"
+BATCH_SIZE = 200
+
+
+class ProducerCounter:
+    def __init__(self) -> None:
+        self.sent_messages_amount = 0
+        self.sent_bytes_amount = 0
+
+    def send(self, message: str) -> None:
+        self.sent_messages_amount += 1
+        self.sent_bytes_amount += len(message)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def build_filtered_messages(batches: int, selectivity: float) -> list[str]:
+    rng = random.Random(42)
+    messages = []
+    for _ in range(batches):
+        rows = [
+            {
+                "transaction_id": f"{rng.getrandbits(128):032x}",
+                "final_amount": f"{rng.uniform(75, 100):.2f}",
+            }
+            for _ in range(BATCH_SIZE)
+            if rng.random() < selectivity
+        ]
+        if len(rows) > 0:
+            messages.append(
+                communication_protocol.encode_batch_message(
+                    communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+                    SESSION_ID,
+                    rows,
+                )
+            )
+    return messages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batches", type=int, default=20_000)
+    parser.add_argument("--selectivity", type=float, default=0.05)
+    parser.add_argument("--max-rows", type=int, default=500)
+    parser.add_argument("--max-bytes", type=int, default=65536)
+    args = parser.parse_args()
+
+    messages = build_filtered_messages(args.batches, args.selectivity)
+    rows_amount = sum(
+        communication_protocol.get_batch_shape(message)[1] for message in messages
+    )
+    print(
+        f"dataset: {args.batches} batches of {BATCH_SIZE} rows, {rows_amount} kept rows"
+    )
+
+    direct = ProducerCounter()
+    for message in messages:
+        direct.send(message)
+
+    counter = ProducerCounter()
+    producer = CoalescingProducer(
+        counter, args.max_rows, args.max_bytes, max_seconds=60.0  # type: ignore
+    )
+    start = time.perf_counter()
+    for message in messages:
+        producer.send(message)
+    producer.flush()
+    elapsed_seconds = time.perf_counter() - start
+
+    print(f"{'':<12} | {'messages':>9} | {'rows/msg':>8} | {'KiB':>8} | {'fill':>5}")
+    print(
+        f"{'direct':<12} | {direct.sent_messages_amount:>9,} | {rows_amount / direct.sent_messages_amount:>8.1f} | {direct.sent_bytes_amount / 1024:>8,.0f} | {rows_amount / direct.sent_messages_amount / args.max_rows:>5.2f}"
+    )
+    print(
+        f"{'coalesced':<12} | {counter.sent_messages_amount:>9,} | {rows_amount / counter.sent_messages_amount:>8.1f} | {counter.sent_bytes_amount / 1024:>8,.0f} | {producer.average_fill():>5.2f}"
+    )
+    print(f"coalescing throughput: {rows_amount / elapsed_seconds:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark del combiner del mapper de year_month_created_at (Query 2).
+
+Mide, por batch de transaction items mapeados, cuantas filas y bytes se
+envian a los reducers de sellings_qty y profit_sum con y sin pre-agregar
+el batch por (item_id, year_month_created_at), y el costo de combinar.
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/combiner_benchmark.py [--batch-size N] [--batches M]
+"""
+
+import argparse
+import random
+import time
+
+from controllers.shared import reduce_functions
+from controllers.shared.combiner import Combiner
+from shared import communication_protocol
+from shared.batch import Batch
+
+SESSION_ID = "0123456789abcdef0123456789abcdef"
+
+
+def build_mapped_transaction_items(batch_size: int) -> Batch:
+    rng = random.Random(42)
+    rows = []
+    for _ in range(batch_size):
+        quantity = rng.randrange(1, 5)
+        month = rng.randrange(1, 13)
+        rows.append(
+            {
+                "transaction_id": f"{rng.getrandbits(128):032x}",
+                "item_id": str(rng.randrange(1, 9)),
+                "quantity": str(quantity),
+                "subtotal": f"{quantity * 4.5:.1f}",
+                "created_at": f"2024-{month:02d}-01 10:00:00",
+                "year_month_created_at": f"2024-{month:02d}",
+            }
+        )
+    return Batch.from_rows(rows)
+
+
+def encode(batch: Batch) -> str:
+    return communication_protocol.encode_batch(
+        communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE, SESSION_ID, batch
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--batches", type=int, default=2_000)
+    args = parser.parse_args()
+
+    batch = build_mapped_transaction_items(args.batch_size)
+    combiner = Combiner(
+        ["item_id", "year_month_created_at"],
+        {
+            "sellings_qty": reduce_functions.sum_quantity,
+            "profit_sum": reduce_functions.sum_subtotal,
+        },
+    )
+    print(f"dataset: {args.batches} batches of {args.batch_size} transaction items")
+
+    start = time.perf_counter()
+    for _ in range(args.batches):
+        combined_batch = combiner.combine(batch)
+    rows_per_second = args.batch_size * args.batches / (time.perf_counter() - start)
+
+    print(f"{'':<12} | {'rows':>6} | {'bytes':>8}")
+    print(f"{'raw':<12} | {len(batch):>6} | {len(encode(batch)):>8}")
+    print(
+        f"{'combined':<12} | {len(combined_batch):>6} | {len(encode(combined_batch)):>8}"
+    )
+    print(f"combine throughput: {rows_per_second:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la lectura y codificacion de los CSV del cliente.
+
+Genera archivos de transacciones en un directorio temporal y mide las filas
+por segundo (y MiB/s de CSV) hasta tener los mensajes listos para enviar,
+comparando la lectura previa (readline con buffer de 1 KiB y un dict por
+fila) contra la ingesta por segmentos con mmap, secuencial y con workers.
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/csv_ingestion_benchmark.py [--rows N] [--files F] [--workers W]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from client.csv_ingestion import CsvIngestion
+from shared import communication_protocol, constants
+
+SESSION_ID = "0123456789abcdef0123456789abcdef"
+BATCH_MAX_SIZE = 200
+BATCH_MAX_BYTES = 64 * constants.KiB
+
+
+def write_transactions_files(folder: Path, rows: int, files: int) -> list[Path]:
+    rng = random.Random(42)
+    paths = []
+    for file_number in range(files):
+        path = folder / f"transactions_{file_number}.csv"
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(
+                "transaction_id,store_id,payment_method_id,voucher_id,user_id,"
+                "original_amount,discount_applied,final_amount,created_at\n"
+            )
+            for _ in range(rows // files):
+                amount = rng.uniform(1, 100)
+                file.write(
+                    f"{rng.getrandbits(128):032x},{rng.randrange(1, 11)},"
+                    f"{rng.randrange(1, 5)},,{rng.randrange(1, 1_000_000)}.0,"
+                    f"{amount:.1f},0.0,{amount:.1f},2024-07-01 07:00:00\n"
+                )
+        paths.append(path)
+    return paths
+
+
+# ============================= READLINE (PREVIOUS) ============================== #
+
+
+def encode_all_reading_lines(paths: list[Path]) -> int:
+    messages_amount = 0
+    for path in paths:
+        with open(path, "r", encoding="utf-8", buffering=constants.KiB) as file:
+            column_names = file.readline().strip().split(",")
+            batch: list[dict[str, str]] = []
+            for line in file:
+                fields = line.strip().split(",")
+                batch.append({c: fields[i] for i, c in enumerate(column_names)})
+                if len(batch) == BATCH_MAX_SIZE:
+                    communication_protocol.encode_transactions_batch_message(
+                        SESSION_ID, batch
+                    )
+                    messages_amount += 1
+                    batch = []
+            if len(batch) > 0:
+                communication_protocol.encode_transactions_batch_message(
+                    SESSION_ID, batch
+                )
+                messages_amount += 1
+    return messages_amount
+
+
+# ============================= BENCHMARK ============================== #
+
+
+def encode_all_using(workers: int) -> Callable[[list[Path]], int]:
+    def encode_all(paths: list[Path]) -> int:
+        csv_ingestion = CsvIngestion(workers, BATCH_MAX_SIZE, BATCH_MAX_BYTES)
+        try:
+            return sum(
+                1
+                for _ in csv_ingestion.encoded_batches_of(
+                    paths,
+                    communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+                    SESSION_ID,
+                )
+            )
+        finally:
+            csv_ingestion.close()
+
+    return encode_all
+
+
+def measure(
+    name: str, encode_all: Callable[[list[Path]], int], paths: list[Path], rows: int
+) -> None:
+    csv_megabytes = sum(os.path.getsize(path) for path in paths) / constants.MiB
+
+    start = time.perf_counter()
+    messages_amount = encode_all(paths)
+    elapsed_seconds = time.perf_counter() - start
+
+    print(
+        f"{name:<18} | {rows / elapsed_seconds:>12,.0f} | {csv_megabytes / elapsed_seconds:>8,.1f} | {messages_amount:>9}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_transactions_files(Path(folder), args.rows, args.files)
+        rows = (args.rows // args.files) * args.files
+        print(f"dataset: {rows} transactions in {args.files} files")
+
+        print(f"{'':<18} | {'rows/s':>12} | {'MiB/s':>8} | {'messages':>9}")
+        measure("readline", encode_all_reading_lines, paths, rows)
+        measure("mmap segments", encode_all_using(1), paths, rows)
+        measure(
+            f"mmap {args.workers} workers",
+            encode_all_using(args.workers),
+            paths,
+            rows,
+        )
+
+
+if __name__ == "__main__":
+    main()
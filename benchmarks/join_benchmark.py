@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark del join entre transacciones y usuarios (Query 4).
+
+Mide el throughput del join por indice hash (BaseDataIndex) sobre el
+volumen pedido (por defecto 1M de transacciones contra 100k usuarios) y lo
+compara con el recorrido lineal previo, que por su costo O(n x m) solo se
+ejecuta sobre una muestra de transacciones y se extrapola.
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/join_benchmark.py [--transactions N] [--users M]
+"""
+
+import argparse
+import random
+import time
+from typing import Any
+
+from controllers.joiners.shared.base_data_index import BaseDataIndex
+
+JOIN_KEY = "user_id"
+
+
+def transform_function(value: str) -> Any:
+    return int(float(value))
+
+
+def build_users(users_amount: int) -> list[dict[str, str]]:
+    return [
+        {"user_id": str(user_id), "birthdate": "1990-01-01"}
+        for user_id in range(users_amount)
+    ]
+
+
+def build_transactions(
+    transactions_amount: int, users_amount: int
+) -> list[dict[str, str]]:
+    rng = random.Random(42)
+    return [
+        {
+            "store_id": str(rng.randrange(10)),
+            "user_id": f"{rng.randrange(users_amount)}.0",
+            "purchases_qty": "1",
+        }
+        for _ in range(transactions_amount)
+    ]
+
+
+def legacy_linear_join(
+    base_data: list[dict[str, str]], stream_data: list[dict[str, str]]
+) -> list[dict[str, str]]:
+    joined_data = []
+    for stream_item in stream_data:
+        for base_item in base_data:
+            base_value = transform_function(base_item[JOIN_KEY])
+            stream_value = transform_function(stream_item[JOIN_KEY])
+            if base_value == stream_value:
+                joined_data.append({**stream_item, **base_item})
+                break
+    return joined_data
+
+
+def indexed_join(
+    base_data_index: BaseDataIndex, stream_data: list[dict[str, str]]
+) -> list[dict[str, str]]:
+    joined_data = []
+    for stream_item in stream_data:
+        joined_item = base_data_index.join(stream_item)
+        if joined_item is not None:
+            joined_data.append(joined_item)
+    return joined_data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--legacy-sample", type=int, default=200)
+    args = parser.parse_args()
+
+    users = build_users(args.users)
+    transactions = build_transactions(args.transactions, args.users)
+    print(f"dataset: {args.transactions} transactions x {args.users} users")
+
+    start = time.perf_counter()
+    base_data_index = BaseDataIndex(JOIN_KEY, transform_function)
+    for user in users:
+        base_data_index.add(user)
+    index_build_seconds = time.perf_counter() - start
+    print(f"index build: {index_build_seconds:.3f}s")
+
+    start = time.perf_counter()
+    joined_data = indexed_join(base_data_index, transactions)
+    indexed_seconds = time.perf_counter() - start
+    indexed_rows_per_second = len(transactions) / indexed_seconds
+    print(
+        f"indexed join: {len(joined_data)} rows in {indexed_seconds:.3f}s "
+        f"({indexed_rows_per_second:,.0f} rows/s)"
+    )
+
+    legacy_sample = transactions[: args.legacy_sample]
+    start = time.perf_counter()
+    legacy_joined_data = legacy_linear_join(users, legacy_sample)
+    legacy_seconds = time.perf_counter() - start
+    legacy_rows_per_second = len(legacy_sample) / legacy_seconds
+    print(
+        f"linear join (sample of {len(legacy_sample)}): {legacy_seconds:.3f}s "
+        f"({legacy_rows_per_second:,.0f} rows/s, "
+        f"~{len(transactions) / legacy_rows_per_second:,.0f}s extrapolated)"
+    )
+
+    assert legacy_joined_data == joined_data[: len(legacy_joined_data)]
+    print(f"speedup: x{indexed_rows_per_second / legacy_rows_per_second:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
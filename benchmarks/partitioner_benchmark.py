@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark del reparto por claves entre los reducers de la Query 3.
+
+Mide la distribucion de filas por reducer (y el skew, filas del reducer mas
+cargado sobre el promedio) de las transacciones que los mappers de year half
+envian a los reducers de TPV, con pocas tiendas y una de ellas mucho mas
+vendedora que el resto, comparando las estrategias modulo, consistent_hash y
+hot_key_split (cada tienda repartida por year half).
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/partitioner_benchmark.py [--reducers N] [--rows M] [--hot-store-share S]
+"""
+
+import argparse
+import random
+import time
+
+from controllers.shared import partitioner as partitioning
+from shared import created_at
+
+
+def build_rows(rows_amount: int, hot_store_share: float) -> list[dict[str, str]]:
+    rng = random.Random(42)
+    rows = []
+    for _ in range(rows_amount):
+        store_id = "1" if rng.random() < hot_store_share else str(rng.randrange(2, 11))
+        year_half = f"{rng.choice([2024, 2025])}-H{rng.randrange(1, 3)}"
+        rows.append({"store_id": store_id, created_at.YEAR_HALF: year_half})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reducers", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--hot-store-share", type=float, default=0.4)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows, args.hot_store_share)
+
+    print(f"dataset: {args.rows} rows, {args.hot_store_share:.0%} of them of store 1")
+    print(f"{'':<16} | {'rows by reducer':<36} | {'skew':>5} | {'rows/s':>12}")
+    for name in [
+        partitioning.MODULO,
+        partitioning.CONSISTENT_HASH,
+        partitioning.HOT_KEY_SPLIT,
+    ]:
+        partitioner = partitioning.Partitioner(
+            "store_id",
+            partitioning.build_strategy(name, args.reducers, created_at.YEAR_HALF),
+            args.reducers,
+        )
+        start = time.perf_counter()
+        partitioner.partition([dict(row) for row in rows])
+        rows_per_second = args.rows / (time.perf_counter() - start)
+        print(
+            f"{name:<16} | {str(partitioner.rows_amount_by_shard()):<36} | {partitioner.skew():>5.2f} | {rows_per_second:>8,.0f} r/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del encoding de batches del protocolo de comunicacion.
+
+Compara el formato de texto previo ({"clave":"valor",...} por fila) contra
+el encoding v2 con header de columnas y valores con prefijo de longitud:
+bytes enviados por mensaje y filas por segundo al codificar/decodificar.
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/protocol_benchmark.py [--batch-size N] [--batches M]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from shared import communication_protocol
+
+SESSION_ID = "0123456789abcdef0123456789abcdef"
+
+
+def build_transactions_batch(batch_size: int) -> list[dict[str, str]]:
+    rng = random.Random(42)
+    return [
+        {
+            "transaction_id": f"{rng.getrandbits(128):032x}",
+            "store_id": str(rng.randrange(1, 11)),
+            "user_id": f"{rng.randrange(1, 1_000_000)}.0",
+            "final_amount": f"{rng.uniform(1, 100):.2f}",
+            "created_at": "2024-07-01 07:00:00",
+        }
+        for _ in range(batch_size)
+    ]
+
+
+def measure(
+    name: str,
+    encode: Callable[[str, str, list[dict[str, str]]], str],
+    decode: Callable[[str], list[dict[str, str]]],
+    batch: list[dict[str, str]],
+    batches_amount: int,
+) -> None:
+    message = encode(
+        communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE, SESSION_ID, batch
+    )
+    assert decode(message) == batch
+    rows_amount = len(batch) * batches_amount
+
+    start = time.perf_counter()
+    for _ in range(batches_amount):
+        encode(communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE, SESSION_ID, batch)
+    encode_rows_per_second = rows_amount / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(batches_amount):
+        decode(message)
+    decode_rows_per_second = rows_amount / (time.perf_counter() - start)
+
+    print(
+        f"{name:<5} | bytes/msg: {len(message.encode('utf-8')):>7,} "
+        f"| encode: {encode_rows_per_second:>11,.0f} rows/s "
+        f"| decode: {decode_rows_per_second:>11,.0f} rows/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--batches", type=int, default=2_000)
+    args = parser.parse_args()
+
+    batch = build_transactions_batch(args.batch_size)
+    print(f"dataset: {args.batches} batches of {args.batch_size} transactions")
+
+    measure(
+        "text",
+        communication_protocol.encode_text_batch_message,
+        communication_protocol.decode_text_batch_message,
+        batch,
+        args.batches,
+    )
+    measure(
+        "v2",
+        communication_protocol.encode_batch_message,
+        communication_protocol.decode_batch_message,
+        batch,
+        args.batches,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicializacion de productores RabbitMQ de un proceso.
+
+Compara crear un productor por shard con una conexion TCP propia cada uno
+(comportamiento previo) contra crearlos sobre el pool de conexiones del
+middleware, donde comparten una conexion y cada uno abre solo un canal.
+Requiere un RabbitMQ accesible (por defecto el del entorno de desarrollo,
+'rabbitmq-dev'); si no lo hay, se informa y no se ejecuta.
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/rabbitmq_connections_benchmark.py [--host HOST] [--producers N]
+"""
+
+import argparse
+import time
+
+import pika
+
+from middleware import rabbitmq_connection_pool
+from middleware.middleware import MessageMiddlewareDisconnectedError
+from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
+
+QUEUE_NAME_PREFIX = "benchmark-connections-queue"
+
+
+def measure_one_connection_per_producer(host: str, producers_amount: int) -> None:
+    start = time.perf_counter()
+    connections = []
+    for i in range(producers_amount):
+        connection = pika.BlockingConnection(
+            pika.ConnectionParameters(
+                host=host, credentials=pika.PlainCredentials("guest", "guest")
+            )
+        )
+        connection.channel().queue_declare(queue=f"{QUEUE_NAME_PREFIX}-{i}")
+        connections.append(connection)
+    elapsed_seconds = time.perf_counter() - start
+
+    print(
+        f"{'one connection each':<20} | {elapsed_seconds * 1000:>8.1f} ms"
+        f" | {len(connections):>3} connections"
+    )
+    for connection in connections:
+        connection.close()
+
+
+def measure_pooled_connection(host: str, producers_amount: int) -> None:
+    start = time.perf_counter()
+    producers = [
+        RabbitMQMessageMiddlewareQueue(host, f"{QUEUE_NAME_PREFIX}-{i}")
+        for i in range(producers_amount)
+    ]
+    elapsed_seconds = time.perf_counter() - start
+    connections_amount = rabbitmq_connection_pool.open_connections_amount()
+
+    print(
+        f"{'pooled connection':<20} | {elapsed_seconds * 1000:>8.1f} ms"
+        f" | {connections_amount:>3} connections"
+    )
+    for producer in producers:
+        producer.delete()
+        producer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="rabbitmq-dev")
+    parser.add_argument("--producers", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"dataset: {args.producers} producers")
+
+    try:
+        measure_pooled_connection(args.host, args.producers)
+        measure_one_connection_per_producer(args.host, args.producers)
+    except (MessageMiddlewareDisconnectedError, pika.exceptions.AMQPError) as e:
+        print(f"skipped: RabbitMQ is not reachable at '{args.host}' ({e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark de throughput de publicacion en RabbitMQ.
+
+Compara el envio sincronico mensaje a mensaje (comportamiento previo)
+contra el envio en buffer con send_many, con y sin confirmacion por
+ventana. Requiere un RabbitMQ accesible (por defecto el del entorno de
+desarrollo, 'rabbitmq-dev'); si no lo hay, se informa y no se ejecuta.
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/rabbitmq_publishing_benchmark.py [--host HOST] [--messages N]
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from middleware.middleware import MessageMiddlewareDisconnectedError
+from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
+
+QUEUE_NAME = "benchmark-publishing-queue"
+
+
+def send_one_by_one(
+    producer: RabbitMQMessageMiddlewareQueue, messages: list[str]
+) -> None:
+    for message in messages:
+        producer.send(message)
+
+
+def send_in_windows(
+    producer: RabbitMQMessageMiddlewareQueue, messages: list[str]
+) -> None:
+    producer.send_many(messages)
+    producer.flush()
+
+
+def measure(
+    name: str,
+    host: str,
+    messages: list[str],
+    send: Callable[[RabbitMQMessageMiddlewareQueue, list[str]], None],
+    **publishing_config,
+) -> None:
+    producer = RabbitMQMessageMiddlewareQueue(host, QUEUE_NAME, **publishing_config)
+    try:
+        start = time.perf_counter()
+        send(producer, messages)
+        messages_per_second = len(messages) / (time.perf_counter() - start)
+        print(f"{name:<26} | {messages_per_second:>10,.0f} msgs/s")
+    finally:
+        producer.delete()
+        producer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="rabbitmq-dev")
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--message-size", type=int, default=4_096)
+    parser.add_argument("--window", type=int, default=100)
+    args = parser.parse_args()
+
+    messages = ["x" * args.message_size] * args.messages
+    print(f"dataset: {args.messages} messages of {args.message_size} bytes")
+
+    try:
+        measure("per-message send", args.host, messages, send_one_by_one)
+        measure(
+            "per-message send + commit",
+            args.host,
+            messages,
+            send_one_by_one,
+            confirms=True,
+        )
+        measure(
+            f"buffered ({args.window})",
+            args.host,
+            messages,
+            send_one_by_one,
+            buffer_max_messages=args.window,
+            buffer_max_seconds=1.0,
+        )
+        measure(
+            f"buffered ({args.window}) + commit",
+            args.host,
+            messages,
+            send_one_by_one,
+            buffer_max_messages=args.window,
+            buffer_max_seconds=1.0,
+            confirms=True,
+        )
+        measure(
+            "send_many + commit",
+            args.host,
+            messages,
+            send_in_windows,
+            buffer_max_messages=len(messages),
+            buffer_max_seconds=60.0,
+            confirms=True,
+        )
+    except MessageMiddlewareDisconnectedError as e:
+        print(f"skipped: RabbitMQ is not reachable at '{args.host}' ({e})")
+
+
+if __name__ == "__main__":
+    main()
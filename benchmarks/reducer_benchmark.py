@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la agregacion por claves de los reducers.
+
+Mide filas por segundo reducidas por batch de mensaje, comparando la
+reduccion previa fila por fila (tupla de claves, lookup en el dict y la
+funcion de reduccion en Python) contra la agregacion por batch vectorizada
+con NumPy, para cada reducer: tpv (Q3), purchases_qty (Q4, cuenta filas),
+sellings_qty y profit_sum (Q2).
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/reducer_benchmark.py [--batch-size N] [--batches M]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from typing import Callable, Optional
+
+from controllers.reducers.shared.reduced_data import ReducedData
+from controllers.shared import reduce_functions
+from shared import communication_protocol
+from shared.batch import Batch
+
+SESSION_ID = "0123456789abcdef0123456789abcdef"
+
+
+def build_transactions(batch_size: int, batches: int) -> list[str]:
+    rng = random.Random(42)
+    messages = []
+    for _ in range(batches):
+        rows = []
+        for _ in range(batch_size):
+            rows.append(
+                {
+                    "store_id": str(rng.randrange(1, 11)),
+                    "user_id": str(rng.randrange(1, 20_000)),
+                    "final_amount": f"{rng.uniform(1, 100):.2f}",
+                    "year_half_created_at": f"{rng.choice([2024, 2025])}-H{rng.randrange(1, 3)}",
+                }
+            )
+        messages.append(
+            communication_protocol.encode_batch_message(
+                communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE, SESSION_ID, rows
+            )
+        )
+    return messages
+
+
+def build_transaction_items(batch_size: int, batches: int) -> list[str]:
+    rng = random.Random(42)
+    messages = []
+    for _ in range(batches):
+        rows = []
+        for _ in range(batch_size):
+            quantity = rng.randrange(1, 5)
+            rows.append(
+                {
+                    "item_id": str(rng.randrange(1, 9)),
+                    "quantity": str(quantity),
+                    "subtotal": f"{quantity * 4.5:.1f}",
+                    "year_month_created_at": f"2024-{rng.randrange(1, 13):02d}",
+                }
+            )
+        messages.append(
+            communication_protocol.encode_batch_message(
+                communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE,
+                SESSION_ID,
+                rows,
+            )
+        )
+    return messages
+
+
+def reduce_by_rows(
+    messages: list[str], keys: list[str], value_column_name: Optional[str]
+) -> dict[tuple, float]:
+    # the previous reduction, one batch item at a time
+    reduced_data: dict[tuple, float] = {}
+    for message in messages:
+        for batch_item in communication_protocol.decode_batch_message(message):
+            key = tuple(batch_item[k] for k in keys)
+            if "" in key:
+                continue
+            value = 1.0
+            if value_column_name is not None:
+                value = float(batch_item[value_column_name])
+            reduced_data[key] = reduced_data.get(key, 0) + value
+    return reduced_data
+
+
+def reduce_by_batches(
+    messages: list[str],
+    keys: list[str],
+    reduce_function: reduce_functions.ReduceFunction,
+) -> ReducedData:
+    reduced_data = ReducedData(keys, "value", tempfile.gettempdir())
+    for message in messages:
+        batch: Batch = communication_protocol.decode_batch(message)
+        reduced_data.reduce_batch(batch, reduce_function)
+    return reduced_data
+
+
+def rows_per_second(callback: Callable, rows_amount: int) -> float:
+    start = time.perf_counter()
+    callback()
+    return rows_amount / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--batches", type=int, default=300)
+    args = parser.parse_args()
+
+    transactions = build_transactions(args.batch_size, args.batches)
+    transaction_items = build_transaction_items(args.batch_size, args.batches)
+    rows_amount = args.batch_size * args.batches
+
+    reducers = [
+        (
+            "tpv",
+            transactions,
+            ["store_id", "year_half_created_at"],
+            reduce_functions.sum_final_amount,
+            "final_amount",
+        ),
+        (
+            "purchases_qty",
+            transactions,
+            ["store_id", "user_id"],
+            reduce_functions.count,
+            None,
+        ),
+        (
+            "sellings_qty",
+            transaction_items,
+            ["item_id", "year_month_created_at"],
+            reduce_functions.sum_quantity,
+            "quantity",
+        ),
+        (
+            "profit_sum",
+            transaction_items,
+            ["item_id", "year_month_created_at"],
+            reduce_functions.sum_subtotal,
+            "subtotal",
+        ),
+    ]
+
+    print(f"dataset: {args.batches} batches of {args.batch_size} rows")
+    print(f"{'':<14} | {'by rows':>14} | {'by batches':>14} | {'speedup':>7}")
+    for name, messages, keys, reduce_function, value_column_name in reducers:
+        by_rows = rows_per_second(
+            lambda: reduce_by_rows(messages, keys, value_column_name), rows_amount
+        )
+        by_batches = rows_per_second(
+            lambda: reduce_by_batches(messages, keys, reduce_function),
+            rows_amount,
+        )
+        print(
+            f"{name:<14} | {by_rows:>10,.0f} r/s | {by_batches:>10,.0f} r/s | {by_batches / by_rows:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga de sesiones concurrentes del servidor.
+
+Levanta el servidor en cada modo (un proceso por conexion contra el pool de
+workers con asyncio) y abre sesiones cortas desde muchos clientes a la vez:
+handshake, un batch por tipo de dato con su EOF y los EOF de resultados, que
+el propio benchmark publica haciendo de output builder. Mide sesiones por
+segundo y la memoria (RSS) del servidor por sesion concurrente.
+Requiere un RabbitMQ accesible (por defecto el del entorno de desarrollo,
+'rabbitmq-dev'); si no lo hay, se informa y no se ejecuta.
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/server_sessions_benchmark.py [--host HOST] [--sessions N] [--concurrency C]
+"""
+
+import argparse
+import multiprocessing
+import os
+import socket
+import threading
+import time
+
+import pika
+
+from middleware.middleware import MessageMiddlewareDisconnectedError
+from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
+from server.async_server import AsyncServer
+from server.server import Server
+from shared import communication_protocol, constants, framed_socket
+
+QUEUE_NAME_PREFIX = "benchmark-sessions"
+DATA_TYPES = [
+    constants.MENU_ITEMS,
+    constants.STORES,
+    constants.USERS,
+    constants.TRANSACTIONS,
+    constants.TRANSACTION_ITEMS,
+]
+QUERY_RESULTS = [
+    constants.QUERY_RESULT_1X,
+    constants.QUERY_RESULT_21,
+    constants.QUERY_RESULT_22,
+    constants.QUERY_RESULT_3X,
+    constants.QUERY_RESULT_4X,
+]
+
+
+def cleaners_data() -> dict:
+    return {
+        data_type: {
+            constants.QUEUE_PREFIX: f"{QUEUE_NAME_PREFIX}-dirty-{data_type}",
+            constants.WORKERS_AMOUNT: 1,
+        }
+        for data_type in DATA_TYPES
+    }
+
+
+def output_builders_data() -> dict:
+    return {
+        query_result: {
+            constants.QUEUE_PREFIX: f"{QUEUE_NAME_PREFIX}-qrs",
+            constants.WORKERS_AMOUNT: 1,
+        }
+        for query_result in QUERY_RESULTS
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("", 0))
+        return sock.getsockname()[1]
+
+
+# ============================= SERVER MEMORY ============================== #
+
+
+def rss_kib_of(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def children_pids_of(pid: int) -> list[int]:
+    children_pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat_file:
+                ppid = int(stat_file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children_pids.append(int(entry))
+    return children_pids
+
+
+def server_rss_kib(pid: int) -> int:
+    return rss_kib_of(pid) + sum(rss_kib_of(c) for c in children_pids_of(pid))
+
+
+class PeakMemorySampler:
+    def __init__(self, pid: int) -> None:
+        self._pid = pid
+        self._peak_rss_kib = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._sample)
+
+    def _sample(self) -> None:
+        while not self._stopped.is_set():
+            self._peak_rss_kib = max(self._peak_rss_kib, server_rss_kib(self._pid))
+            self._stopped.wait(0.05)
+
+    def __enter__(self) -> "PeakMemorySampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def peak_rss_kib(self) -> int:
+        return self._peak_rss_kib
+
+
+# ============================= FAKE CLIENTS ============================== #
+
+
+def connect(port: int) -> socket.socket:
+    for _ in range(100):
+        try:
+            return socket.create_connection(("127.0.0.1", port))
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+    raise ConnectionRefusedError(f"Server not listening on port {port}")
+
+
+def run_session(host: str, port: int, client_id: int) -> None:
+    client_socket = connect(port)
+    socket_reader = framed_socket.FramedSocketReader(client_socket, "server")
+    try:
+        framed_socket.send_framed_message(
+            client_socket,
+            communication_protocol.encode_handshake_message(
+                str(client_id), communication_protocol.ALL_QUERIES
+            ),
+        )
+        session_id, _ = communication_protocol.decode_handshake_message(
+            socket_reader.receive_message()
+        )
+
+        for data_type in DATA_TYPES:
+            framed_socket.send_framed_message(
+                client_socket,
+                communication_protocol.encode_batch_message(
+                    data_type, session_id, [{"id": str(client_id), "value": "1.0"}]
+                ),
+            )
+            framed_socket.send_framed_message(
+                client_socket,
+                communication_protocol.encode_eof_message(session_id, data_type),
+            )
+
+        # the benchmark plays the output builders of the session
+        results_queue = RabbitMQMessageMiddlewareQueue(
+            host, f"{QUEUE_NAME_PREFIX}-qrs-{session_id}"
+        )
+        for query_result in QUERY_RESULTS:
+            results_queue.send(
+                communication_protocol.encode_eof_message(session_id, query_result)
+            )
+        results_queue.close()
+
+        for _ in QUERY_RESULTS:
+            socket_reader.receive_message()
+    finally:
+        client_socket.close()
+
+
+def run_sessions(host: str, port: int, sessions: int, concurrency: int) -> None:
+    next_client_id = iter(range(sessions))
+    next_client_id_lock = threading.Lock()
+
+    def run_client() -> None:
+        while True:
+            with next_client_id_lock:
+                client_id = next(next_client_id, None)
+            if client_id is None:
+                return
+            run_session(host, port, client_id)
+
+    clients = [threading.Thread(target=run_client) for _ in range(concurrency)]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+
+
+# ============================= BENCHMARK ============================== #
+
+
+def build_server(
+    mode: str, port: int, host: str, concurrency: int, async_workers: int
+) -> Server:
+    if mode == "asyncio":
+        return AsyncServer(
+            port,
+            concurrency,
+            host,
+            cleaners_data(),
+            output_builders_data(),
+            async_workers,
+        )
+    return Server(port, concurrency, host, cleaners_data(), output_builders_data())
+
+
+def run_server(
+    mode: str, port: int, host: str, concurrency: int, async_workers: int
+) -> None:
+    build_server(mode, port, host, concurrency, async_workers).run()
+
+
+def measure(
+    mode: str, host: str, sessions: int, concurrency: int, async_workers: int
+) -> None:
+    port = free_port()
+    server_process = multiprocessing.Process(
+        target=run_server, args=(mode, port, host, concurrency, async_workers)
+    )
+    server_process.start()
+    try:
+        connect(port).close()
+        time.sleep(0.5)
+        idle_rss_kib = server_rss_kib(server_process.pid)
+
+        with PeakMemorySampler(server_process.pid) as sampler:
+            start = time.perf_counter()
+            run_sessions(host, port, sessions, concurrency)
+            elapsed_seconds = time.perf_counter() - start
+    finally:
+        server_process.terminate()
+        server_process.join()
+
+    rss_per_session_kib = (sampler.peak_rss_kib() - idle_rss_kib) / concurrency
+    print(
+        f"{mode:<10} | {sessions / elapsed_seconds:>10,.1f} | {idle_rss_kib / 1024:>9,.1f} | {sampler.peak_rss_kib() / 1024:>9,.1f} | {rss_per_session_kib:>12,.0f}"
+    )
+
+
+def delete_benchmark_queues(host: str) -> None:
+    for cleaner_data in cleaners_data().values():
+        queue = RabbitMQMessageMiddlewareQueue(
+            host, f"{cleaner_data[constants.QUEUE_PREFIX]}-0"
+        )
+        queue.delete()
+        queue.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="rabbitmq-dev")
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--async-workers", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"dataset: {args.sessions} sessions, {args.concurrency} concurrent")
+
+    try:
+        delete_benchmark_queues(args.host)
+        print(
+            f"{'':<10} | {'sessions/s':>10} | {'idle MiB':>9} | {'peak MiB':>9} | {'KiB/session':>12}"
+        )
+        for mode in ["processes", "asyncio"]:
+            measure(
+                mode, args.host, args.sessions, args.concurrency, args.async_workers
+            )
+        delete_benchmark_queues(args.host)
+    except (MessageMiddlewareDisconnectedError, pika.exceptions.AMQPError) as e:
+        print(f"skipped: RabbitMQ is not reachable at '{args.host}' ({e})")
+
+
+if __name__ == "__main__":
+    main()
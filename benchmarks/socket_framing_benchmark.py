@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recepcion de mensajes por el socket cliente/servidor.
+
+Envia por un par de sockets locales batches de transacciones hasta completar
+el volumen pedido (1 GiB por defecto) y mide el throughput de recepcion,
+comparando la lectura previa (chunks de 1 KiB buscando el delimitador "]")
+contra los frames con header de longitud leidos con recv_into.
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/socket_framing_benchmark.py [--megabytes N] [--batch-size M]
+"""
+
+import argparse
+import random
+import socket
+import threading
+import time
+from typing import Callable
+
+from shared import communication_protocol, constants, framed_socket
+
+SESSION_ID = "0123456789abcdef0123456789abcdef"
+
+
+def build_transactions_batch_message(batch_size: int) -> str:
+    rng = random.Random(42)
+    batch = [
+        {
+            "transaction_id": f"{rng.getrandbits(128):032x}",
+            "store_id": str(rng.randrange(1, 11)),
+            "user_id": f"{rng.randrange(1, 1_000_000)}.0",
+            "final_amount": f"{rng.uniform(1, 100):.2f}",
+            "created_at": "2024-07-01 07:00:00",
+        }
+        for _ in range(batch_size)
+    ]
+    return communication_protocol.encode_batch_message(
+        communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE, SESSION_ID, batch
+    )
+
+
+# ============================= DELIMITER SCAN (PREVIOUS) ============================== #
+
+
+class DelimiterScanReader:
+    def __init__(self, sock: socket.socket) -> None:
+        self._socket = sock
+        self._temp_buffer = b""
+
+    def _receive_messages_chunk(self) -> str:
+        end_delimiter = communication_protocol.MSG_END_DELIMITER.encode("utf-8")
+        bytes_received = self._temp_buffer
+        self._temp_buffer = b""
+
+        all_data_received = False
+        while not all_data_received:
+            chunk = self._socket.recv(constants.KiB)
+            if len(chunk) == 0:
+                raise OSError("Unexpected disconnection")
+
+            if chunk.endswith(end_delimiter):
+                all_data_received = True
+
+            if end_delimiter in chunk:
+                index = chunk.rindex(end_delimiter)
+                bytes_received += chunk[: index + len(end_delimiter)]
+                self._temp_buffer = chunk[index + len(end_delimiter) :]
+                all_data_received = True
+            else:
+                bytes_received += chunk
+
+        return bytes_received.decode("utf-8")
+
+    def receive_messages(self) -> list[str]:
+        messages = []
+        for message in self._receive_messages_chunk().split(
+            communication_protocol.MSG_END_DELIMITER
+        ):
+            if message != "":
+                messages.append(message + communication_protocol.MSG_END_DELIMITER)
+        return messages
+
+
+# ============================= BENCHMARK ============================== #
+
+
+def measure(
+    name: str,
+    encode: Callable[[str], bytes],
+    receive_all: Callable[[socket.socket, int], int],
+    message: str,
+    messages_amount: int,
+) -> None:
+    sender_socket, receiver_socket = socket.socketpair()
+    encoded_message = encode(message)
+
+    def send_all() -> None:
+        for _ in range(messages_amount):
+            sender_socket.sendall(encoded_message)
+        sender_socket.close()
+
+    sender = threading.Thread(target=send_all)
+    start = time.perf_counter()
+    sender.start()
+    received_bytes_amount = receive_all(receiver_socket, messages_amount)
+    elapsed_seconds = time.perf_counter() - start
+    sender.join()
+    receiver_socket.close()
+
+    assert received_bytes_amount == len(message) * messages_amount
+    megabytes = len(encoded_message) * messages_amount / constants.MiB
+    print(
+        f"{name:<16} | {megabytes / elapsed_seconds:>10,.1f} | {messages_amount / elapsed_seconds:>12,.0f}"
+    )
+
+
+def receive_all_scanning_delimiters(sock: socket.socket, messages_amount: int) -> int:
+    reader = DelimiterScanReader(sock)
+    received_bytes_amount = 0
+    received_messages_amount = 0
+    while received_messages_amount < messages_amount:
+        for message in reader.receive_messages():
+            received_bytes_amount += len(message)
+            received_messages_amount += 1
+    return received_bytes_amount
+
+
+def receive_all_framed(sock: socket.socket, messages_amount: int) -> int:
+    reader = framed_socket.FramedSocketReader(sock, "sender")
+    received_bytes_amount = 0
+    for _ in range(messages_amount):
+        received_bytes_amount += len(reader.receive_message())
+    return received_bytes_amount
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--megabytes", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    message = build_transactions_batch_message(args.batch_size)
+    messages_amount = max(1, args.megabytes * constants.MiB // len(message))
+    print(
+        f"dataset: {messages_amount} messages of {len(message)} bytes ({args.megabytes} MiB)"
+    )
+
+    print(f"{'':<16} | {'MiB/s':>10} | {'messages/s':>12}")
+    measure(
+        "delimiter scan",
+        lambda message: message.encode("utf-8"),
+        receive_all_scanning_delimiters,
+        message,
+        messages_amount,
+    )
+    measure(
+        "length prefix",
+        framed_socket.encode_frame,
+        receive_all_framed,
+        message,
+        messages_amount,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark del top-K por grupo de los sorters (Query 4).
+
+Mide el throughput de SortedDescData (un min-heap acotado a K por grupo, con
+claves numericas) sobre millones de filas reducidas (store_id, user_id,
+purchases_qty) y lo compara con la insercion lineal previa en una lista
+ordenada, que ademas comparaba los valores como strings.
+
+Uso:
+    PYTHONPATH=./src python3 benchmarks/sorter_benchmark.py [--rows N] [--groups G] [--top K]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from controllers.sorters.shared.sorted_desc_data import SortedDescData
+
+
+class LinearSortedDescData:
+    # previous implementation, kept as the baseline
+
+    def __init__(self, grouping_key: str, sort_key: str, amount_per_group: int):
+        self._grouping_key = grouping_key
+        self._sort_key = sort_key
+        self._amount_per_group = amount_per_group
+        self._sorted_desc_by_grouping_key: dict[str, list[dict[str, str]]] = {}
+
+    def add_batch_item_keeping_sort_desc(self, batch_item: dict[str, str]) -> None:
+        sort_value = batch_item[self._sort_key]
+        sorted_desc_batch_items = self._sorted_desc_by_grouping_key.setdefault(
+            batch_item[self._grouping_key], []
+        )
+
+        index = 0
+        while index < len(sorted_desc_batch_items):
+            if sort_value > sorted_desc_batch_items[index][self._sort_key]:
+                break
+            index += 1
+
+        sorted_desc_batch_items.insert(index, batch_item)
+        if len(sorted_desc_batch_items) > self._amount_per_group:
+            sorted_desc_batch_items.pop()
+
+    def pop_next_batch_item(self) -> dict[str, str]:
+        key = next(iter(self._sorted_desc_by_grouping_key))
+        batch_item = self._sorted_desc_by_grouping_key[key].pop(0)
+        if not self._sorted_desc_by_grouping_key[key]:
+            del self._sorted_desc_by_grouping_key[key]
+        return batch_item
+
+    def is_empty(self) -> bool:
+        return len(self._sorted_desc_by_grouping_key) == 0
+
+
+def build_reduced_rows(rows_amount: int, groups_amount: int) -> list[dict[str, str]]:
+    rng = random.Random(42)
+    return [
+        {
+            "store_id": str(rng.randrange(groups_amount)),
+            "user_id": str(rng.randrange(1_000_000)),
+            "purchases_qty": str(rng.randrange(1, 100)),
+        }
+        for _ in range(rows_amount)
+    ]
+
+
+def sort_desc(
+    sorted_desc_data: SortedDescData | LinearSortedDescData,
+    rows: list[dict[str, str]],
+) -> list[dict[str, str]]:
+    for row in rows:
+        sorted_desc_data.add_batch_item_keeping_sort_desc(row)
+
+    sorted_rows = []
+    while not sorted_desc_data.is_empty():
+        sorted_rows.append(sorted_desc_data.pop_next_batch_item())
+    return sorted_rows
+
+
+def measure(
+    name: str,
+    build: Callable[[], SortedDescData | LinearSortedDescData],
+    rows: list[dict[str, str]],
+) -> list[dict[str, str]]:
+    start = time.perf_counter()
+    sorted_rows = sort_desc(build(), rows)
+    rows_per_second = len(rows) / (time.perf_counter() - start)
+    print(f"{name:<14} | {rows_per_second:>12,.0f} rows/s")
+    return sorted_rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--groups", type=int, default=10)
+    parser.add_argument("--top", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = build_reduced_rows(args.rows, args.groups)
+    print(f"dataset: {args.rows} rows in {args.groups} groups, top {args.top}")
+
+    measure(
+        "linear insert",
+        lambda: LinearSortedDescData("store_id", "purchases_qty", args.top),
+        rows,
+    )
+    sorted_rows = measure(
+        "bounded heap",
+        lambda: SortedDescData("store_id", "purchases_qty", args.top),
+        rows,
+    )
+    assert len(sorted_rows) == args.groups * args.top
+
+
+if __name__ == "__main__":
+    main()
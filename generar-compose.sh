@@ -68,7 +68,11 @@ function add-client-service() {
   add-line $compose_file '      - SERVER_PORT=5000'
   add-line $compose_file '      - DATA_PATH=/data'
   add-line $compose_file '      - RESULTS_PATH=/results'
+  add-line $compose_file '      - RESULTS_FORMAT=${RESULTS_FORMAT}'
   add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
+  add-line $compose_file '      - BATCH_MAX_BYTES=${CLIENT_BATCH_MAX_BYTES}'
+  add-line $compose_file '      - CSV_READER_WORKERS=${CLIENT_CSV_READER_WORKERS}'
+  add-line $compose_file '      - DATA_STREAMS=${CLIENT_DATA_STREAMS}'
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    volumes:'
@@ -110,6 +114,10 @@ function add-server-service() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file '      - SERVER_PORT=5000'
   add-line $compose_file '      - SERVER_LISTEN_BACKLOG=${SERVER_LISTEN_BACKLOG}'
+  add-line $compose_file '      - SERVER_MODE=${SERVER_MODE}'
+  add-line $compose_file '      - SERVER_ASYNC_WORKERS=${SERVER_ASYNC_WORKERS}'
+  add-line $compose_file '      - DISPATCH_POLICY=${DISPATCH_POLICY}'
+  add-line $compose_file '      - DISPATCH_REFRESH_EVERY_MESSAGES=${DISPATCH_REFRESH_EVERY_MESSAGES}'
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
   add-line $compose_file '      - MENU_ITEMS_CLN_AMOUNT=1'
   add-line $compose_file '      - STORES_CLN_AMOUNT=1'
@@ -149,7 +157,13 @@ function add-menu-cleaner() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file '      - CONTROLLER_ID=0'
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q2_JOINERS_AMOUNT"
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_MESSAGES=${PUBLISH_BUFFER_MAX_MESSAGES}'
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_SECONDS=${PUBLISH_BUFFER_MAX_SECONDS}'
+  add-line $compose_file '      - PUBLISHER_CONFIRMS=${PUBLISHER_CONFIRMS}'
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -168,6 +182,9 @@ function add-stores-cleaner() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file '      - CONTROLLER_ID=0'
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   local greater_join_amount
   if (( $Q3_JOINERS_AMOUNT>$Q4_TRANSACTIONS_WITH_STORES_JOINERS_AMOUNT)); then
     greater_join_amount=$Q3_JOINERS_AMOUNT
@@ -175,6 +192,9 @@ function add-stores-cleaner() {
     greater_join_amount=$Q4_TRANSACTIONS_WITH_STORES_JOINERS_AMOUNT
   fi
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$greater_join_amount"
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_MESSAGES=${PUBLISH_BUFFER_MAX_MESSAGES}'
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_SECONDS=${PUBLISH_BUFFER_MAX_SECONDS}'
+  add-line $compose_file '      - PUBLISHER_CONFIRMS=${PUBLISHER_CONFIRMS}'
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -194,7 +214,13 @@ function add-transaction-items-cleaner() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$FILTER_TRANSACTION_ITEMS_BY_YEAR_AMOUNT"
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_MESSAGES=${PUBLISH_BUFFER_MAX_MESSAGES}'
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_SECONDS=${PUBLISH_BUFFER_MAX_SECONDS}'
+  add-line $compose_file '      - PUBLISHER_CONFIRMS=${PUBLISHER_CONFIRMS}'
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -214,7 +240,13 @@ function add-transactions-cleaner() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$FILTER_TRANSACTIONS_BY_YEAR_AMOUNT"
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_MESSAGES=${PUBLISH_BUFFER_MAX_MESSAGES}'
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_SECONDS=${PUBLISH_BUFFER_MAX_SECONDS}'
+  add-line $compose_file '      - PUBLISHER_CONFIRMS=${PUBLISHER_CONFIRMS}'
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -234,7 +266,13 @@ function add-users-cleaner() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q4_TRANSACTIONS_WITH_USERS_JOINERS_AMOUNT"
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_MESSAGES=${PUBLISH_BUFFER_MAX_MESSAGES}'
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_SECONDS=${PUBLISH_BUFFER_MAX_SECONDS}'
+  add-line $compose_file '      - PUBLISHER_CONFIRMS=${PUBLISHER_CONFIRMS}'
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -281,9 +319,23 @@ function add-transactions-filter-by-year() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$TRANSACTIONS_CLN_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$FILTER_TRANSACTIONS_BY_HOUR_AMOUNT"
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_MESSAGES=${PUBLISH_BUFFER_MAX_MESSAGES}'
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_SECONDS=${PUBLISH_BUFFER_MAX_SECONDS}'
+  add-line $compose_file '      - PUBLISHER_CONFIRMS=${PUBLISHER_CONFIRMS}'
+  add-line $compose_file '      - COALESCE_MAX_ROWS=${COALESCE_MAX_ROWS}'
+  add-line $compose_file '      - COALESCE_MAX_BYTES=${COALESCE_MAX_BYTES}'
+  add-line $compose_file '      - COALESCE_MAX_SECONDS=${COALESCE_MAX_SECONDS}'
   add-line $compose_file "      - YEARS_TO_KEEP=$YEARS_TO_KEEP"
+  add-line $compose_file "      - FUSE_Q1_FILTERS=$FUSE_Q1_FILTERS"
+  add-line $compose_file "      - MIN_HOUR=$MIN_HOUR"
+  add-line $compose_file "      - MAX_HOUR=$MAX_HOUR"
+  add-line $compose_file "      - MIN_FINAL_AMOUNT=$MIN_FINAL_AMOUNT"
+  add-line $compose_file "      - Q1X_OB_AMOUNT=$Q1X_OB_AMOUNT"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -303,8 +355,17 @@ function add-transactions-filter-by-hour() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$FILTER_TRANSACTIONS_BY_YEAR_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$FILTER_TRANSACTIONS_BY_FINAL_AMNT_AMOUNT"
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_MESSAGES=${PUBLISH_BUFFER_MAX_MESSAGES}'
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_SECONDS=${PUBLISH_BUFFER_MAX_SECONDS}'
+  add-line $compose_file '      - PUBLISHER_CONFIRMS=${PUBLISHER_CONFIRMS}'
+  add-line $compose_file '      - COALESCE_MAX_ROWS=${COALESCE_MAX_ROWS}'
+  add-line $compose_file '      - COALESCE_MAX_BYTES=${COALESCE_MAX_BYTES}'
+  add-line $compose_file '      - COALESCE_MAX_SECONDS=${COALESCE_MAX_SECONDS}'
   add-line $compose_file "      - MIN_HOUR=$MIN_HOUR"
   add-line $compose_file "      - MAX_HOUR=$MAX_HOUR"
   add-line $compose_file '    networks:'
@@ -326,8 +387,17 @@ function add-transactions-filter-by-amount() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$FILTER_TRANSACTIONS_BY_HOUR_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q1X_OB_AMOUNT"
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_MESSAGES=${PUBLISH_BUFFER_MAX_MESSAGES}'
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_SECONDS=${PUBLISH_BUFFER_MAX_SECONDS}'
+  add-line $compose_file '      - PUBLISHER_CONFIRMS=${PUBLISHER_CONFIRMS}'
+  add-line $compose_file '      - COALESCE_MAX_ROWS=${COALESCE_MAX_ROWS}'
+  add-line $compose_file '      - COALESCE_MAX_BYTES=${COALESCE_MAX_BYTES}'
+  add-line $compose_file '      - COALESCE_MAX_SECONDS=${COALESCE_MAX_SECONDS}'
   add-line $compose_file "      - MIN_FINAL_AMOUNT=$MIN_FINAL_AMOUNT"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
@@ -348,8 +418,17 @@ function add-transaction-items-filter-by-year() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$TRANSACTION_ITEMS_CLN_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$YEAR_MONTH_CREATED_AT_TRANSACTION_ITEMS_MAPPERS_AMOUNT"
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_MESSAGES=${PUBLISH_BUFFER_MAX_MESSAGES}'
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_SECONDS=${PUBLISH_BUFFER_MAX_SECONDS}'
+  add-line $compose_file '      - PUBLISHER_CONFIRMS=${PUBLISHER_CONFIRMS}'
+  add-line $compose_file '      - COALESCE_MAX_ROWS=${COALESCE_MAX_ROWS}'
+  add-line $compose_file '      - COALESCE_MAX_BYTES=${COALESCE_MAX_BYTES}'
+  add-line $compose_file '      - COALESCE_MAX_SECONDS=${COALESCE_MAX_SECONDS}'
   add-line $compose_file "      - YEARS_TO_KEEP=$YEARS_TO_KEEP"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
@@ -371,10 +450,13 @@ function add-filters() {
     add-empty-line $compose_file
   done
   
-  for((i=0;i<$FILTER_TRANSACTIONS_BY_FINAL_AMNT_AMOUNT;i++)); do
-    add-transactions-filter-by-amount $compose_file $i
-    add-empty-line $compose_file
-  done
+  # [IMPORTANT] fused query 1 filters run inside the year filters
+  if [ "$FUSE_Q1_FILTERS" != "true" ]; then
+    for((i=0;i<$FILTER_TRANSACTIONS_BY_FINAL_AMNT_AMOUNT;i++)); do
+      add-transactions-filter-by-amount $compose_file $i
+      add-empty-line $compose_file
+    done
+  fi
   
   for((i=0;i<$FILTER_TRANSACTION_ITEMS_BY_YEAR_AMOUNT;i++)); do
     add-transaction-items-filter-by-year $compose_file $i
@@ -396,8 +478,18 @@ function add-year-month-created-at-mapper() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$FILTER_TRANSACTION_ITEMS_BY_YEAR_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q2_REDUCERS_AMOUNT"
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_MESSAGES=${PUBLISH_BUFFER_MAX_MESSAGES}'
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_SECONDS=${PUBLISH_BUFFER_MAX_SECONDS}'
+  add-line $compose_file '      - PUBLISHER_CONFIRMS=${PUBLISHER_CONFIRMS}'
+  add-line $compose_file '      - COALESCE_MAX_ROWS=${COALESCE_MAX_ROWS}'
+  add-line $compose_file '      - COALESCE_MAX_BYTES=${COALESCE_MAX_BYTES}'
+  add-line $compose_file '      - COALESCE_MAX_SECONDS=${COALESCE_MAX_SECONDS}'
+  add-line $compose_file '      - COMBINE_BATCHES=${COMBINE_BATCHES}'
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -417,8 +509,19 @@ function add-year-half-created-at-mapper() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$FILTER_TRANSACTIONS_BY_HOUR_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q3_REDUCERS_AMOUNT"
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_MESSAGES=${PUBLISH_BUFFER_MAX_MESSAGES}'
+  add-line $compose_file '      - PUBLISH_BUFFER_MAX_SECONDS=${PUBLISH_BUFFER_MAX_SECONDS}'
+  add-line $compose_file '      - PUBLISHER_CONFIRMS=${PUBLISHER_CONFIRMS}'
+  add-line $compose_file '      - COALESCE_MAX_ROWS=${COALESCE_MAX_ROWS}'
+  add-line $compose_file '      - COALESCE_MAX_BYTES=${COALESCE_MAX_BYTES}'
+  add-line $compose_file '      - COALESCE_MAX_SECONDS=${COALESCE_MAX_SECONDS}'
+  add-line $compose_file '      - PARTITION_STRATEGY=${Q3_PARTITION_STRATEGY}'
+  add-line $compose_file '      - COMBINE_BATCHES=${COMBINE_BATCHES}'
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -454,6 +557,11 @@ function add-selling-qty-reducer() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
+  add-line $compose_file '      - REDUCER_MAX_KEYS_IN_MEMORY=${REDUCER_MAX_KEYS_IN_MEMORY}'
+  add-line $compose_file '      - REDUCER_SPILL_DIR=${REDUCER_SPILL_DIR}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$YEAR_MONTH_CREATED_AT_TRANSACTION_ITEMS_MAPPERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q2_SORTERS_AMOUNT"
   add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
@@ -476,6 +584,11 @@ function add-profit-sum-reducer() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
+  add-line $compose_file '      - REDUCER_MAX_KEYS_IN_MEMORY=${REDUCER_MAX_KEYS_IN_MEMORY}'
+  add-line $compose_file '      - REDUCER_SPILL_DIR=${REDUCER_SPILL_DIR}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$YEAR_MONTH_CREATED_AT_TRANSACTION_ITEMS_MAPPERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q2_SORTERS_AMOUNT"
   add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
@@ -498,6 +611,13 @@ function add-tpv-by-store-reducer() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
+  add-line $compose_file '      - DISPATCH_POLICY=${DISPATCH_POLICY}'
+  add-line $compose_file '      - DISPATCH_REFRESH_EVERY_MESSAGES=${DISPATCH_REFRESH_EVERY_MESSAGES}'
+  add-line $compose_file '      - REDUCER_MAX_KEYS_IN_MEMORY=${REDUCER_MAX_KEYS_IN_MEMORY}'
+  add-line $compose_file '      - REDUCER_SPILL_DIR=${REDUCER_SPILL_DIR}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$YEAR_HALF_CREATED_AT_TRANSACTIONS_MAPPERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q3_JOINERS_AMOUNT"
   add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
@@ -520,6 +640,11 @@ function add-user-purchase-by-store-reducer() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
+  add-line $compose_file '      - REDUCER_MAX_KEYS_IN_MEMORY=${REDUCER_MAX_KEYS_IN_MEMORY}'
+  add-line $compose_file '      - REDUCER_SPILL_DIR=${REDUCER_SPILL_DIR}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$FILTER_TRANSACTIONS_BY_YEAR_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q4_SORTERS_AMOUNT"
   add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
@@ -568,6 +693,9 @@ function add-selling-qty-sorter(){
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$Q2_REDUCERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q2_JOINERS_AMOUNT"
   add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
@@ -591,6 +719,9 @@ function add-profit-sum-sorter(){
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$Q2_REDUCERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q2_JOINERS_AMOUNT"
   add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
@@ -614,6 +745,9 @@ function add-user-purchase-by-store-sorter(){
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$Q4_REDUCERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q4_TRANSACTIONS_WITH_USERS_JOINERS_AMOUNT"
   add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
@@ -658,6 +792,13 @@ function add-menu-with-items-q21-joiner(){
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
+  add-line $compose_file '      - DISPATCH_POLICY=${DISPATCH_POLICY}'
+  add-line $compose_file '      - DISPATCH_REFRESH_EVERY_MESSAGES=${DISPATCH_REFRESH_EVERY_MESSAGES}'
+  add-line $compose_file '      - JOINER_MAX_BUFFERED_BYTES_PER_SESSION=${JOINER_MAX_BUFFERED_BYTES_PER_SESSION}'
+  add-line $compose_file '      - JOINER_SPILL_DIR=${JOINER_SPILL_DIR}'
   add-line $compose_file '      - BASE_DATA_PREV_CONTROLLERS_AMOUNT=1'
   add-line $compose_file "      - STREAM_DATA_PREV_CONTROLLERS_AMOUNT=$Q2_SORTERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q21_OB_AMOUNT"
@@ -680,6 +821,13 @@ function add-menu-with-items-q22-joiner(){
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
+  add-line $compose_file '      - DISPATCH_POLICY=${DISPATCH_POLICY}'
+  add-line $compose_file '      - DISPATCH_REFRESH_EVERY_MESSAGES=${DISPATCH_REFRESH_EVERY_MESSAGES}'
+  add-line $compose_file '      - JOINER_MAX_BUFFERED_BYTES_PER_SESSION=${JOINER_MAX_BUFFERED_BYTES_PER_SESSION}'
+  add-line $compose_file '      - JOINER_SPILL_DIR=${JOINER_SPILL_DIR}'
   add-line $compose_file '      - BASE_DATA_PREV_CONTROLLERS_AMOUNT=1'
   add-line $compose_file "      - STREAM_DATA_PREV_CONTROLLERS_AMOUNT=$Q2_SORTERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q22_OB_AMOUNT"
@@ -702,6 +850,13 @@ function add-transactions-with-stores-q3x-joiner(){
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
+  add-line $compose_file '      - DISPATCH_POLICY=${DISPATCH_POLICY}'
+  add-line $compose_file '      - DISPATCH_REFRESH_EVERY_MESSAGES=${DISPATCH_REFRESH_EVERY_MESSAGES}'
+  add-line $compose_file '      - JOINER_MAX_BUFFERED_BYTES_PER_SESSION=${JOINER_MAX_BUFFERED_BYTES_PER_SESSION}'
+  add-line $compose_file '      - JOINER_SPILL_DIR=${JOINER_SPILL_DIR}'
   add-line $compose_file "      - OUTPUT_BUILDERS_AMOUNT=$Q3X_OB_AMOUNT"
   add-line $compose_file '      - BASE_DATA_PREV_CONTROLLERS_AMOUNT=1' 
   add-line $compose_file "      - STREAM_DATA_PREV_CONTROLLERS_AMOUNT=$Q3_REDUCERS_AMOUNT"
@@ -725,6 +880,13 @@ function add-transactions-with-stores-q4x-joiner(){
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
+  add-line $compose_file '      - DISPATCH_POLICY=${DISPATCH_POLICY}'
+  add-line $compose_file '      - DISPATCH_REFRESH_EVERY_MESSAGES=${DISPATCH_REFRESH_EVERY_MESSAGES}'
+  add-line $compose_file '      - JOINER_MAX_BUFFERED_BYTES_PER_SESSION=${JOINER_MAX_BUFFERED_BYTES_PER_SESSION}'
+  add-line $compose_file '      - JOINER_SPILL_DIR=${JOINER_SPILL_DIR}'
   add-line $compose_file '      - BASE_DATA_PREV_CONTROLLERS_AMOUNT=1' 
   add-line $compose_file "      - STREAM_DATA_PREV_CONTROLLERS_AMOUNT=$Q4_TRANSACTIONS_WITH_USERS_JOINERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q4X_OB_AMOUNT"
@@ -747,6 +909,13 @@ function add-transactions-with-users-q4x-joiner(){
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
+  add-line $compose_file '      - DISPATCH_POLICY=${DISPATCH_POLICY}'
+  add-line $compose_file '      - DISPATCH_REFRESH_EVERY_MESSAGES=${DISPATCH_REFRESH_EVERY_MESSAGES}'
+  add-line $compose_file '      - JOINER_MAX_BUFFERED_BYTES_PER_SESSION=${JOINER_MAX_BUFFERED_BYTES_PER_SESSION}'
+  add-line $compose_file '      - JOINER_SPILL_DIR=${JOINER_SPILL_DIR}'
   add-line $compose_file "      - BASE_DATA_PREV_CONTROLLERS_AMOUNT=$USERS_CLN_AMOUNT"
   add-line $compose_file "      - STREAM_DATA_PREV_CONTROLLERS_AMOUNT=$Q4_REDUCERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q4_TRANSACTIONS_WITH_STORES_JOINERS_AMOUNT"
@@ -791,6 +960,10 @@ function add-joiners() {
 function add-query-1x-output-builder() {
   local compose_file=$1
   local current_id=$2
+  local prev_controllers_amount=$FILTER_TRANSACTIONS_BY_FINAL_AMNT_AMOUNT
+  if [ "$FUSE_Q1_FILTERS" == "true" ]; then
+    prev_controllers_amount=$FILTER_TRANSACTIONS_BY_YEAR_AMOUNT
+  fi
   add-line $compose_file "  query_1x_output_builder_$current_id:"
   add-line $compose_file "    container_name: query_1x_output_builder_$current_id"
   add-line $compose_file '    image: query_1x_output_builder:latest'
@@ -800,7 +973,10 @@ function add-query-1x-output-builder() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
-  add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$FILTER_TRANSACTIONS_BY_FINAL_AMNT_AMOUNT"
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
+  add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$prev_controllers_amount"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -820,6 +996,9 @@ function add-query-21-output-builder() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$Q2_JOINERS_AMOUNT"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
@@ -840,6 +1019,9 @@ function add-query-22-output-builder() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$Q2_JOINERS_AMOUNT"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
@@ -860,6 +1042,9 @@ function add-query-3x-output-builder() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$Q3_JOINERS_AMOUNT"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
@@ -880,6 +1065,9 @@ function add-query-4x-output-builder() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
+  add-line $compose_file '      - PREFETCH_COUNT=${PREFETCH_COUNT}'
+  add-line $compose_file '      - ACK_EVERY_MESSAGES=${ACK_EVERY_MESSAGES}'
+  add-line $compose_file '      - ACK_EVERY_MS=${ACK_EVERY_MS}'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$Q4_TRANSACTIONS_WITH_STORES_JOINERS_AMOUNT"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
@@ -1000,4 +1188,4 @@ compose_filename_param=$1
 
 echo "Nombre del archivo de salida: $compose_filename_param"
 
-build-docker-compose-file $compose_filename_param
\ No newline at end of file
+build-docker-compose-file $compose_filename_param
@@ -1,11 +1,18 @@
 import logging
 import signal
 import socket
-from io import TextIOWrapper
+import threading
+import time
 from pathlib import Path
 from typing import Any, Callable
 
-from shared import communication_protocol, constants, shell_cmd
+from client.csv_ingestion import CsvIngestion
+from client.query_result_sink import (
+    QUERY_RESULT_SINK_CLASS_BY_FORMAT,
+    QueryResultSink,
+    build_query_result_sink,
+)
+from shared import communication_protocol, constants, framed_socket, shell_cmd
 
 
 class Client:
@@ -19,7 +26,11 @@ class Client:
         server_port: int,
         data_path: str,
         results_path: str,
+        results_format: str,
         batch_max_size: int,
+        batch_max_bytes: int,
+        csv_reader_workers: int,
+        data_streams: bool,
     ):
         self._client_id = client_id
         self._session_id = "<not_set>"
@@ -33,14 +44,32 @@ class Client:
         self._output_path.mkdir(parents=True, exist_ok=True)
         shell_cmd.shell_silent(f"rm -f {self._output_path}/*")
 
-        self._batch_max_size = batch_max_size
+        if results_format not in QUERY_RESULT_SINK_CLASS_BY_FORMAT:
+            raise ValueError(f"Unknown query results format: {results_format}")
+        self._results_format = results_format
+        self._query_result_sinks: dict[str, QueryResultSink] = {}
+        self._session_start_time = time.monotonic()
+
+        self._csv_ingestion = CsvIngestion(
+            csv_reader_workers, batch_max_size, batch_max_bytes
+        )
 
         self._client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
+        # [IMPORTANT] data is uploaded from other threads while the main one
+        # receives the query results; with data streams every data type is
+        # uploaded through its own connection, all of them bound to the session id
+        self._data_streams = data_streams
+        self._data_stream_sockets: list[socket.socket] = []
+        self._upload_threads: list[threading.Thread] = []
+        self._upload_errors: list[Exception] = []
+
         self._set_client_as_not_running()
         signal.signal(signal.SIGTERM, self._sigterm_signal_handler)
 
-        self._temp_buffer = b""
+        self._socket_reader = framed_socket.FramedSocketReader(
+            self._client_socket, "server"
+        )
 
     # ============================== PRIVATE - LOGGING ============================== #
 
@@ -74,92 +103,41 @@ class Client:
         self._client_socket.close()
         self._log_debug(f"action: sigterm_client_socket_close | result: success")
 
+        for data_stream_socket in self._data_stream_sockets:
+            data_stream_socket.close()
+        self._log_debug(f"action: sigterm_data_stream_sockets_close | result: success")
+
         self._log_info(f"action: sigterm_signal_handler | result: success")
 
     # ============================== PRIVATE - SEND/RECEIVE MESSAGES ============================== #
 
     def _socket_send_message(self, socket: socket.socket, message: str) -> None:
-        self._log_debug(f"action: send_message | result: in_progress | msg: {message}")
+        self._log_debug(
+            f"action: send_message | result: in_progress | msg_size: {len(message)}"
+        )
 
-        socket.sendall(message.encode("utf-8"))
+        framed_socket.send_framed_message(socket, message)
 
-        self._log_debug(f"action: send_message | result: success |  msg: {message}")
+        self._log_debug(
+            f"action: send_message | result: success | msg_size: {len(message)}"
+        )
 
-    def _socket_receive_message(self, socket: socket.socket) -> str:
+    def _socket_receive_message(self) -> str:
         self._log_debug(f"action: receive_message | result: in_progress")
 
-        buffsize = constants.KiB
-        bytes_received = self._temp_buffer
-        self._temp_buffer = b""
-
-        all_data_received = False
-        while not all_data_received:
-            chunk = socket.recv(buffsize)
-            if len(chunk) == 0:
-                logging.error(
-                    f"action: receive_message | result: fail | error: unexpected disconnection",
-                )
-                raise OSError("Unexpected disconnection of the server")
-
-            self._log_debug(
-                f"action: receive_chunk | result: success | chunk size: {len(chunk)}"
+        try:
+            message = self._socket_reader.receive_message()
+        except OSError as e:
+            logging.error(
+                f"action: receive_message | result: fail | error: {e}",
             )
-            if chunk.endswith(communication_protocol.MSG_END_DELIMITER.encode("utf-8")):
-                all_data_received = True
+            raise
 
-            if communication_protocol.MSG_END_DELIMITER.encode("utf-8") in chunk:
-                index = chunk.rindex(
-                    communication_protocol.MSG_END_DELIMITER.encode("utf-8")
-                )
-                bytes_received += chunk[
-                    : index + len(communication_protocol.MSG_END_DELIMITER)
-                ]
-                self._temp_buffer = chunk[
-                    index + len(communication_protocol.MSG_END_DELIMITER) :
-                ]
-                all_data_received = True
-            else:
-                bytes_received += chunk
-
-        message = bytes_received.decode("utf-8")
-        self._log_debug(f"action: receive_message | result: success | msg: {message}")
+        self._log_debug(
+            f"action: receive_message | result: success | msg_size: {len(message)}"
+        )
         return message
 
-    # ============================== PRIVATE - READ CSV ============================== #
-
-    def _parse_row_from_line(
-        self, column_names: list[str], line: str
-    ) -> dict[str, str]:
-        row: dict[str, str] = {}
-
-        fields = line.split(",")
-        for i, column_name in enumerate(column_names):
-            row[column_name] = fields[i]
-
-        return row
-
-    def _read_next_batch_from_file(
-        self, file: TextIOWrapper, column_names: list[str]
-    ) -> list[dict[str, str]]:
-        batch: list[dict[str, str]] = []
-
-        batch_size = 0
-        eof_reached = False
-
-        while not eof_reached and batch_size < self._batch_max_size:
-            row = {}
-
-            line = file.readline().strip()
-            if not line:
-                eof_reached = True
-                continue
-
-            row = self._parse_row_from_line(column_names, line)
-            batch.append(row)
-            batch_size += 1
-
-        return batch
-
     # ============================== PRIVATE - PATHS SUPPORT ============================== #
 
     def _assert_is_file(self, path: Path) -> None:
@@ -178,14 +156,17 @@ class Client:
     # ============================== PRIVATE - SEND/RECV HANDSHAKE ============================== #
 
     def _send_handshake_message(self) -> None:
+        handshake_payload = communication_protocol.ALL_QUERIES
+        if self._data_streams:
+            handshake_payload = communication_protocol.ALL_QUERIES_OVER_DATA_STREAMS
         handshake_message = communication_protocol.encode_handshake_message(
-            str(self._client_id), communication_protocol.ALL_QUERIES
+            str(self._client_id), handshake_payload
         )
         self._socket_send_message(self._client_socket, handshake_message)
         self._log_info(f"action: send_handshake | result: success")
 
     def _receive_handshake_ack_message(self) -> None:
-        received_message = self._socket_receive_message(self._client_socket)
+        received_message = self._socket_receive_message()
         self._session_id, client_id = communication_protocol.decode_handshake_message(
             received_message
         )
@@ -194,120 +175,213 @@ class Client:
                 f"Handshake ACK message error: expected client_id {self._client_id}, received {client_id}"
             )
 
+        self._session_start_time = time.monotonic()
         self._log_info(f"action: receive_handshake_ack | result: success")
 
     # ============================== PRIVATE - SEND DATA ============================== #
 
-    def _send_data_from_file_using_batchs(
-        self,
-        folder_name: str,
-        file: TextIOWrapper,
-        encoding_callback: Callable,
-    ) -> None:
-        column_names_line = file.readline().strip()
-        column_names = column_names_line.split(",")
-
-        batch = self._read_next_batch_from_file(file, column_names)
-        while len(batch) != 0 and self._is_running():
-            self._log_debug(f"action: {folder_name}_batch | result: in_progress")
-            message = encoding_callback(self._session_id, batch)
-            self._socket_send_message(self._client_socket, message)
-            self._log_debug(f"action: {folder_name}_batch | result: success")
-
-            batch = self._read_next_batch_from_file(file, column_names)
-
-    def _send_data_from_all_files_using_batchs(
-        self,
-        folder_name: str,
-        message_type: str,
-        encoding_callback: Callable,
-    ) -> None:
-        for file_path in self._folder_path(folder_name).iterdir():
+    def _csv_file_paths_of(self, folder_name: str) -> list[Path]:
+        csv_file_paths = []
+        for file_path in sorted(self._folder_path(folder_name).iterdir()):
             if not file_path.name.lower().endswith(".csv"):
                 logging.warning(
                     f"action: {folder_name}_file_skip | result: success | file: {file_path} | reason: not_csv"
                 )
                 continue
             self._assert_is_file(file_path)
-            csv_file = open(file_path, "r", encoding="utf-8", buffering=constants.KiB)
-            try:
-                self._send_data_from_file_using_batchs(
-                    folder_name,
-                    csv_file,
-                    encoding_callback,
-                )
-            finally:
-                csv_file.close()
-                self._log_debug(
-                    f"action: {folder_name}_file_close | result: success | file: {file_path}"
-                )
+            csv_file_paths.append(file_path)
+        return csv_file_paths
+
+    def _send_data_from_all_files_using_batchs(
+        self,
+        folder_name: str,
+        message_type: str,
+        client_socket: socket.socket,
+    ) -> None:
+        encoded_batches = self._csv_ingestion.encoded_batches_of(
+            self._csv_file_paths_of(folder_name), message_type, self._session_id
+        )
+        for message in encoded_batches:
+            if not self._is_running():
+                return
+            self._socket_send_message(client_socket, message)
+            self._log_debug(f"action: {folder_name}_batch | result: success")
 
         eof_message = communication_protocol.encode_eof_message(
             self._session_id, message_type
         )
-        self._socket_send_message(self._client_socket, eof_message)
+        self._socket_send_message(client_socket, eof_message)
         self._log_info(f"action: {folder_name}_all_files_sent | result: success")
 
-    def _send_all_menu_items(self) -> None:
+    def _send_all_menu_items(self, client_socket: socket.socket) -> None:
         self._send_data_from_all_files_using_batchs(
             constants.MIT_FOLDER_NAME,
             communication_protocol.MENU_ITEMS_BATCH_MSG_TYPE,
-            communication_protocol.encode_menu_items_batch_message,
+            client_socket,
         )
 
-    def _send_all_stores(self) -> None:
+    def _send_all_stores(self, client_socket: socket.socket) -> None:
         self._send_data_from_all_files_using_batchs(
             constants.STR_FOLDER_NAME,
             communication_protocol.STORES_BATCH_MSG_TYPE,
-            communication_protocol.encode_stores_batch_message,
+            client_socket,
         )
 
-    def _send_all_transaction_items(self) -> None:
+    def _send_all_transaction_items(self, client_socket: socket.socket) -> None:
         self._send_data_from_all_files_using_batchs(
             constants.TIT_FOLDER_NAME,
             communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE,
-            communication_protocol.encode_transaction_items_batch_message,
+            client_socket,
         )
 
-    def _send_all_transactions(self) -> None:
+    def _send_all_transactions(self, client_socket: socket.socket) -> None:
         self._send_data_from_all_files_using_batchs(
             constants.TRN_FOLDER_NAME,
             communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
-            communication_protocol.encode_transactions_batch_message,
+            client_socket,
         )
 
-    def _send_all_users(self) -> None:
+    def _send_all_users(self, client_socket: socket.socket) -> None:
         self._send_data_from_all_files_using_batchs(
             constants.USR_FOLDER_NAME,
             communication_protocol.USERS_BATCH_MSG_TYPE,
-            communication_protocol.encode_users_batch_message,
+            client_socket,
         )
 
     def _send_all_data(self) -> None:
         # WARNING: do not modify order
-        self._send_all_menu_items()
-        self._send_all_stores()
-        self._send_all_users()
-        self._send_all_transactions()
-        self._send_all_transaction_items()
+        self._send_all_menu_items(self._client_socket)
+        self._send_all_stores(self._client_socket)
+        self._send_all_users(self._client_socket)
+        self._send_all_transactions(self._client_socket)
+        self._send_all_transaction_items(self._client_socket)
+
+    # ============================== PRIVATE - UPLOADS ============================== #
+
+    def _upload_doing(self, upload: Callable, args: tuple, upload_name: str) -> None:
+        try:
+            upload(*args)
+        except Exception as e:
+            self._log_error(f"action: {upload_name} | result: fail | error: {e}")
+            self._upload_errors.append(e)
+
+            # the results will never arrive, stop waiting for them
+            self._set_client_as_not_running()
+            self._client_socket.shutdown(socket.SHUT_RDWR)
+
+    def _start_upload(self, upload: Callable, args: tuple, upload_name: str) -> None:
+        thread = threading.Thread(
+            target=self._upload_doing,
+            args=(upload, args, upload_name),
+            name=upload_name,
+        )
+        thread.start()
+        self._upload_threads.append(thread)
+
+    def _join_all_uploads(self) -> None:
+        for thread in self._upload_threads:
+            thread.join()
+        for data_stream_socket in self._data_stream_sockets:
+            data_stream_socket.close()
+        self._log_debug(f"action: data_stream_sockets_close | result: success")
+
+        if len(self._upload_errors) != 0:
+            raise self._upload_errors[0]
         self._log_info(f"action: all_data_sent | result: success")
 
+    # ============================== PRIVATE - SEND DATA STREAMS ============================== #
+
+    def _open_data_stream(self, message_type: str) -> socket.socket:
+        data_stream_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._data_stream_sockets.append(data_stream_socket)
+        data_stream_socket.connect((self._server_host, self._server_port))
+
+        handshake_message = communication_protocol.encode_handshake_message(
+            self._session_id, message_type
+        )
+        self._socket_send_message(data_stream_socket, handshake_message)
+
+        socket_reader = framed_socket.FramedSocketReader(data_stream_socket, "server")
+        session_id, _ = communication_protocol.decode_handshake_message(
+            socket_reader.receive_message()
+        )
+        if session_id != self._session_id:
+            raise ValueError(
+                f"Data stream handshake ACK message error: expected session_id {self._session_id}, received {session_id}"
+            )
+
+        self._log_info(f"action: open_{message_type}_data_stream | result: success")
+        return data_stream_socket
+
+    def _send_data_stream(self, send_all_data: Callable, message_type: str) -> None:
+        data_stream_socket = self._open_data_stream(message_type)
+        send_all_data(data_stream_socket)
+
+    def _start_all_data_streams(self) -> None:
+        data_streams = [
+            (
+                self._send_all_menu_items,
+                communication_protocol.MENU_ITEMS_BATCH_MSG_TYPE,
+            ),
+            (self._send_all_stores, communication_protocol.STORES_BATCH_MSG_TYPE),
+            (self._send_all_users, communication_protocol.USERS_BATCH_MSG_TYPE),
+            (
+                self._send_all_transactions,
+                communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            ),
+            (
+                self._send_all_transaction_items,
+                communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE,
+            ),
+        ]
+        for send_all_data, message_type in data_streams:
+            self._start_upload(
+                self._send_data_stream,
+                (send_all_data, message_type),
+                f"{message_type}_data_stream",
+            )
+
     # ============================== PRIVATE - SEND DATA ============================== #
 
+    def _query_result_sink_for(self, message_type: str) -> QueryResultSink:
+        query_result_sink = self._query_result_sinks.get(message_type)
+        if query_result_sink is None:
+            file_name = (
+                f"client_{self._client_id}__{self._session_id}__{message_type}_result"
+            )
+            query_result_sink = build_query_result_sink(
+                self._results_format,
+                self._output_path / file_name,
+                self._session_start_time,
+            )
+            self._query_result_sinks[message_type] = query_result_sink
+        return query_result_sink
+
     def _handle_query_result_message(self, message: str, message_type: str) -> None:
         self._log_debug(
             f"action: {message_type}_receive_query_result | result: success"
         )
-        file_name = (
-            f"client_{self._client_id}__{self._session_id}__{message_type}_result.txt"
+        query_result_sink = self._query_result_sink_for(message_type)
+        query_result_sink.write_batch(
+            communication_protocol.decode_batch_message(message)
         )
-        for item_batch in communication_protocol.decode_batch_message(message):
-            shell_cmd.shell_silent(
-                f"echo '{",".join(item_batch.values())}' >> {self._output_path / file_name}"
-            )
-            self._log_debug(
-                f"action: {message_type}_save_query_result | result: success | file: {file_name}",
-            )
+        self._log_debug(
+            f"action: {message_type}_save_query_result | result: success | file: {query_result_sink.path()}",
+        )
+
+    def _close_query_result_sink_of(self, data_type: str) -> None:
+        query_result_sink = self._query_result_sinks.pop(data_type, None)
+        if query_result_sink is None:
+            return
+
+        query_result_sink.close()
+        self._log_info(
+            f"action: {data_type}_query_result_saved | result: success | rows: {query_result_sink.rows_amount()} | rows_per_second: {query_result_sink.rows_per_second():.0f} | time_to_last_row: {query_result_sink.seconds_to_last_row():.3f}s"
+        )
+
+    def _close_all_query_result_sinks(self) -> None:
+        for data_type in list(self._query_result_sinks):
+            self._close_query_result_sink_of(data_type)
 
     def _handle_query_result_eof_message(
         self, message: str, all_eof_received: dict
@@ -317,6 +391,7 @@ class Client:
             raise ValueError(f"Unknown EOF message type {data_type}")
 
         all_eof_received[data_type] = True
+        self._close_query_result_sink_of(data_type)
         self._log_info(
             f"action: eof_{data_type}_receive_query_result | result: success"
         )
@@ -345,22 +420,6 @@ class Client:
                     f'Invalid message type received from server "{message_type}"'
                 )
 
-    def _with_each_message_do(
-        self,
-        received_message: str,
-        callback: Callable,
-        *args: Any,
-        **kwargs: Any,
-    ) -> None:
-        messages = received_message.split(communication_protocol.MSG_END_DELIMITER)
-        for message in messages:
-            if not self._is_running():
-                break
-            if message == "":
-                continue
-            message += communication_protocol.MSG_END_DELIMITER
-            callback(message, *args, **kwargs)
-
     def _receive_all_query_results_from_server(self) -> None:
         all_eof_received = {
             constants.QUERY_RESULT_1X: False,
@@ -374,12 +433,8 @@ class Client:
             if not self._is_running():
                 return
 
-            received_message = self._socket_receive_message(self._client_socket)
-            self._with_each_message_do(
-                received_message,
-                self._handle_server_message,
-                all_eof_received,
-            )
+            received_message = self._socket_receive_message()
+            self._handle_server_message(received_message, all_eof_received)
 
         self._log_info(f"action: all_query_results_received | result: success")
 
@@ -389,9 +444,15 @@ class Client:
         self._send_handshake_message()
         self._receive_handshake_ack_message()
 
-        self._send_all_data()
+        if self._data_streams:
+            self._start_all_data_streams()
+        else:
+            self._start_upload(self._send_all_data, (), "data_upload")
 
-        self._receive_all_query_results_from_server()
+        try:
+            self._receive_all_query_results_from_server()
+        finally:
+            self._join_all_uploads()
 
     # ============================== PUBLIC ============================== #
 
@@ -408,6 +469,8 @@ class Client:
             logging.error(f"action: client_run | result: fail | error: {e}")
             raise e
         finally:
+            self._csv_ingestion.close()
+            self._close_all_query_result_sinks()
             server_socket.close()
             self._log_debug("action: server_socket_close | result: success")
 
@@ -0,0 +1,200 @@
+import mmap
+import multiprocessing
+import os
+import signal
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+from shared import communication_protocol, constants
+
+SEGMENT_SIZE = 8 * constants.MiB
+
+Segment = tuple[int, int]
+
+# ============================== SEGMENTS ============================== #
+
+
+def read_column_names(path: Path) -> list[str]:
+    with open(path, "rb") as file:
+        return file.readline().decode("utf-8").strip().split(",")
+
+
+def split_in_segments(path: Path, segment_size: int) -> list[Segment]:
+    # byte ranges of the file (after the header) cut on line boundaries
+    segments: list[Segment] = []
+    with open(path, "rb") as file:
+        file_size = os.fstat(file.fileno()).st_size
+        if file_size == 0:
+            return segments
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            header_end = mapped_file.find(b"\n")
+            if header_end == -1:
+                return segments
+
+            start = header_end + 1
+            while start < file_size:
+                end = file_size
+                if start + segment_size < file_size:
+                    line_end = mapped_file.find(b"\n", start + segment_size - 1)
+                    if line_end != -1:
+                        end = line_end + 1
+                segments.append((start, end))
+                start = end
+
+    return segments
+
+
+def encode_segment(
+    path: Path,
+    segment: Segment,
+    column_names: list[str],
+    message_type: str,
+    session_id: str,
+    batch_max_size: int,
+    batch_max_bytes: int,
+) -> list[str]:
+    start, end = segment
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            text = mapped_file[start:end].decode("utf-8")
+
+    columns_amount = len(column_names)
+    messages: list[str] = []
+
+    values: list[str] = []
+    rows_amount = 0
+    batch_bytes = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        fields = line.split(",")
+        if len(fields) < columns_amount:
+            raise ValueError(
+                f"CSV line with {len(fields)} fields, expected {columns_amount}: {path}"
+            )
+        values.extend(fields[:columns_amount])
+        rows_amount += 1
+        batch_bytes += len(line)
+
+        # [IMPORTANT] batches are cut by rows or by size, whichever comes first
+        if rows_amount >= batch_max_size or batch_bytes >= batch_max_bytes:
+            messages.append(
+                communication_protocol.encode_batch_values(
+                    message_type, session_id, column_names, values
+                )
+            )
+            values = []
+            rows_amount = 0
+            batch_bytes = 0
+
+    if rows_amount > 0:
+        messages.append(
+            communication_protocol.encode_batch_values(
+                message_type, session_id, column_names, values
+            )
+        )
+    return messages
+
+
+# ============================== INGESTION ============================== #
+
+
+def _init_worker() -> None:
+    # workers are stopped by the client, not by its SIGTERM handler
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+class CsvIngestion:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        workers_amount: int,
+        batch_max_size: int,
+        batch_max_bytes: int,
+        segment_size: int = SEGMENT_SIZE,
+    ) -> None:
+        self._workers_amount = workers_amount
+        self._batch_max_size = batch_max_size
+        self._batch_max_bytes = batch_max_bytes
+        self._segment_size = segment_size
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if workers_amount > 1:
+            # [IMPORTANT] the client is multi-threaded when the pool is created,
+            # and forking a multi-threaded process may copy locks held by other
+            # threads, so workers are forked from a single-threaded server
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers_amount,
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=_init_worker,
+            )
+
+    # ============================== PRIVATE - ENCODING ============================== #
+
+    def _encode_segment_args(
+        self,
+        path: Path,
+        segment: Segment,
+        column_names: list[str],
+        message_type: str,
+        session_id: str,
+    ) -> tuple:
+        return (
+            path,
+            segment,
+            column_names,
+            message_type,
+            session_id,
+            self._batch_max_size,
+            self._batch_max_bytes,
+        )
+
+    def _all_segments_of(self, paths: list[Path]) -> Iterator[tuple]:
+        for path in paths:
+            column_names = read_column_names(path)
+            for segment in split_in_segments(path, self._segment_size):
+                yield path, segment, column_names
+
+    # ============================== PUBLIC ============================== #
+
+    def encoded_batches_of(
+        self, paths: list[Path], message_type: str, session_id: str
+    ) -> Iterator[str]:
+        if self._executor is None:
+            for path, segment, column_names in self._all_segments_of(paths):
+                yield from encode_segment(
+                    *self._encode_segment_args(
+                        path, segment, column_names, message_type, session_id
+                    )
+                )
+            return
+
+        # [IMPORTANT] segments are encoded ahead by the workers, but yielded in
+        # file order and with a bounded amount of them in memory
+        pending_segments: deque[Future] = deque()
+        for path, segment, column_names in self._all_segments_of(paths):
+            pending_segments.append(
+                self._executor.submit(
+                    encode_segment,
+                    *self._encode_segment_args(
+                        path, segment, column_names, message_type, session_id
+                    ),
+                )
+            )
+            if len(pending_segments) >= 2 * self._workers_amount:
+                yield from pending_segments.popleft().result()
+
+        while len(pending_segments) > 0:
+            yield from pending_segments.popleft().result()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
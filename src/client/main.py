@@ -13,7 +13,11 @@ def main():
             "SERVER_PORT",
             "DATA_PATH",
             "RESULTS_PATH",
+            "RESULTS_FORMAT",
             "BATCH_MAX_SIZE",
+            "BATCH_MAX_BYTES",
+            "CSV_READER_WORKERS",
+            "DATA_STREAMS",
         ]
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
@@ -25,7 +29,11 @@ def main():
         server_port=int(config_params["SERVER_PORT"]),
         data_path=config_params["DATA_PATH"],
         results_path=config_params["RESULTS_PATH"],
+        results_format=config_params["RESULTS_FORMAT"],
         batch_max_size=int(config_params["BATCH_MAX_SIZE"]),
+        batch_max_bytes=int(config_params["BATCH_MAX_BYTES"]),
+        csv_reader_workers=int(config_params["CSV_READER_WORKERS"]),
+        data_streams=config_params["DATA_STREAMS"].lower() == "true",
     )
     client.run()
 
@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional, TextIO
+
+from shared import constants
+
+
+class QueryResultSink(ABC):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, path: Path, start_time: float) -> None:
+        self._path = path
+
+        # [IMPORTANT] the file is opened on the first batch and kept open (and
+        # buffered) until the query EOF, instead of being reopened per row
+        self._file: Optional[TextIO] = None
+
+        self._start_time = start_time
+        self._first_row_time = 0.0
+        self._last_row_time = 0.0
+        self._rows_amount = 0
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    @abstractmethod
+    def _lines_for(self, batch: list[dict[str, str]]) -> list[str]:
+        raise NotImplementedError("subclass responsibility")
+
+    def _header_lines_for(self, batch: list[dict[str, str]]) -> list[str]:
+        return []
+
+    # ============================== PUBLIC ============================== #
+
+    def path(self) -> Path:
+        return self._path
+
+    def rows_amount(self) -> int:
+        return self._rows_amount
+
+    def rows_per_second(self) -> float:
+        elapsed_seconds = self._last_row_time - self._first_row_time
+        if elapsed_seconds <= 0:
+            return float(self._rows_amount)
+        return self._rows_amount / elapsed_seconds
+
+    def seconds_to_last_row(self) -> float:
+        if self._rows_amount == 0:
+            return 0.0
+        return self._last_row_time - self._start_time
+
+    def write_batch(self, batch: list[dict[str, str]]) -> None:
+        if len(batch) == 0:
+            return
+
+        if self._file is None:
+            self._file = open(
+                self._path, "w", encoding="utf-8", buffering=64 * constants.KiB
+            )
+            self._file.writelines(self._header_lines_for(batch))
+            self._first_row_time = time.monotonic()
+
+        self._file.writelines(self._lines_for(batch))
+        self._rows_amount += len(batch)
+        self._last_row_time = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+
+        self._file.close()
+        self._file = None
+        logging.debug(
+            f"action: query_result_file_close | result: success | file: {self._path}"
+        )
+
+
+class TextQueryResultSink(QueryResultSink):
+
+    def _lines_for(self, batch: list[dict[str, str]]) -> list[str]:
+        return [",".join(batch_item.values()) + "\n" for batch_item in batch]
+
+
+class CsvQueryResultSink(QueryResultSink):
+
+    def _csv_lines_for(self, rows: list[list[str]]) -> list[str]:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return [buffer.getvalue()]
+
+    def _header_lines_for(self, batch: list[dict[str, str]]) -> list[str]:
+        return self._csv_lines_for([list(batch[0])])
+
+    def _lines_for(self, batch: list[dict[str, str]]) -> list[str]:
+        return self._csv_lines_for([list(batch_item.values()) for batch_item in batch])
+
+
+class JsonlQueryResultSink(QueryResultSink):
+
+    def _lines_for(self, batch: list[dict[str, str]]) -> list[str]:
+        return [json.dumps(batch_item) + "\n" for batch_item in batch]
+
+
+# ============================== BUILDING ============================== #
+
+QUERY_RESULT_SINK_CLASS_BY_FORMAT: dict[str, type[QueryResultSink]] = {
+    "txt": TextQueryResultSink,
+    "csv": CsvQueryResultSink,
+    "jsonl": JsonlQueryResultSink,
+}
+
+
+def build_query_result_sink(
+    results_format: str, path_without_suffix: Path, start_time: float
+) -> QueryResultSink:
+    sink_class = QUERY_RESULT_SINK_CLASS_BY_FORMAT.get(results_format)
+    if sink_class is None:
+        raise ValueError(f"Unknown query results format: {results_format}")
+
+    path = path_without_suffix.with_name(f"{path_without_suffix.name}.{results_format}")
+    return sink_class(path, start_time)
@@ -20,6 +20,7 @@ class MenuItemsCleaner(Cleaner):
             host=rabbitmq_host,
             exchange_name=exchange_name,
             route_keys=[routing_key],
+            **producers_config["publishing_config"],
         )
 
     # ============================== PRIVATE - ACCESSING ============================== #
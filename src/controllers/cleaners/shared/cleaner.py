@@ -1,11 +1,12 @@
 import logging
 from abc import abstractmethod
-from typing import Any, Callable
+from typing import Any
 
 from controllers.shared.controller import Controller
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
-from shared import communication_protocol
+from shared import communication_protocol, created_at
 
 
 class Cleaner(Controller):
@@ -20,7 +21,10 @@ class Cleaner(Controller):
         queue_name_prefix = consumers_config["queue_name_prefix"]
         queue_name = f"{queue_name_prefix}-{self._controller_id}"
         self._mom_consumer = RabbitMQMessageMiddlewareQueue(
-            host=rabbitmq_host, queue_name=queue_name
+            host=rabbitmq_host,
+            queue_name=queue_name,
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+            **consumers_config["consuming_config"],
         )
 
     @abstractmethod
@@ -50,6 +54,10 @@ class Cleaner(Controller):
     def _columns_to_keep(self) -> list[str]:
         raise NotImplementedError("subclass responsibility")
 
+    def _created_at_columns(self) -> list[str]:
+        # columns derived from created_at that replace it in the output
+        return []
+
     # ============================== PRIVATE - SIGNAL HANDLER ============================== #
 
     def _stop(self) -> None:
@@ -58,33 +66,31 @@ class Cleaner(Controller):
 
     # ============================== PRIVATE - FILTER ============================== #
 
-    def _transform_batch_item(self, batch_item: dict[str, str]) -> dict:
-        modified_item_batch = {}
-        for column in self._columns_to_keep():
-            modified_item_batch[column] = batch_item[column]
-        return modified_item_batch
-
-    def _transform_batch_message_using(
-        self,
-        message: str,
-        decoder: Callable,
-        encoder: Callable,
-        message_type: str,
-        session_id: str,
-    ) -> str:
-        new_batch = []
-        for item in decoder(message):
-            modified_item = self._transform_batch_item(item)
-            new_batch.append(modified_item)
-        return str(encoder(message_type, session_id, new_batch))
-
     def _transform_batch_message(self, message: str) -> str:
-        return self._transform_batch_message_using(
-            message,
-            communication_protocol.decode_batch_message,
-            communication_protocol.encode_batch_message,
+        projected_message = communication_protocol.project_batch_message(
+            message, self._columns_to_keep()
+        )
+        created_at_columns = self._created_at_columns()
+        if len(created_at_columns) == 0:
+            return projected_message
+
+        batch = communication_protocol.decode_batch(projected_message)
+        if batch.is_empty():
+            return projected_message
+
+        # [IMPORTANT] created_at is parsed once here, the next controllers only
+        # read the derived columns
+        derived_columns = created_at.derived_columns_of(
+            batch.column("created_at"), created_at_columns
+        )
+        for column_name, values in zip(created_at_columns, derived_columns):
+            batch.append_column(column_name, values)
+        output_columns = [c for c in batch.columns() if c != "created_at"]
+
+        return communication_protocol.encode_batch(
             communication_protocol.get_message_type(message),
             communication_protocol.get_message_session_id(message),
+            batch.project(output_columns),
         )
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
@@ -114,6 +120,7 @@ class Cleaner(Controller):
 
         for mom_producer in self._mom_producers:
             mom_producer.send(message)
+            mom_producer.flush()
         logging.info(f"action: eof_sent | result: success | session_id: {session_id}")
 
         self._clean_session_data_of(session_id)
@@ -134,6 +141,7 @@ class Cleaner(Controller):
 
     def _run(self) -> None:
         super()._run()
+        self._mom_consumer.bind_producers(self._mom_producers)
         self._mom_consumer.start_consuming(self._handle_received_data)
 
     def _close_all(self) -> None:
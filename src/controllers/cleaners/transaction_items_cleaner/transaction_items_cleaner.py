@@ -3,6 +3,7 @@ from typing import Any
 from controllers.cleaners.shared.cleaner import Cleaner
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
+from shared import created_at
 
 
 class TransactionItemsCleaner(Cleaner):
@@ -14,7 +15,11 @@ class TransactionItemsCleaner(Cleaner):
     ) -> MessageMiddleware:
         queue_name_prefix = producers_config["queue_name_prefix"]
         queue_name = f"{queue_name_prefix}-{producer_id}"
-        return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
+        return RabbitMQMessageMiddlewareQueue(
+            host=rabbitmq_host,
+            queue_name=queue_name,
+            **producers_config["publishing_config"],
+        )
 
     # ============================== PRIVATE - ACCESSING ============================== #
 
@@ -26,6 +31,9 @@ class TransactionItemsCleaner(Cleaner):
             "quantity",
         ]
 
+    def _created_at_columns(self) -> list[str]:
+        return [created_at.YEAR, created_at.YEAR_MONTH]
+
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
     def _mom_send_message_to_next(self, message: str) -> None:
@@ -13,17 +13,34 @@ def main():
             "CONTROLLER_ID",
             "RABBITMQ_HOST",
             "NEXT_CONTROLLERS_AMOUNT",
-        ]
+            "PUBLISH_BUFFER_MAX_MESSAGES",
+            "PUBLISH_BUFFER_MAX_SECONDS",
+            "PUBLISHER_CONFIRMS",
+            "PREFETCH_COUNT",
+            "ACK_EVERY_MESSAGES",
+            "ACK_EVERY_MS",
+        ],
+        default_values=constants.CONSUMING_CONFIG_DEFAULT_VALUES,
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
     logging.info(f"action: init_config | result: success | params: {config_params}")
 
     consumers_config = {
         "queue_name_prefix": constants.DIRTY_TRN_QUEUE_PREFIX,
+        "consuming_config": {
+            "prefetch_count": int(config_params["PREFETCH_COUNT"]),
+            "ack_every_messages": int(config_params["ACK_EVERY_MESSAGES"]),
+            "ack_every_seconds": int(config_params["ACK_EVERY_MS"]) / 1000,
+        },
     }
     producers_config = {
         "queue_name_prefix": constants.CLEANED_TRN_QUEUE_PREFIX,
         "next_controllers_amount": int(config_params["NEXT_CONTROLLERS_AMOUNT"]),
+        "publishing_config": {
+            "buffer_max_messages": int(config_params["PUBLISH_BUFFER_MAX_MESSAGES"]),
+            "buffer_max_seconds": float(config_params["PUBLISH_BUFFER_MAX_SECONDS"]),
+            "confirms": config_params["PUBLISHER_CONFIRMS"].lower() == "true",
+        },
     }
 
     cleaner = TransactionsCleaner(
@@ -1,10 +1,9 @@
-import logging
 from typing import Any
 
 from controllers.cleaners.shared.cleaner import Cleaner
+from controllers.shared.partitioner import ModuloStrategy, Partitioner
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
-from shared import communication_protocol
 
 
 class UsersCleaner(Cleaner):
@@ -16,7 +15,27 @@ class UsersCleaner(Cleaner):
     ) -> MessageMiddleware:
         queue_name_prefix = producers_config["queue_name_prefix"]
         queue_name = f"{queue_name_prefix}-{producer_id}"
-        return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
+        return RabbitMQMessageMiddlewareQueue(
+            host=rabbitmq_host,
+            queue_name=queue_name,
+            **producers_config["publishing_config"],
+        )
+
+    def _init_mom_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> None:
+        super()._init_mom_producers(rabbitmq_host, producers_config)
+
+        # [IMPORTANT] this must consider the next controller's grouping key
+        shards_amount = len(self._mom_producers)
+        self._partitioner = Partitioner(
+            "user_id",
+            ModuloStrategy(shards_amount),
+            shards_amount,
+            skip_empty_keys=True,
+        )
 
     # ============================== PRIVATE - ACCESSING ============================== #
 
@@ -29,28 +48,4 @@ class UsersCleaner(Cleaner):
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
     def _mom_send_message_to_next(self, message: str) -> None:
-        batchs_by_hash: dict[int, list] = {}
-        # [IMPORTANT] this must consider the next controller's grouping key
-        sharding_key = "user_id"
-
-        message_type = communication_protocol.get_message_type(message)
-        session_id = communication_protocol.get_message_session_id(message)
-        for batch_item in communication_protocol.decode_batch_message(message):
-            if batch_item[sharding_key] == "":
-                logging.warning(
-                    f"action: invalid_{sharding_key} | {sharding_key}: {batch_item[sharding_key]} | result: skipped"
-                )
-                continue
-            sharding_value = int(float(batch_item[sharding_key]))
-            batch_item[sharding_key] = str(sharding_value)
-
-            hash = sharding_value % len(self._mom_producers)
-            batchs_by_hash.setdefault(hash, [])
-            batchs_by_hash[hash].append(batch_item)
-
-        for hash, user_batch in batchs_by_hash.items():
-            mom_producer = self._mom_producers[hash]
-            message = communication_protocol.encode_batch_message(
-                message_type, session_id, user_batch
-            )
-            mom_producer.send(message)
+        self._partitioner.send_partitioned(message, self._mom_producers)
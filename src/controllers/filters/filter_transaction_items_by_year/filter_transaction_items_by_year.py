@@ -1,8 +1,10 @@
 from typing import Any
 
-from controllers.filters.shared.filter import Filter
+from controllers.filters.shared.filter import Filter, Predicate
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
+from shared import created_at
 
 
 class FilterTransactionItemsByYear(Filter):
@@ -16,7 +18,12 @@ class FilterTransactionItemsByYear(Filter):
     ) -> MessageMiddleware:
         queue_name_prefix = consumers_config["queue_name_prefix"]
         queue_name = f"{queue_name_prefix}-{self._controller_id}"
-        return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
+        return RabbitMQMessageMiddlewareQueue(
+            host=rabbitmq_host,
+            queue_name=queue_name,
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+            **consumers_config["consuming_config"],
+        )
 
     def _build_mom_producer_using(
         self,
@@ -26,7 +33,11 @@ class FilterTransactionItemsByYear(Filter):
     ) -> MessageMiddleware:
         queue_name_prefix = producers_config["queue_name_prefix"]
         queue_name = f"{queue_name_prefix}-{producer_id}"
-        return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
+        return RabbitMQMessageMiddlewareQueue(
+            host=rabbitmq_host,
+            queue_name=queue_name,
+            **producers_config["publishing_config"],
+        )
 
     def __init__(
         self,
@@ -36,20 +47,14 @@ class FilterTransactionItemsByYear(Filter):
         producers_config: dict[str, Any],
         years_to_keep: list[int],
     ) -> None:
+        # years are compared as the text of the year_created_at column
+        years_predicate = Predicate.value_in(
+            created_at.YEAR, {str(year) for year in years_to_keep}
+        )
         super().__init__(
             controller_id,
             rabbitmq_host,
             consumers_config,
             producers_config,
+            [years_predicate],
         )
-
-        self._years_to_keep = set(years_to_keep)
-
-    # ============================== PRIVATE - TRANSFORM DATA ============================== #
-
-    def _should_be_included(self, batch_item: dict[str, str]) -> bool:
-        created_at = batch_item["created_at"]
-        date = created_at.split(" ")[0]
-        year = int(date.split("-")[0])
-
-        return year in self._years_to_keep
@@ -14,8 +14,18 @@ def main():
             "RABBITMQ_HOST",
             "PREV_CONTROLLERS_AMOUNT",
             "NEXT_CONTROLLERS_AMOUNT",
+            "PUBLISH_BUFFER_MAX_MESSAGES",
+            "PUBLISH_BUFFER_MAX_SECONDS",
+            "PUBLISHER_CONFIRMS",
+            "COALESCE_MAX_ROWS",
+            "COALESCE_MAX_BYTES",
+            "COALESCE_MAX_SECONDS",
             "YEARS_TO_KEEP",
-        ]
+            "PREFETCH_COUNT",
+            "ACK_EVERY_MESSAGES",
+            "ACK_EVERY_MS",
+        ],
+        default_values=constants.CONSUMING_CONFIG_DEFAULT_VALUES,
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
     logging.info(f"action: init_config | result: success | params: {config_params}")
@@ -26,10 +36,25 @@ def main():
     consumers_config = {
         "queue_name_prefix": constants.CLEANED_TIT_QUEUE_PREFIX,
         "prev_controllers_amount": int(config_params["PREV_CONTROLLERS_AMOUNT"]),
+        "consuming_config": {
+            "prefetch_count": int(config_params["PREFETCH_COUNT"]),
+            "ack_every_messages": int(config_params["ACK_EVERY_MESSAGES"]),
+            "ack_every_seconds": int(config_params["ACK_EVERY_MS"]) / 1000,
+        },
     }
     producers_config = {
         "queue_name_prefix": constants.FILTERED_TIT_BY_YEAR_QUEUE_PREFIX,
         "next_controllers_amount": int(config_params["NEXT_CONTROLLERS_AMOUNT"]),
+        "publishing_config": {
+            "buffer_max_messages": int(config_params["PUBLISH_BUFFER_MAX_MESSAGES"]),
+            "buffer_max_seconds": float(config_params["PUBLISH_BUFFER_MAX_SECONDS"]),
+            "confirms": config_params["PUBLISHER_CONFIRMS"].lower() == "true",
+        },
+        "coalescing_config": {
+            "max_rows": int(config_params["COALESCE_MAX_ROWS"]),
+            "max_bytes": int(config_params["COALESCE_MAX_BYTES"]),
+            "max_seconds": float(config_params["COALESCE_MAX_SECONDS"]),
+        },
     }
 
     controller = FilterTransactionItemsByYear(
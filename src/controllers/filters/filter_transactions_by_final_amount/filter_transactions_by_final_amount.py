@@ -1,6 +1,7 @@
 from typing import Any
 
-from controllers.filters.shared.filter import Filter
+from controllers.filters.shared.filter import Filter, Predicate
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
@@ -23,6 +24,8 @@ class FilterTransactionsByFinalAmount(Filter):
             host=rabbitmq_host,
             exchange_name=exchange_name,
             route_keys=[routing_key],
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+            **consumers_config["consuming_config"],
         )
 
     def _build_mom_producer_using(
@@ -33,7 +36,11 @@ class FilterTransactionsByFinalAmount(Filter):
     ) -> MessageMiddleware:
         queue_name_prefix = producers_config["queue_name_prefix"]
         queue_name = f"{queue_name_prefix}-{producer_id}"
-        return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
+        return RabbitMQMessageMiddlewareQueue(
+            host=rabbitmq_host,
+            queue_name=queue_name,
+            **producers_config["publishing_config"],
+        )
 
     def __init__(
         self,
@@ -48,12 +55,5 @@ class FilterTransactionsByFinalAmount(Filter):
             rabbitmq_host,
             consumers_config,
             producers_config,
+            [Predicate.at_least("final_amount", min_final_amount)],
         )
-
-        self._min_final_amount = min_final_amount
-
-    # ============================== PRIVATE - TRANSFORM DATA ============================== #
-
-    def _should_be_included(self, batch_item: dict[str, str]) -> bool:
-        final_amount = float(batch_item["final_amount"])
-        return final_amount >= self._min_final_amount
@@ -1,10 +1,12 @@
 from typing import Any
 
-from controllers.filters.shared.filter import Filter
+from controllers.filters.shared.filter import Filter, Predicate
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
 )
+from shared import created_at
 
 
 class FilterTransactionsByHour(Filter):
@@ -22,6 +24,8 @@ class FilterTransactionsByHour(Filter):
             host=rabbitmq_host,
             exchange_name=exchange_name,
             route_keys=[routing_key],
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+            **consumers_config["consuming_config"],
         )
 
     def _build_mom_producer_using(
@@ -36,6 +40,7 @@ class FilterTransactionsByHour(Filter):
             host=rabbitmq_host,
             exchange_name=exchange_name,
             route_keys=[routing_key],
+            **producers_config["publishing_config"],
         )
 
     def __init__(
@@ -47,21 +52,14 @@ class FilterTransactionsByHour(Filter):
         min_hour: int,
         max_hour: int,
     ) -> None:
+        # hours are compared as the text of the hour_created_at column
+        hours_predicate = Predicate.value_in(
+            created_at.HOUR, {str(hour) for hour in range(min_hour, max_hour)}
+        )
         super().__init__(
             controller_id,
             rabbitmq_host,
             consumers_config,
             producers_config,
+            [hours_predicate],
         )
-
-        self._min_hour = min_hour
-        self._max_hour = max_hour
-
-    # ============================== PRIVATE - TRANSFORM DATA ============================== #
-
-    def _should_be_included(self, batch_item: dict[str, str]) -> bool:
-        created_at = batch_item["created_at"]
-        time = created_at.split(" ")[1]
-        hour = int(time.split(":")[0])
-
-        return self._min_hour <= hour and hour < self._max_hour
@@ -14,9 +14,19 @@ def main():
             "RABBITMQ_HOST",
             "PREV_CONTROLLERS_AMOUNT",
             "NEXT_CONTROLLERS_AMOUNT",
+            "PUBLISH_BUFFER_MAX_MESSAGES",
+            "PUBLISH_BUFFER_MAX_SECONDS",
+            "PUBLISHER_CONFIRMS",
+            "COALESCE_MAX_ROWS",
+            "COALESCE_MAX_BYTES",
+            "COALESCE_MAX_SECONDS",
             "MIN_HOUR",
             "MAX_HOUR",
-        ]
+            "PREFETCH_COUNT",
+            "ACK_EVERY_MESSAGES",
+            "ACK_EVERY_MS",
+        ],
+        default_values=constants.CONSUMING_CONFIG_DEFAULT_VALUES,
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
     logging.info(f"action: init_config | result: success | params: {config_params}")
@@ -25,11 +35,26 @@ def main():
         "exchange_name_prefix": constants.FILTERED_TRN_BY_YEAR_EXCHANGE_PREFIX,
         "routing_key_prefix": constants.FILTERED_TRN_BY_YEAR_ROUTING_KEY_PREFIX,
         "prev_controllers_amount": int(config_params["PREV_CONTROLLERS_AMOUNT"]),
+        "consuming_config": {
+            "prefetch_count": int(config_params["PREFETCH_COUNT"]),
+            "ack_every_messages": int(config_params["ACK_EVERY_MESSAGES"]),
+            "ack_every_seconds": int(config_params["ACK_EVERY_MS"]) / 1000,
+        },
     }
     producers_config = {
         "exchange_name_prefix": constants.FILTERED_TRN_BY_YEAR__HOUR_EXCHANGE_PREFIX,
         "routing_key_prefix": constants.FILTERED_TRN_BY_YEAR__HOUR_ROUTING_KEY_PREFIX,
         "next_controllers_amount": int(config_params["NEXT_CONTROLLERS_AMOUNT"]),
+        "publishing_config": {
+            "buffer_max_messages": int(config_params["PUBLISH_BUFFER_MAX_MESSAGES"]),
+            "buffer_max_seconds": float(config_params["PUBLISH_BUFFER_MAX_SECONDS"]),
+            "confirms": config_params["PUBLISHER_CONFIRMS"].lower() == "true",
+        },
+        "coalescing_config": {
+            "max_rows": int(config_params["COALESCE_MAX_ROWS"]),
+            "max_bytes": int(config_params["COALESCE_MAX_BYTES"]),
+            "max_seconds": float(config_params["COALESCE_MAX_SECONDS"]),
+        },
     }
 
     controller = FilterTransactionsByHour(
@@ -1,13 +1,16 @@
 import logging
-from typing import Any
+from typing import Any, Optional
 
-from controllers.filters.shared.filter import Filter
+from controllers.filters.shared.filter import Filter, Predicate, PredicateChain
+from controllers.shared.coalescing_producer import coalescing
+from controllers.shared.partitioner import ModuloStrategy, Partitioner
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
 )
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
-from shared import communication_protocol
+from shared import communication_protocol, created_at
 
 
 class FilterTransactionsByYear(Filter):
@@ -21,7 +24,12 @@ class FilterTransactionsByYear(Filter):
     ) -> MessageMiddleware:
         queue_name_prefix = consumers_config["queue_name_prefix"]
         queue_name = f"{queue_name_prefix}-{self._controller_id}"
-        return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
+        return RabbitMQMessageMiddlewareQueue(
+            host=rabbitmq_host,
+            queue_name=queue_name,
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+            **consumers_config["consuming_config"],
+        )
 
     def _build_mom_producer_using(
         self,
@@ -35,8 +43,40 @@ class FilterTransactionsByYear(Filter):
             host=rabbitmq_host,
             exchange_name=exchange_name,
             route_keys=[routing_key],
+            **producers_config["publishing_config"],
         )
 
+    def _init_mom_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> None:
+        super()._init_mom_producers(rabbitmq_host, producers_config)
+
+        # [IMPORTANT] this must consider the next controller's grouping key
+        shards_amount = len(self._mom_producers)
+        self._partitioner = Partitioner(
+            "user_id", ModuloStrategy(shards_amount), shards_amount
+        )
+
+        self._current_q1_producer_id = 0
+        self._q1_mom_producers: list[MessageMiddleware] = []
+
+        q1_producers_config = producers_config.get("q1_producers_config")
+        if q1_producers_config is None:
+            return
+
+        queue_name_prefix = q1_producers_config["queue_name_prefix"]
+        for producer_id in range(q1_producers_config["next_controllers_amount"]):
+            mom_producer = RabbitMQMessageMiddlewareQueue(
+                host=rabbitmq_host,
+                queue_name=f"{queue_name_prefix}-{producer_id}",
+                **producers_config["publishing_config"],
+            )
+            self._q1_mom_producers.append(
+                coalescing(mom_producer, producers_config["coalescing_config"])
+            )
+
     def __init__(
         self,
         controller_id: int,
@@ -44,52 +84,75 @@ class FilterTransactionsByYear(Filter):
         consumers_config: dict[str, Any],
         producers_config: dict[str, Any],
         years_to_keep: list[int],
+        q1_filters_config: Optional[dict[str, Any]] = None,
     ) -> None:
+        # years are compared as the text of the year_created_at column
+        years_predicate = Predicate.value_in(
+            created_at.YEAR, {str(year) for year in years_to_keep}
+        )
         super().__init__(
             controller_id,
             rabbitmq_host,
             consumers_config,
             producers_config,
+            [years_predicate],
         )
 
-        self._years_to_keep = set(years_to_keep)
-
-    # ============================== PRIVATE - TRANSFORM DATA ============================== #
+        # [IMPORTANT] with the query 1 filters fused, the rows kept by year are
+        # also filtered by hour and final amount here and sent straight to the
+        # query 1 output builders, saving two broker hops per batch
+        self._q1_predicate_chain: Optional[PredicateChain] = None
+        if q1_filters_config is not None:
+            hours_to_keep = range(
+                q1_filters_config["min_hour"], q1_filters_config["max_hour"]
+            )
+            self._q1_predicate_chain = PredicateChain(
+                [
+                    Predicate.value_in(
+                        created_at.HOUR, {str(hour) for hour in hours_to_keep}
+                    ),
+                    Predicate.at_least(
+                        "final_amount", q1_filters_config["min_final_amount"]
+                    ),
+                ]
+            )
 
-    def _should_be_included(self, batch_item: dict[str, str]) -> bool:
-        created_at = batch_item["created_at"]
-        date = created_at.split(" ")[0]
-        year = int(date.split("-")[0])
+    # ============================== PRIVATE - ACCESSING ============================== #
 
-        return year in self._years_to_keep
+    def _all_mom_producers(self) -> list[MessageMiddleware]:
+        return self._mom_producers + self._q1_mom_producers
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
     def _mom_send_message_to_next(self, message: str) -> None:
-        batchs_by_hash: dict[int, list] = {}
-        # [IMPORTANT] this must consider the next controller's grouping key
-        sharding_key = "user_id"
+        self._partitioner.send_partitioned(message, self._mom_producers)
+
+    def _mom_send_message_to_q1(self, message: str) -> None:
+        mom_producer = self._q1_mom_producers[self._current_q1_producer_id]
+        mom_producer.send(message)
+
+        self._current_q1_producer_id += 1
+        if self._current_q1_producer_id >= len(self._q1_mom_producers):
+            self._current_q1_producer_id = 0
+
+    def _handle_data_batch_message(self, message: str) -> None:
+        if self._q1_predicate_chain is None:
+            super()._handle_data_batch_message(message)
+            return
 
         message_type = communication_protocol.get_message_type(message)
         session_id = communication_protocol.get_message_session_id(message)
-        for batch_item in communication_protocol.decode_batch_message(message):
-            if batch_item[sharding_key] == "":
-                # [IMPORTANT] If sharding value is empty, the hash will fail
-                # but we are going to assign it to the first reducer anyway
-                hash = 0
-                batchs_by_hash.setdefault(hash, [])
-                batchs_by_hash[hash].append(batch_item)
-                continue
-            sharding_value = int(float(batch_item[sharding_key]))
-            batch_item[sharding_key] = str(sharding_value)
-
-            hash = sharding_value % len(self._mom_producers)
-            batchs_by_hash.setdefault(hash, [])
-            batchs_by_hash[hash].append(batch_item)
-
-        for hash, user_batch in batchs_by_hash.items():
-            mom_producer = self._mom_producers[hash]
-            message = communication_protocol.encode_batch_message(
-                message_type, session_id, user_batch
+
+        batch = communication_protocol.decode_batch(message)
+        batch = batch.select(self._inclusion_mask(batch))
+        if batch.is_empty():
+            return
+        self._mom_send_message_to_next(
+            communication_protocol.encode_batch(message_type, session_id, batch)
+        )
+
+        q1_batch = batch.select(self._q1_predicate_chain.inclusion_mask(batch))
+        if not q1_batch.is_empty():
+            self._mom_send_message_to_q1(
+                communication_protocol.encode_batch(message_type, session_id, q1_batch)
             )
-            mom_producer.send(message)
@@ -2,15 +2,123 @@ import logging
 from abc import abstractmethod
 from typing import Any, Callable
 
+from controllers.shared.coalescing_producer import coalescing
 from controllers.shared.controller import Controller
 from middleware.middleware import MessageMiddleware
 from shared import communication_protocol
+from shared.batch import Batch
+
+
+class Predicate:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        name: str,
+        column_name: str,
+        is_satisfied_by: Callable[[str], bool],
+    ) -> None:
+        self._name = name
+        self._column_name = column_name
+        self._is_satisfied_by = is_satisfied_by
+
+        self._evaluated_rows_amount = 0
+        self._passed_rows_amount = 0
+
+    @classmethod
+    def value_in(cls, column_name: str, values: set[str]) -> "Predicate":
+        return cls(
+            f"{column_name} in {sorted(values)}", column_name, values.__contains__
+        )
+
+    @classmethod
+    def at_least(cls, column_name: str, min_value: float) -> "Predicate":
+        def is_satisfied_by(value: str) -> bool:
+            try:
+                return float(value) >= min_value
+            except ValueError:
+                return False
+
+        return cls(f"{column_name} >= {min_value}", column_name, is_satisfied_by)
+
+    # ============================== PUBLIC - ACCESSING ============================== #
+
+    def name(self) -> str:
+        return self._name
+
+    def column_name(self) -> str:
+        return self._column_name
+
+    def pass_rate(self) -> float:
+        # smoothed so predicates not evaluated yet are neither first nor last
+        return (self._passed_rows_amount + 1) / (self._evaluated_rows_amount + 2)
+
+    # ============================== PUBLIC ============================== #
+
+    def surviving_rows(self, column: list[str], rows: list[int]) -> list[int]:
+        is_satisfied_by = self._is_satisfied_by
+        surviving_rows = [row for row in rows if is_satisfied_by(column[row])]
+
+        self._evaluated_rows_amount += len(rows)
+        self._passed_rows_amount += len(surviving_rows)
+        return surviving_rows
+
+
+class PredicateChain:
+
+    # [IMPORTANT] every predicate only evaluates the rows that survived the
+    # previous ones, so they are kept sorted by observed pass rate: the most
+    # selective predicate runs first and discards most rows for the rest
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, predicates: list[Predicate]) -> None:
+        self._predicates = list(predicates)
+
+    # ============================== PUBLIC - ACCESSING ============================== #
+
+    def predicates(self) -> list[Predicate]:
+        return list(self._predicates)
+
+    # ============================== PUBLIC ============================== #
+
+    def inclusion_mask(self, batch: Batch) -> list[bool]:
+        rows = list(range(len(batch)))
+        for predicate in self._predicates:
+            if len(rows) == 0:
+                break
+            rows = predicate.surviving_rows(batch.column(predicate.column_name()), rows)
+
+        mask = [False] * len(batch)
+        for row in rows:
+            mask[row] = True
+
+        self._predicates.sort(key=lambda predicate: predicate.pass_rate())
+        return mask
 
 
 class Filter(Controller):
 
     # ============================== INITIALIZE ============================== #
 
+    def __init__(
+        self,
+        controller_id: int,
+        rabbitmq_host: str,
+        consumers_config: dict[str, Any],
+        producers_config: dict[str, Any],
+        predicates: list[Predicate],
+    ) -> None:
+        super().__init__(
+            controller_id,
+            rabbitmq_host,
+            consumers_config,
+            producers_config,
+        )
+
+        self._predicate_chain = PredicateChain(predicates)
+
     @abstractmethod
     def _build_mom_consumer_using(
         self,
@@ -52,7 +160,15 @@ class Filter(Controller):
             mom_producer = self._build_mom_producer_using(
                 rabbitmq_host, producers_config, producer_id
             )
-            self._mom_producers.append(mom_producer)
+            self._mom_producers.append(
+                coalescing(mom_producer, producers_config["coalescing_config"])
+            )
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _all_mom_producers(self) -> list[MessageMiddleware]:
+        # every producer that must receive the EOFs and be closed
+        return self._mom_producers
 
     # ============================== PRIVATE - SIGNAL HANDLER ============================== #
 
@@ -62,9 +178,8 @@ class Filter(Controller):
 
     # ============================== PRIVATE - TRANSFORM DATA ============================== #
 
-    @abstractmethod
-    def _should_be_included(self, batch_item: dict[str, str]) -> bool:
-        raise NotImplementedError("subclass responsibility")
+    def _inclusion_mask(self, batch: Batch) -> list[bool]:
+        return self._predicate_chain.inclusion_mask(batch)
 
     def _transform_batch_message_using(
         self,
@@ -74,17 +189,15 @@ class Filter(Controller):
         message_type: str,
         session_id: str,
     ) -> str:
-        new_batch = []
-        for item in decoder(message):
-            if self._should_be_included(item):
-                new_batch.append(item)
+        batch = decoder(message)
+        new_batch = batch.select(self._inclusion_mask(batch))
         return str(encoder(message_type, session_id, new_batch))
 
     def _transform_batch_message(self, message: str) -> str:
         return self._transform_batch_message_using(
             message,
-            communication_protocol.decode_batch_message,
-            communication_protocol.encode_batch_message,
+            communication_protocol.decode_batch,
+            communication_protocol.encode_batch,
             communication_protocol.get_message_type(message),
             communication_protocol.get_message_session_id(message),
         )
@@ -131,8 +244,9 @@ class Filter(Controller):
                 f"action: all_eofs_received | result: success | session_id: {session_id}"
             )
 
-            for mom_producer in self._mom_producers:
+            for mom_producer in self._all_mom_producers():
                 mom_producer.send(message)
+                mom_producer.flush()
             logging.info(
                 f"action: eof_sent | result: success | session_id: {session_id}"
             )
@@ -155,10 +269,11 @@ class Filter(Controller):
 
     def _run(self) -> None:
         super()._run()
+        self._mom_consumer.bind_producers(self._all_mom_producers())
         self._mom_consumer.start_consuming(self._handle_received_data)
 
     def _close_all(self) -> None:
-        for mom_producer in self._mom_producers:
+        for mom_producer in self._all_mom_producers():
             mom_producer.close()
             logging.debug("action: mom_producer_producer_close | result: success")
 
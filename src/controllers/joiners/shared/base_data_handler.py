@@ -2,6 +2,7 @@ import logging
 import threading
 from typing import Any, Callable, Union
 
+from controllers.joiners.shared.base_data_index import BaseDataIndex
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
 )
@@ -33,10 +34,13 @@ class BaseDataHandler:
         rabbitmq_host: str,
         consumers_config: dict[str, Any],
         build_mom_consumer: Callable,
-        base_data_by_session_id: dict[str, list[dict[str, Any]]],
+        base_data_by_session_id: dict[str, BaseDataIndex],
         base_data_by_session_id_lock: Any,
         all_base_data_received: dict[str, bool],
         all_base_data_received_lock: Any,
+        on_all_base_data_received: Callable[[str], None],
+        join_key: str,
+        transform_function: Callable,
         is_stopped: threading.Event,
     ) -> None:
         self._controller_id = controller_id
@@ -45,11 +49,15 @@ class BaseDataHandler:
 
         self._init_mom_consumers(rabbitmq_host, consumers_config)
 
+        self._join_key = join_key
+        self._transform_function = transform_function
+
         self._base_data_by_session_id = base_data_by_session_id
         self._base_data_by_session_id_lock = base_data_by_session_id_lock
 
         self._all_base_data_received = all_base_data_received
         self._all_base_data_received_lock = all_base_data_received_lock
+        self._on_all_base_data_received = on_all_base_data_received
 
         self.is_stopped = is_stopped
 
@@ -79,10 +87,15 @@ class BaseDataHandler:
     def _handle_base_data_batch_message(self, message: str) -> None:
         session_id = communication_protocol.get_message_session_id(message)
         batch_message = communication_protocol.decode_batch_message(message)
-        for item_batch in batch_message:
-            with self._base_data_by_session_id_lock:
-                self._base_data_by_session_id.setdefault(session_id, [])
-                self._base_data_by_session_id[session_id].append(item_batch)
+        with self._base_data_by_session_id_lock:
+            base_data_index = self._base_data_by_session_id.get(session_id)
+            if base_data_index is None:
+                base_data_index = BaseDataIndex(
+                    self._join_key, self._transform_function
+                )
+                self._base_data_by_session_id[session_id] = base_data_index
+            for item_batch in batch_message:
+                base_data_index.add(item_batch)
 
     def _clean_session_data_of(self, session_id: str) -> None:
         logging.info(
@@ -113,6 +126,7 @@ class BaseDataHandler:
 
             with self._all_base_data_received_lock:
                 self._all_base_data_received[session_id] = True
+            self._on_all_base_data_received(session_id)
 
             self._clean_session_data_of(session_id)
 
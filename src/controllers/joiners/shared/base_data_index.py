@@ -0,0 +1,44 @@
+from typing import Any, Callable, Optional
+
+
+class BaseDataIndex:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, join_key: str, transform_function: Callable) -> None:
+        self._join_key = join_key
+        self._transform_function = transform_function
+
+        self._base_item_by_join_value: dict[Any, dict[str, str]] = {}
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _join_value_of(self, batch_item: dict[str, str]) -> Optional[Any]:
+        optional_value = batch_item.get(self._join_key)
+        if optional_value is None or optional_value == "":
+            return None
+        return self._transform_function(optional_value)
+
+    # ============================== PUBLIC ============================== #
+
+    def add(self, base_item: dict[str, str]) -> None:
+        join_value = self._join_value_of(base_item)
+        if join_value is None:
+            return
+
+        # the first base item received for a join value wins,
+        # same as the previous linear scan did
+        self._base_item_by_join_value.setdefault(join_value, base_item)
+
+    def join(self, stream_item: dict[str, str]) -> Optional[dict[str, str]]:
+        join_value = self._join_value_of(stream_item)
+        if join_value is None:
+            return None
+
+        base_item = self._base_item_by_join_value.get(join_value)
+        if base_item is None:
+            return None
+        return {**stream_item, **base_item}
+
+    def __len__(self) -> int:
+        return len(self._base_item_by_join_value)
@@ -0,0 +1,83 @@
+from typing import Iterator, Optional
+
+from controllers.joiners.shared.stream_data_buffer import StreamDataBuffer
+
+# states names
+RECEIVING_ALL_DATA = "receiving_all_data"
+RECEIVING_BASE_DATA = "receiving_base_data"
+RECEIVING_STREAM_DATA = "receiving_stream_data"
+FINISHED = "finished"
+
+
+class JoinSession:
+
+    # [IMPORTANT] a session is finished as soon as both its base data and all
+    # its stream data EOFs were received, whichever comes last; the stream
+    # data received before the base data is buffered until then
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        session_id: str,
+        prev_controllers_amount: int,
+        stream_data_buffer: StreamDataBuffer,
+    ) -> None:
+        self.session_id = session_id
+        self._prev_controllers_amount = prev_controllers_amount
+
+        self._state = RECEIVING_ALL_DATA
+        self._eofs_received_amount = 0
+        self._eof_message: Optional[str] = None
+        self._stream_data_buffer = stream_data_buffer
+
+    # ============================== PUBLIC - ACCESSING ============================== #
+
+    def state(self) -> str:
+        return self._state
+
+    def is_base_data_received(self) -> bool:
+        return self._state in [RECEIVING_STREAM_DATA, FINISHED]
+
+    def is_finished(self) -> bool:
+        return self._state == FINISHED
+
+    def all_eofs_received(self) -> bool:
+        return self._eof_message is not None
+
+    def eof_message(self) -> str:
+        if self._eof_message is None:
+            raise ValueError(
+                f"EOF message requested before all EOFs were received: {self.session_id}"
+            )
+        return self._eof_message
+
+    def stream_data_buffer(self) -> StreamDataBuffer:
+        return self._stream_data_buffer
+
+    # ============================== PUBLIC - STREAM DATA ============================== #
+
+    def buffer(self, message: str) -> None:
+        self._stream_data_buffer.append(message)
+
+    def take_buffered_messages(self) -> Iterator[str]:
+        return self._stream_data_buffer.take_all()
+
+    # ============================== PUBLIC - TRANSITIONS ============================== #
+
+    def eof_received(self, message: str) -> None:
+        self._eofs_received_amount += 1
+        if self._eofs_received_amount < self._prev_controllers_amount:
+            return
+
+        self._eof_message = message
+        if self._state == RECEIVING_ALL_DATA:
+            self._state = RECEIVING_BASE_DATA
+        elif self._state == RECEIVING_STREAM_DATA:
+            self._state = FINISHED
+
+    def base_data_received(self) -> None:
+        if self._state == RECEIVING_ALL_DATA:
+            self._state = RECEIVING_STREAM_DATA
+        elif self._state == RECEIVING_BASE_DATA:
+            self._state = FINISHED
@@ -4,6 +4,7 @@ from abc import abstractmethod
 from typing import Any, Optional
 
 from controllers.joiners.shared.base_data_handler import BaseDataHandler
+from controllers.joiners.shared.base_data_index import BaseDataIndex
 from controllers.joiners.shared.stream_data_handler import StreamDataHandler
 from controllers.shared.controller import Controller
 from middleware.middleware import MessageMiddleware
@@ -69,7 +70,7 @@ class Joiner(Controller):
         self._consumers_config = consumers_config
         self._producers_config = producers_config
 
-        self._base_data_by_session_id = {}
+        self._base_data_by_session_id: dict[str, BaseDataIndex] = {}
         self._base_data_by_session_id_lock = threading.Lock()
 
         self._all_base_data_received = {}
@@ -110,6 +111,20 @@ class Joiner(Controller):
     def _transform_function(self, value: str) -> Any:
         raise NotImplementedError("subclass responsibility")
 
+    def _notify_all_base_data_received(self, session_id: str) -> None:
+        # [IMPORTANT] a stream data handler created later sees the base data
+        # as received with the first message of the session
+        stream_data_handler = self._stream_data_handler
+        if stream_data_handler is None:
+            return
+        try:
+            stream_data_handler.schedule_all_base_data_received(session_id)
+        except Exception as e:
+            # the stream data handler has already been closed
+            logging.debug(
+                f"action: schedule_all_base_data_received | result: fail | session_id: {session_id} | error: {e}"
+            )
+
     def _handle_base_data(self) -> None:
         try:
             self._base_data_handler = BaseDataHandler(
@@ -121,6 +136,9 @@ class Joiner(Controller):
                 base_data_by_session_id_lock=self._base_data_by_session_id_lock,
                 all_base_data_received=self._all_base_data_received,
                 all_base_data_received_lock=self._all_base_data_received_lock,
+                on_all_base_data_received=self._notify_all_base_data_received,
+                join_key=self._join_key(),
+                transform_function=self._transform_function,
                 is_stopped=self.is_stopped,
             )
             self._base_data_handler.run()
@@ -144,8 +162,6 @@ class Joiner(Controller):
                 base_data_by_session_id_lock=self._base_data_by_session_id_lock,
                 all_base_data_received=self._all_base_data_received,
                 all_base_data_received_lock=self._all_base_data_received_lock,
-                join_key=self._join_key(),
-                transform_function=self._transform_function,
                 is_stopped=self.is_stopped,
             )
             self._stream_data_handler.run()
@@ -0,0 +1,117 @@
+import logging
+import os
+import tempfile
+from typing import IO, Iterator, Optional
+
+
+class StreamDataBuffer:
+
+    # [IMPORTANT] the stream data of a session received before its base data is
+    # kept in memory up to max_bytes_in_memory (0 means no limit), the rest is
+    # appended to a log on spill_dir; both are replayed in arrival order once
+    # the base data is received. Consuming is not paused instead because the
+    # stream data queue is shared by every session of the joiner
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, session_id: str, max_bytes_in_memory: int, spill_dir: str):
+        self._session_id = session_id
+        self._max_bytes_in_memory = max_bytes_in_memory
+        self._spill_dir = spill_dir
+
+        self._messages: list[str] = []
+        self._bytes_in_memory = 0
+
+        self._spill_log: Optional[IO[bytes]] = None
+        self._spilled_messages_amount = 0
+        self._spilled_bytes = 0
+
+    # ============================== PRIVATE - SPILL LOG ============================== #
+
+    def _must_spill(self, message_bytes: int) -> bool:
+        if self._max_bytes_in_memory <= 0:
+            return False
+        # once spilling, later messages are spilled too to keep their order
+        if self._spill_log is not None:
+            return True
+        return self._bytes_in_memory + message_bytes > self._max_bytes_in_memory
+
+    def _open_spill_log(self) -> IO[bytes]:
+        spill_log = tempfile.NamedTemporaryFile(
+            mode="w+b",
+            dir=self._spill_dir,
+            prefix=f"stream-data-{self._session_id}-",
+            suffix=".log",
+            delete=False,
+        )
+        logging.info(
+            f"action: spill_stream_data | result: in_progress | session_id: {self._session_id} | bytes_in_memory: {self._bytes_in_memory} | path: {spill_log.name}"
+        )
+        return spill_log
+
+    def _spill(self, encoded_message: bytes) -> None:
+        if self._spill_log is None:
+            self._spill_log = self._open_spill_log()
+
+        # messages are length prefixed, their payload may contain new lines
+        self._spill_log.write(f"{len(encoded_message)}\n".encode("utf-8"))
+        self._spill_log.write(encoded_message)
+        self._spilled_messages_amount += 1
+        self._spilled_bytes += len(encoded_message)
+
+    def _spilled_messages(self, spill_log: IO[bytes]) -> Iterator[str]:
+        spill_log.flush()
+        spill_log.seek(0)
+        while True:
+            length_line = spill_log.readline()
+            if length_line == b"":
+                return
+            yield spill_log.read(int(length_line)).decode("utf-8")
+
+    # ============================== PUBLIC - ACCESSING ============================== #
+
+    def buffered_messages_amount(self) -> int:
+        return len(self._messages) + self._spilled_messages_amount
+
+    def bytes_in_memory(self) -> int:
+        return self._bytes_in_memory
+
+    def spilled_bytes(self) -> int:
+        return self._spilled_bytes
+
+    # ============================== PUBLIC ============================== #
+
+    def append(self, message: str) -> None:
+        encoded_message = message.encode("utf-8")
+        if self._must_spill(len(encoded_message)):
+            self._spill(encoded_message)
+            return
+
+        self._messages.append(message)
+        self._bytes_in_memory += len(encoded_message)
+
+    def take_all(self) -> Iterator[str]:
+        messages = self._messages
+        spill_log = self._spill_log
+        self._messages = []
+        self._bytes_in_memory = 0
+        self._spill_log = None
+        self._spilled_messages_amount = 0
+        self._spilled_bytes = 0
+
+        yield from messages
+        if spill_log is None:
+            return
+        try:
+            yield from self._spilled_messages(spill_log)
+        finally:
+            spill_log.close()
+            os.remove(spill_log.name)
+
+    def delete(self) -> None:
+        if self._spill_log is None:
+            return
+        self._spill_log.close()
+        if os.path.exists(self._spill_log.name):
+            os.remove(self._spill_log.name)
+        self._spill_log = None
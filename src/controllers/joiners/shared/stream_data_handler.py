@@ -1,7 +1,11 @@
 import logging
 import threading
-from typing import Any, Callable, Union
+from typing import Any, Callable, Iterable, Union
 
+from controllers.joiners.shared.base_data_index import BaseDataIndex
+from controllers.joiners.shared.join_session import JoinSession
+from controllers.joiners.shared.stream_data_buffer import StreamDataBuffer
+from middleware.dispatcher import build_dispatcher
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
@@ -19,10 +23,10 @@ class StreamDataHandler:
         rabbitmq_host: str,
         consumers_config: dict[str, Any],
     ) -> None:
-        self._eof_recv_from_prev_controllers: dict[str, int] = {}
         self._prev_controllers_amount = consumers_config[
             "stream_data_prev_controllers_amount"
         ]
+        self._buffering_config = consumers_config["stream_data_buffering_config"]
 
         self._mom_consumer: Union[
             RabbitMQMessageMiddlewareQueue, RabbitMQMessageMiddlewareExchange
@@ -33,7 +37,6 @@ class StreamDataHandler:
         rabbitmq_host: str,
         producers_config: dict[str, Any],
     ) -> None:
-        self._current_producer_id = 0
         self._mom_producers: list[MessageMiddleware] = []
 
         next_controllers_amount = producers_config["next_controllers_amount"]
@@ -43,6 +46,10 @@ class StreamDataHandler:
             )
             self._mom_producers.append(mom_producer)
 
+        self._dispatcher = build_dispatcher(
+            self._mom_producers, producers_config.get("dispatching_config")
+        )
+
     def __init__(
         self,
         controller_id: int,
@@ -51,12 +58,10 @@ class StreamDataHandler:
         producers_config: dict[str, Any],
         build_mom_consumer: Callable,
         build_mom_producer: Callable,
-        base_data_by_session_id: dict[str, list[dict[str, Any]]],
+        base_data_by_session_id: dict[str, BaseDataIndex],
         base_data_by_session_id_lock: Any,
         all_base_data_received: dict[str, bool],
         all_base_data_received_lock: Any,
-        join_key: str,
-        transform_function: Callable,
         is_stopped: threading.Event,
     ) -> None:
         self._controller_id = controller_id
@@ -67,10 +72,7 @@ class StreamDataHandler:
         self._init_mom_consumers(rabbitmq_host, consumers_config)
         self._init_mom_producers(rabbitmq_host, producers_config)
 
-        self._join_key = join_key
-        self._transform_function = transform_function
-
-        self._stream_data_buffer_by_session_id: dict[str, list[str]] = {}
+        self._join_session_by_session_id: dict[str, JoinSession] = {}
 
         self._base_data_by_session_id = base_data_by_session_id
         self._base_data_by_session_id_lock = base_data_by_session_id_lock
@@ -106,35 +108,23 @@ class StreamDataHandler:
 
     # ============================== PRIVATE - JOIN ============================== #
 
-    def _should_be_joined(
-        self, base_item: dict[str, str], stream_item: dict[str, str]
-    ) -> bool:
-        base_optional_value = base_item.get(self._join_key)
-        stream_optional_value = stream_item.get(self._join_key)
-        if base_optional_value is None or stream_optional_value is None:
-            return False
-
-        base_value = self._transform_function(base_optional_value)
-        stream_value = self._transform_function(stream_optional_value)
-        return base_value == stream_value  # type: ignore
-
     def _join_with_base_data(self, message: str) -> str:
         message_type = communication_protocol.get_message_type(message)
         session_id = communication_protocol.get_message_session_id(message)
         stream_data = communication_protocol.decode_batch_message(message)
+        with self._base_data_by_session_id_lock:
+            base_data_index = self._base_data_by_session_id.get(session_id)
         joined_data: list[dict[str, str]] = []
         for stream_item in stream_data:
-            was_joined = False
-            for base_item in self._base_data_by_session_id[session_id]:
-                if self._should_be_joined(base_item, stream_item):
-                    joined_item = {**stream_item, **base_item}
-                    joined_data.append(joined_item)
-                    was_joined = True
-                    break
-            if not was_joined:
+            joined_item = None
+            if base_data_index is not None:
+                joined_item = base_data_index.join(stream_item)
+            if joined_item is None:
                 self._log_warning(
                     f"action: join_with_base_data | result: error | stream_item: {stream_item}"
                 )
+                continue
+            joined_data.append(joined_item)
         return communication_protocol.encode_batch_message(
             message_type, session_id, joined_data
         )
@@ -142,91 +132,124 @@ class StreamDataHandler:
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
     def _mom_send_message_to_next(self, message: str) -> None:
-        mom_cleaned_data_producer = self._mom_producers[self._current_producer_id]
-        mom_cleaned_data_producer.send(message)
-
-        self._current_producer_id += 1
-        if self._current_producer_id >= len(self._mom_producers):
-            self._current_producer_id = 0
+        self._dispatcher.send(message)
 
-    def _handle_all_buffered_messages(self, session_id: str) -> None:
-        self._log_info(
-            f"action: handle_all_buffered_messages | result: success | session_id: {session_id}"
-        )
-        messages = self._stream_data_buffer_by_session_id.get(session_id, [])
+    def _send_joined_messages_of(self, messages: Iterable[str]) -> None:
         for message in messages:
             joined_message = self._join_with_base_data(message)
             if not communication_protocol.message_without_payload(joined_message):
                 self._mom_send_message_to_next(joined_message)
-        self._stream_data_buffer_by_session_id[session_id] = []
-
-    def _handle_batch_message_when_all_base_data_received(self, message: str) -> None:
-        session_id = communication_protocol.get_message_session_id(message)
-        with self._all_base_data_received_lock:
-            self._stream_data_buffer_by_session_id.setdefault(session_id, [])
-            self._stream_data_buffer_by_session_id[session_id].append(message)
-            if self._all_base_data_received.get(session_id, False):
-                self._handle_all_buffered_messages(session_id)
-            else:
-                self._log_debug(
-                    f"action: stream_data_received_before_base_data | result: success | session_id: {session_id}"
-                )
 
     def _clean_session_data_of(self, session_id: str) -> None:
         logging.info(
             f"action: clean_session_data | result: in_progress | session_id: {session_id}"
         )
 
-        del self._eof_recv_from_prev_controllers[session_id]
-
-        if session_id in self._stream_data_buffer_by_session_id:
-            del self._stream_data_buffer_by_session_id[session_id]
+        join_session = self._join_session_by_session_id.pop(session_id)
+        join_session.stream_data_buffer().delete()
 
         with self._all_base_data_received_lock:
-            del self._all_base_data_received[session_id]
+            self._all_base_data_received.pop(session_id, None)
         with self._base_data_by_session_id_lock:
-            del self._base_data_by_session_id[session_id]
+            self._base_data_by_session_id.pop(session_id, None)
 
         logging.info(
             f"action: clean_session_data | result: success | session_id: {session_id}"
         )
 
+    # ============================== PRIVATE - JOIN SESSIONS ============================== #
+
+    def _join_session_of(self, session_id: str) -> JoinSession:
+        join_session = self._join_session_by_session_id.get(session_id)
+        if join_session is None:
+            stream_data_buffer = StreamDataBuffer(
+                session_id,
+                self._buffering_config["max_bytes_in_memory"],
+                self._buffering_config["spill_dir"],
+            )
+            join_session = JoinSession(
+                session_id, self._prev_controllers_amount, stream_data_buffer
+            )
+            self._join_session_by_session_id[session_id] = join_session
+        return join_session
+
+    def _finish_join_session(self, join_session: JoinSession) -> None:
+        session_id = join_session.session_id
+        self._send_joined_messages_of(join_session.take_buffered_messages())
+
+        eof_message = join_session.eof_message()
+        for mom_producer in self._mom_producers:
+            mom_producer.send(eof_message)
+        self._log_info(f"action: eof_sent | result: success | session_id: {session_id}")
+
+        self._clean_session_data_of(session_id)
+
+    def _log_buffered_stream_data_of(self, join_session: JoinSession) -> None:
+        stream_data_buffer = join_session.stream_data_buffer()
+        self._log_info(
+            f"action: buffered_stream_data | result: success | session_id: {join_session.session_id} | state: {join_session.state()} | messages: {stream_data_buffer.buffered_messages_amount()} | bytes_in_memory: {stream_data_buffer.bytes_in_memory()} | spilled_bytes: {stream_data_buffer.spilled_bytes()}"
+        )
+
+    def _update_join_session_base_data(self, join_session: JoinSession) -> None:
+        if join_session.is_base_data_received():
+            return
+        with self._all_base_data_received_lock:
+            all_base_data_received = self._all_base_data_received.get(
+                join_session.session_id, False
+            )
+        if not all_base_data_received:
+            return
+
+        join_session.base_data_received()
+        self._log_buffered_stream_data_of(join_session)
+        if join_session.is_finished():
+            self._finish_join_session(join_session)
+        else:
+            self._send_joined_messages_of(join_session.take_buffered_messages())
+
+    def _handle_all_base_data_received(self, session_id: str) -> None:
+        # [IMPORTANT] only sessions with stream data are updated here, the
+        # rest see the base data as received with their first message
+        join_session = self._join_session_by_session_id.get(session_id)
+        if join_session is None:
+            return
+        self._update_join_session_base_data(join_session)
+
+    # ============================== PRIVATE - HANDLE STREAM DATA ============================== #
+
+    def _handle_batch_message(self, message: str) -> None:
+        session_id = communication_protocol.get_message_session_id(message)
+        join_session = self._join_session_of(session_id)
+        self._update_join_session_base_data(join_session)
+
+        if join_session.is_base_data_received():
+            self._send_joined_messages_of([message])
+        else:
+            join_session.buffer(message)
+            stream_data_buffer = join_session.stream_data_buffer()
+            self._log_debug(
+                f"action: stream_data_received_before_base_data | result: success | session_id: {session_id} | bytes_in_memory: {stream_data_buffer.bytes_in_memory()} | spilled_bytes: {stream_data_buffer.spilled_bytes()}"
+            )
+
     def _handle_batch_eof(self, message: str) -> None:
         session_id = communication_protocol.get_message_session_id(message)
-        self._eof_recv_from_prev_controllers.setdefault(session_id, 0)
-        self._eof_recv_from_prev_controllers[session_id] += 1
+        join_session = self._join_session_of(session_id)
+        join_session.eof_received(message)
         self._log_debug(
             f"action: eof_received | result: success | session_id: {session_id}"
         )
 
-        if (
-            self._eof_recv_from_prev_controllers[session_id]
-            == self._prev_controllers_amount
-        ):
-            with self._all_base_data_received_lock:
-                all_base_data_received = self._all_base_data_received.get(
-                    session_id, False
-                )
-
-            if all_base_data_received:
-                self._log_info(
-                    f"action: all_eofs_received | result: success | session_id: {session_id}"
-                )
-                self._handle_all_buffered_messages(session_id)
-
-                for mom_producer in self._mom_producers:
-                    mom_producer.send(message)
-                self._log_info(
-                    f"action: eof_sent | result: success | session_id: {session_id}"
-                )
-
-                self._clean_session_data_of(session_id)
-            else:
-                self._log_debug(
-                    f"action: all_eofs_received_before_base_data | result: success | session_id: {session_id}"
-                )
-                self._eof_recv_from_prev_controllers[session_id] -= 1
-                self._mom_consumer.send(message)
+        if not join_session.all_eofs_received():
+            return
+        self._log_info(
+            f"action: all_eofs_received | result: success | session_id: {session_id}"
+        )
+        if join_session.is_finished():
+            self._finish_join_session(join_session)
+            return
+        self._update_join_session_base_data(join_session)
+        if not join_session.is_finished():
+            self._log_buffered_stream_data_of(join_session)
 
     def _handle_stream_data(self, message_as_bytes: bytes) -> None:
         if not self._is_running():
@@ -236,7 +259,7 @@ class StreamDataHandler:
         message = message_as_bytes.decode("utf-8")
         message_type = communication_protocol.get_message_type(message)
         if message_type != communication_protocol.EOF:
-            self._handle_batch_message_when_all_base_data_received(message)
+            self._handle_batch_message(message)
         else:
             self._handle_batch_eof(message)
 
@@ -248,6 +271,10 @@ class StreamDataHandler:
         self._mom_consumer.start_consuming(self._handle_stream_data)
 
     def _close_all(self) -> None:
+        # spilled stream data of unfinished sessions is not kept
+        for join_session in self._join_session_by_session_id.values():
+            join_session.stream_data_buffer().delete()
+
         for mom_producer in self._mom_producers:
             mom_producer.close()
             self._log_info(f"action: mom_producer_close | result: success")
@@ -268,6 +295,13 @@ class StreamDataHandler:
 
     # ============================== PUBLIC ============================== #
 
+    def schedule_all_base_data_received(self, session_id: str) -> None:
+        # [IMPORTANT] called from the base data thread, the session is updated
+        # by this handler's thread, the only one using its connection
+        self._mom_consumer.schedule_callback(
+            lambda: self._handle_all_base_data_received(session_id)
+        )
+
     def run(self) -> None:
         self._log_info(f"action: handler_startup | result: success")
 
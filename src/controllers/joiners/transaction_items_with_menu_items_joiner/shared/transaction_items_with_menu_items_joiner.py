@@ -1,6 +1,7 @@
 from typing import Any
 
 from controllers.joiners.shared.joiner import Joiner
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
@@ -21,6 +22,8 @@ class TransactionItemsWithMenuItemsJoiner(Joiner):
             host=rabbitmq_host,
             exchange_name=exchange_name,
             route_keys=[routing_key],
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+            **consumers_config["consuming_config"],
         )
 
     def _build_mom_stream_data_consumer(
@@ -30,7 +33,12 @@ class TransactionItemsWithMenuItemsJoiner(Joiner):
     ) -> MessageMiddleware:
         queue_name_prefix = consumers_config["stream_data_queue_name_prefix"]
         queue_name = f"{queue_name_prefix}-{self._controller_id}"
-        return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
+        return RabbitMQMessageMiddlewareQueue(
+            host=rabbitmq_host,
+            queue_name=queue_name,
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+            **consumers_config["consuming_config"],
+        )
 
     def _build_mom_producer(
         self,
@@ -15,7 +15,15 @@ def main():
             "BASE_DATA_PREV_CONTROLLERS_AMOUNT",
             "STREAM_DATA_PREV_CONTROLLERS_AMOUNT",
             "NEXT_CONTROLLERS_AMOUNT",
-        ]
+            "PREFETCH_COUNT",
+            "ACK_EVERY_MESSAGES",
+            "ACK_EVERY_MS",
+            "DISPATCH_POLICY",
+            "DISPATCH_REFRESH_EVERY_MESSAGES",
+            "JOINER_MAX_BUFFERED_BYTES_PER_SESSION",
+            "JOINER_SPILL_DIR",
+        ],
+        default_values=constants.CONSUMING_CONFIG_DEFAULT_VALUES,
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
     logging.info(f"action: init_config | result: success | params: {config_params}")
@@ -30,10 +38,27 @@ def main():
         "stream_data_prev_controllers_amount": int(
             config_params["STREAM_DATA_PREV_CONTROLLERS_AMOUNT"]
         ),
+        "stream_data_buffering_config": {
+            "max_bytes_in_memory": int(
+                config_params["JOINER_MAX_BUFFERED_BYTES_PER_SESSION"]
+            ),
+            "spill_dir": config_params["JOINER_SPILL_DIR"],
+        },
+        "consuming_config": {
+            "prefetch_count": int(config_params["PREFETCH_COUNT"]),
+            "ack_every_messages": int(config_params["ACK_EVERY_MESSAGES"]),
+            "ack_every_seconds": int(config_params["ACK_EVERY_MS"]) / 1000,
+        },
     }
     producers_config = {
         "queue_name_prefix": constants.SORTED_DESC_BY_STORE_NAME__PURCHASES_QTY_WITH_USER_BITHDATE,
         "next_controllers_amount": int(config_params["NEXT_CONTROLLERS_AMOUNT"]),
+        "dispatching_config": {
+            "policy": config_params["DISPATCH_POLICY"],
+            "refresh_every_messages": int(
+                config_params["DISPATCH_REFRESH_EVERY_MESSAGES"]
+            ),
+        },
     }
 
     controller = TransactionsWithStoresJoiner(
@@ -1,10 +1,13 @@
 import logging
 from abc import abstractmethod
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
+from controllers.shared.coalescing_producer import coalescing
+from controllers.shared.combiner import Combiner
 from controllers.shared.controller import Controller
 from middleware.middleware import MessageMiddleware
 from shared import communication_protocol
+from shared.batch import Batch
 
 
 class Mapper(Controller):
@@ -52,7 +55,13 @@ class Mapper(Controller):
             mom_producer = self._build_mom_producer_using(
                 rabbitmq_host, producers_config, producer_id
             )
-            self._mom_producers.append(mom_producer)
+            self._mom_producers.append(
+                coalescing(mom_producer, producers_config["coalescing_config"])
+            )
+
+        self._batch_combiner: Optional[Combiner] = None
+        if producers_config["combine_batches"]:
+            self._batch_combiner = self._combiner()
 
     # ============================== PRIVATE - SIGNAL HANDLER ============================== #
 
@@ -63,9 +72,14 @@ class Mapper(Controller):
     # ============================== PRIVATE - TRANSFORM DATA ============================== #
 
     @abstractmethod
-    def _transform_batch_item(self, batch_item: dict[str, str]) -> dict[str, str]:
+    def _transform_batch(self, batch: Batch) -> Batch:
         raise NotImplementedError("subclass responsibility")
 
+    def _combiner(self) -> Optional[Combiner]:
+        # [IMPORTANT] only mappers whose output is consumed just by reducers may
+        # combine, as every column not aggregated by the combiner is dropped
+        return None
+
     def _transform_batch_message_using(
         self,
         message: str,
@@ -74,17 +88,16 @@ class Mapper(Controller):
         message_type: str,
         session_id: str,
     ) -> str:
-        new_batch = []
-        for item in decoder(message):
-            modified_item = self._transform_batch_item(item)
-            new_batch.append(modified_item)
+        new_batch = self._transform_batch(decoder(message))
+        if self._batch_combiner is not None:
+            new_batch = self._batch_combiner.combine(new_batch)
         return str(encoder(message_type, session_id, new_batch))
 
     def _transform_batch_message(self, message: str) -> str:
         return self._transform_batch_message_using(
             message,
-            communication_protocol.decode_batch_message,
-            communication_protocol.encode_batch_message,
+            communication_protocol.decode_batch,
+            communication_protocol.encode_batch,
             communication_protocol.get_message_type(message),
             communication_protocol.get_message_session_id(message),
         )
@@ -129,6 +142,7 @@ class Mapper(Controller):
 
             for mom_producer in self._mom_producers:
                 mom_producer.send(message)
+                mom_producer.flush()
             logging.info(
                 f"action: eof_sent | result: success | session_id: {session_id}"
             )
@@ -151,6 +165,7 @@ class Mapper(Controller):
 
     def _run(self) -> None:
         super()._run()
+        self._mom_consumer.bind_producers(self._mom_producers)
         self._mom_consumer.start_consuming(self._handle_received_data)
 
     def _close_all(self) -> None:
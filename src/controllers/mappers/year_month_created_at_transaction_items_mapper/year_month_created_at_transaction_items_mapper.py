@@ -1,12 +1,16 @@
-from typing import Any
+from typing import Any, Optional
 
 from controllers.mappers.shared.mapper import Mapper
+from controllers.shared import reduce_functions
+from controllers.shared.combiner import Combiner
+from controllers.shared.partitioner import ModuloStrategy, Partitioner
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
 )
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
-from shared import communication_protocol
+from shared.batch import Batch
 
 
 class YearMonthCreatedAtTransactionItemsMapper(Mapper):
@@ -20,7 +24,12 @@ class YearMonthCreatedAtTransactionItemsMapper(Mapper):
     ) -> MessageMiddleware:
         queue_name_prefix = consumers_config["queue_name_prefix"]
         queue_name = f"{queue_name_prefix}-{self._controller_id}"
-        return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
+        return RabbitMQMessageMiddlewareQueue(
+            host=rabbitmq_host,
+            queue_name=queue_name,
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+            **consumers_config["consuming_config"],
+        )
 
     def _build_mom_producer_using(
         self,
@@ -34,44 +43,38 @@ class YearMonthCreatedAtTransactionItemsMapper(Mapper):
             host=rabbitmq_host,
             exchange_name=exchange_name,
             route_keys=[routing_key],
+            **producers_config["publishing_config"],
         )
 
-    # ============================== PRIVATE - TRANSFORM DATA ============================== #
+    def _init_mom_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> None:
+        super()._init_mom_producers(rabbitmq_host, producers_config)
 
-    def _transform_batch_item(self, batch_item: dict[str, str]) -> dict[str, str]:
-        date = batch_item["created_at"].split(" ")[0]
-        month = date.split("-")[1]
-        year = date.split("-")[0]
-        batch_item["year_month_created_at"] = f"{year}-{month}"
-        return batch_item
+        # [IMPORTANT] this must consider the next controller's grouping key
+        shards_amount = len(self._mom_producers)
+        self._partitioner = Partitioner(
+            "item_id", ModuloStrategy(shards_amount), shards_amount
+        )
 
-    # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
+    # ============================== PRIVATE - TRANSFORM DATA ============================== #
 
-    def _mom_send_message_to_next(self, message: str) -> None:
-        batchs_by_hash: dict[int, list] = {}
-        # [IMPORTANT] this must consider the next controller's grouping key
-        sharding_key = "item_id"
+    def _transform_batch(self, batch: Batch) -> Batch:
+        # year_month_created_at is already derived by the transaction items cleaner
+        return batch
 
-        message_type = communication_protocol.get_message_type(message)
-        session_id = communication_protocol.get_message_session_id(message)
-        for batch_item in communication_protocol.decode_batch_message(message):
-            if batch_item[sharding_key] == "":
-                # [IMPORTANT] If sharding value is empty, the hash will fail
-                # but we are going to assign it to the first reducer anyway
-                hash = 0
-                batchs_by_hash.setdefault(hash, [])
-                batchs_by_hash[hash].append(batch_item)
-                continue
-            sharding_value = int(float(batch_item[sharding_key]))
-            batch_item[sharding_key] = str(sharding_value)
+    def _combiner(self) -> Optional[Combiner]:
+        return Combiner(
+            ["item_id", "year_month_created_at"],
+            {
+                "sellings_qty": reduce_functions.sum_quantity,
+                "profit_sum": reduce_functions.sum_subtotal,
+            },
+        )
 
-            hash = sharding_value % len(self._mom_producers)
-            batchs_by_hash.setdefault(hash, [])
-            batchs_by_hash[hash].append(batch_item)
+    # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
-        for hash, user_batch in batchs_by_hash.items():
-            mom_producer = self._mom_producers[hash]
-            message = communication_protocol.encode_batch_message(
-                message_type, session_id, user_batch
-            )
-            mom_producer.send(message)
+    def _mom_send_message_to_next(self, message: str) -> None:
+        self._partitioner.send_partitioned(message, self._mom_producers)
@@ -2,9 +2,14 @@ import logging
 from abc import abstractmethod
 from typing import Any, Callable
 
+from controllers.output_builders.shared.session_producer_cache import (
+    SessionProducerCache,
+)
 from controllers.shared.controller import Controller
+from middleware import rabbitmq_connection_pool
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
 from shared import communication_protocol
+from shared.batch import Batch
 
 
 class QueryOutputBuilder(Controller):
@@ -22,7 +27,10 @@ class QueryOutputBuilder(Controller):
         queue_name_prefix = consumers_config["queue_name_prefix"]
         queue_name = f"{queue_name_prefix}-{self._controller_id}"
         self._mom_consumer = RabbitMQMessageMiddlewareQueue(
-            host=rabbitmq_host, queue_name=queue_name
+            host=rabbitmq_host,
+            queue_name=queue_name,
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+            **consumers_config["consuming_config"],
         )
 
     def _init_mom_producers(
@@ -33,7 +41,14 @@ class QueryOutputBuilder(Controller):
         self._rabbitmq_host = rabbitmq_host
         self._queue_name_prefix = producers_config["queue_name_prefix"]
 
-        self._mom_producers: dict[str, RabbitMQMessageMiddlewareQueue] = {}
+        self._mom_producers = SessionProducerCache(self._build_mom_producer_for)
+
+    def _build_mom_producer_for(
+        self, session_id: str
+    ) -> RabbitMQMessageMiddlewareQueue:
+        return RabbitMQMessageMiddlewareQueue(
+            self._rabbitmq_host, f"{self._queue_name_prefix}-{session_id}"
+        )
 
     # ============================== PRIVATE - INTERFACE ============================== #
 
@@ -53,11 +68,8 @@ class QueryOutputBuilder(Controller):
 
     # ============================== PRIVATE - TRANSFORM DATA ============================== #
 
-    def _transform_batch_item(self, batch_item: dict[str, str]) -> dict:
-        modified_item_batch = {}
-        for column in self._columns_to_keep():
-            modified_item_batch[column] = batch_item[column]
-        return modified_item_batch
+    def _transform_batch(self, batch: Batch) -> Batch:
+        return batch.project(self._columns_to_keep())
 
     def _transform_batch_message_using(
         self,
@@ -67,17 +79,14 @@ class QueryOutputBuilder(Controller):
         message_type: str,
         session_id: str,
     ) -> str:
-        new_batch = []
-        for item in decoder(message):
-            modified_item = self._transform_batch_item(item)
-            new_batch.append(modified_item)
+        new_batch = self._transform_batch(decoder(message))
         return str(encoder(message_type, session_id, new_batch))
 
     def _transform_batch_message(self, message: str) -> str:
         return self._transform_batch_message_using(
             message,
-            communication_protocol.decode_batch_message,
-            communication_protocol.encode_batch_message,
+            communication_protocol.decode_batch,
+            communication_protocol.encode_batch,
             self._output_message_type(),
             communication_protocol.get_message_session_id(message),
         )
@@ -87,13 +96,7 @@ class QueryOutputBuilder(Controller):
     def _handle_data_batch_message(self, message: str) -> None:
         session_id = communication_protocol.get_message_session_id(message)
         output_message = self._transform_batch_message(message)
-        self._mom_producers.setdefault(
-            session_id,
-            RabbitMQMessageMiddlewareQueue(
-                self._rabbitmq_host, f"{self._queue_name_prefix}-{session_id}"
-            ),
-        )
-        self._mom_producers[session_id].send(output_message)
+        self._mom_producers.producer_for(session_id).send(output_message)
 
     def _clean_session_data_of(self, session_id: str) -> None:
         logging.info(
@@ -102,10 +105,7 @@ class QueryOutputBuilder(Controller):
 
         del self._eof_recv_from_prev_controllers[session_id]
 
-        mom_producer = self._mom_producers.pop(session_id, None)
-        if mom_producer:
-            mom_producer.close()
-            logging.debug("action: mom_producer_close | result: success")
+        self._mom_producers.evict(session_id)
 
         logging.info(
             f"action: clean_session_data | result: success | session_id: {session_id}"
@@ -130,13 +130,7 @@ class QueryOutputBuilder(Controller):
             message = communication_protocol.encode_eof_message(
                 session_id, self._output_message_type()
             )
-            self._mom_producers.setdefault(
-                session_id,
-                RabbitMQMessageMiddlewareQueue(
-                    self._rabbitmq_host, f"{self._queue_name_prefix}-{session_id}"
-                ),
-            )
-            self._mom_producers[session_id].send(message)
+            self._mom_producers.producer_for(session_id).send(message)
             logging.info(
                 f"action: eof_sent | result: success | session_id: {session_id}"
             )
@@ -165,9 +159,8 @@ class QueryOutputBuilder(Controller):
         self._mom_consumer.start_consuming(self._handle_received_data)
 
     def _close_all(self) -> None:
-        for mom_producer in self._mom_producers.values():
-            mom_producer.close()
-            logging.debug("action: mom_producer_close | result: success")
+        self._mom_producers.close_all()
+        logging.debug("action: mom_producers_close | result: success")
 
         self._mom_consumer.delete()
         self._mom_consumer.close()
@@ -0,0 +1,106 @@
+import logging
+import time
+from typing import Callable
+
+from middleware.middleware import MessageMiddleware
+
+SESSION_PRODUCER_IDLE_SECONDS = 300.0
+
+
+class SessionProducerCache:
+
+    # [IMPORTANT] producers are created on the first message of a session and
+    # reused until its EOF; RabbitMQ producers of the same thread share one
+    # pooled connection, so a cached session only holds a channel of it
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        build_producer: Callable[[str], MessageMiddleware],
+        idle_seconds: float = SESSION_PRODUCER_IDLE_SECONDS,
+    ) -> None:
+        self._build_producer = build_producer
+        self._idle_seconds = idle_seconds
+
+        self._producer_by_session_id: dict[str, MessageMiddleware] = {}
+        self._last_use_by_session_id: dict[str, float] = {}
+        self._last_idle_check_time = time.monotonic()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    # ============================== PRIVATE - EVICTION ============================== #
+
+    def _close_producer_of(self, session_id: str) -> None:
+        producer = self._producer_by_session_id.pop(session_id)
+        del self._last_use_by_session_id[session_id]
+        self._evictions += 1
+
+        producer.close()
+        logging.debug(
+            f"action: session_producer_close | result: success | session_id: {session_id}"
+        )
+
+    def _evict_idle_producers(self, now: float) -> None:
+        # sessions that stopped sending (e.g. an aborted client) never get
+        # their EOF, so idle producers are checked at most once per idle period
+        if now - self._last_idle_check_time < self._idle_seconds:
+            return
+        self._last_idle_check_time = now
+
+        for session_id, last_use in list(self._last_use_by_session_id.items()):
+            if now - last_use >= self._idle_seconds:
+                self._close_producer_of(session_id)
+                logging.info(
+                    f"action: session_producer_idle_evict | result: success | session_id: {session_id}"
+                )
+
+    # ============================== PUBLIC - ACCESSING ============================== #
+
+    def hits(self) -> int:
+        return self._hits
+
+    def misses(self) -> int:
+        return self._misses
+
+    def evictions(self) -> int:
+        return self._evictions
+
+    def cached_amount(self) -> int:
+        return len(self._producer_by_session_id)
+
+    # ============================== PUBLIC ============================== #
+
+    def producer_for(self, session_id: str) -> MessageMiddleware:
+        now = time.monotonic()
+        self._evict_idle_producers(now)
+
+        producer = self._producer_by_session_id.get(session_id)
+        if producer is None:
+            self._misses += 1
+            producer = self._build_producer(session_id)
+            self._producer_by_session_id[session_id] = producer
+        else:
+            self._hits += 1
+
+        self._last_use_by_session_id[session_id] = now
+        return producer
+
+    def evict(self, session_id: str) -> None:
+        if session_id not in self._producer_by_session_id:
+            return
+
+        self._close_producer_of(session_id)
+        logging.info(
+            f"action: session_producer_evict | result: success | session_id: {session_id} | hits: {self._hits} | misses: {self._misses} | evictions: {self._evictions}"
+        )
+
+    def close_all(self) -> None:
+        for session_id in list(self._producer_by_session_id.keys()):
+            self._close_producer_of(session_id)
+
+        logging.info(
+            f"action: session_producer_cache_close | result: success | hits: {self._hits} | misses: {self._misses} | evictions: {self._evictions}"
+        )
@@ -15,7 +15,13 @@ def main():
             "PREV_CONTROLLERS_AMOUNT",
             "NEXT_CONTROLLERS_AMOUNT",
             "BATCH_MAX_SIZE",
-        ]
+            "PREFETCH_COUNT",
+            "ACK_EVERY_MESSAGES",
+            "ACK_EVERY_MS",
+            "REDUCER_MAX_KEYS_IN_MEMORY",
+            "REDUCER_SPILL_DIR",
+        ],
+        default_values=constants.CONSUMING_CONFIG_DEFAULT_VALUES,
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
     logging.info(f"action: init_config | result: success | params: {config_params}")
@@ -24,6 +30,11 @@ def main():
         "exchange_name_prefix": constants.MAPPED_YEAR_MONTH_TIT_EXHCHANGE_PREFIX,
         "routing_key_prefix": constants.MAPPED_YEAR_MONTH_TIT_ROUTING_KEY_PREFIX,
         "prev_controllers_amount": int(config_params["PREV_CONTROLLERS_AMOUNT"]),
+        "consuming_config": {
+            "prefetch_count": int(config_params["PREFETCH_COUNT"]),
+            "ack_every_messages": int(config_params["ACK_EVERY_MESSAGES"]),
+            "ack_every_seconds": int(config_params["ACK_EVERY_MS"]) / 1000,
+        },
     }
     producers_config = {
         "queue_name_prefix": constants.SELLINGS_QTY_BY_YEAR_MONTH_CREATED_AT__ITEM_ID_QUEUE_PREFIX,
@@ -36,6 +47,8 @@ def main():
         consumers_config=consumers_config,
         producers_config=producers_config,
         batch_max_size=int(config_params["BATCH_MAX_SIZE"]),
+        max_keys_in_memory=int(config_params["REDUCER_MAX_KEYS_IN_MEMORY"]),
+        spill_dir=config_params["REDUCER_SPILL_DIR"],
     )
     controller.run()
 
@@ -1,6 +1,9 @@
 from typing import Any
 
 from controllers.reducers.shared.reducer import Reducer
+from controllers.shared import reduce_functions
+from controllers.shared.partitioner import ModuloStrategy, Partitioner
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
@@ -24,6 +27,8 @@ class SellingsQtyByItemIdAndYearMonthCreatedAtReducer(Reducer):
             host=rabbitmq_host,
             exchange_name=exchange_name,
             route_keys=[routing_key],
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+            **consumers_config["consuming_config"],
         )
 
     def _build_mom_producer_using(
@@ -36,6 +41,22 @@ class SellingsQtyByItemIdAndYearMonthCreatedAtReducer(Reducer):
         queue_name = f"{queue_name_prefix}-{producer_id}"
         return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
 
+    def _init_mom_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> None:
+        super()._init_mom_producers(rabbitmq_host, producers_config)
+
+        # [IMPORTANT] this must consider the next controller's grouping key
+        shards_amount = len(self._mom_producers)
+        self._partitioner = Partitioner(
+            "year_month_created_at",
+            ModuloStrategy(shards_amount),
+            shards_amount,
+            normalize_integer_keys=False,
+        )
+
     # ============================== PRIVATE - ACCESSING ============================== #
 
     def _keys(self) -> list[str]:
@@ -49,45 +70,10 @@ class SellingsQtyByItemIdAndYearMonthCreatedAtReducer(Reducer):
 
     # ============================== PRIVATE - HANDLE DATA ============================== #
 
-    def _reduce_function(
-        self, current_value: float, batch_item: dict[str, str]
-    ) -> float:
-        return current_value + float(batch_item["quantity"])
+    def _reduce_function(self) -> reduce_functions.ReduceFunction:
+        return reduce_functions.sum_quantity
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
-    def _simple_hash(self, value: str) -> int:
-        hash_value = 0
-        prime_multiplier = 31
-        for char in value:
-            char_value = ord(char)
-            hash_value = (hash_value * prime_multiplier) + char_value
-        return hash_value
-
     def _mom_send_message_to_next(self, message: str) -> None:
-        batchs_by_hash: dict[int, list] = {}
-        # [IMPORTANT] this must consider the next controller's grouping key
-        sharding_key = "year_month_created_at"
-
-        message_type = communication_protocol.get_message_type(message)
-        session_id = communication_protocol.get_message_session_id(message)
-        for batch_item in communication_protocol.decode_batch_message(message):
-            if batch_item[sharding_key] == "":
-                # [IMPORTANT] If sharding value is empty, the hash will fail
-                # but we are going to assign it to the first reducer anyway
-                hash = 0
-                batchs_by_hash.setdefault(hash, [])
-                batchs_by_hash[hash].append(batch_item)
-                continue
-            sharding_value = self._simple_hash(batch_item[sharding_key])
-
-            hash = sharding_value % len(self._mom_producers)
-            batchs_by_hash.setdefault(hash, [])
-            batchs_by_hash[hash].append(batch_item)
-
-        for hash, user_batch in batchs_by_hash.items():
-            mom_producer = self._mom_producers[hash]
-            message = communication_protocol.encode_batch_message(
-                message_type, session_id, user_batch
-            )
-            mom_producer.send(message)
+        self._partitioner.send_partitioned(message, self._mom_producers)
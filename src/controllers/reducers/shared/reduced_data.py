@@ -1,9 +1,19 @@
+import heapq
+import json
 import logging
-from typing import Callable
+import os
+import tempfile
+from typing import Iterator, Optional
+
+from controllers.shared import group_by
+from controllers.shared.reduce_functions import ReduceFunction
+from shared.batch import Batch
+
+ReducedEntry = tuple[tuple, float]
 
 
 class ReducedData:
-    def __init__(self, keys: list[str], accumulator_name: str):
+    def __init__(self, keys: list[str], accumulator_name: str, spill_dir: str):
         self._keys = keys
         self._accumulator_name = accumulator_name
 
@@ -11,6 +21,13 @@ class ReducedData:
 
         self._logging_counter = 0
 
+        # [IMPORTANT] spilled runs hold partial results sorted by key, merged by
+        # adding them up once all the data was reduced (reduce functions are sums)
+        self._spill_dir = spill_dir
+        self._spilled_run_paths: list[str] = []
+        self._merged_entries: Optional[Iterator[ReducedEntry]] = None
+        self._next_merged_entry: Optional[ReducedEntry] = None
+
     def _logging_warning_when_count_reached(self) -> None:
         if self._logging_counter >= 1000:
             logging.warning(
@@ -18,25 +35,100 @@ class ReducedData:
             )
             self._logging_counter = 0
 
-    def reduce_using(
-        self,
-        batch_item: dict[str, str],
-        reduce_function: Callable,
-    ) -> None:
-        for k in self._keys:
-            if batch_item[k] == "":
-                self._logging_counter += 1
-                self._logging_warning_when_count_reached()
-                return
+    # ============================== PRIVATE - SPILLING ============================== #
+
+    def _entries_of_spilled_run(self, path: str) -> Iterator[ReducedEntry]:
+        with open(path, "r", encoding="utf-8") as spilled_run_file:
+            for line in spilled_run_file:
+                key, value = json.loads(line)
+                yield tuple(key), value
+
+    def _merge_all_entries(self) -> Iterator[ReducedEntry]:
+        sorted_runs: list[Iterator[ReducedEntry]] = [
+            self._entries_of_spilled_run(path) for path in self._spilled_run_paths
+        ]
+        sorted_runs.append(iter(sorted(self._reduced_data.items())))
+        self._reduced_data = {}
+
+        current_key: Optional[tuple] = None
+        current_value = 0.0
+        for key, value in heapq.merge(*sorted_runs, key=lambda entry: entry[0]):
+            if key == current_key:
+                current_value += value
+                continue
+            if current_key is not None:
+                yield current_key, current_value
+            current_key, current_value = key, value
+        if current_key is not None:
+            yield current_key, current_value
+
+        self.delete_spilled_runs()
+
+    def _start_merging_if_spilled(self) -> None:
+        if self._merged_entries is not None or len(self._spilled_run_paths) == 0:
+            return
+
+        self._merged_entries = self._merge_all_entries()
+        self._next_merged_entry = next(self._merged_entries, None)
+
+    def _pop_next_entry(self) -> ReducedEntry:
+        self._start_merging_if_spilled()
+        if self._merged_entries is None:
+            return self._reduced_data.popitem()
+
+        if self._next_merged_entry is None:
+            raise KeyError("pop_next_batch_item(): reduced data is empty")
+        entry = self._next_merged_entry
+        self._next_merged_entry = next(self._merged_entries, None)
+        return entry
+
+    # ============================== PUBLIC ============================== #
+
+    def reduce_batch(self, batch: Batch, reduce_function: ReduceFunction) -> None:
+        # [IMPORTANT] the whole batch is grouped at once and only its partial
+        # results are merged, adding them up
+        groups = group_by.group_by_keys([batch.column(k) for k in self._keys])
+        if groups.skipped_rows_amount > 0:
+            self._logging_counter += groups.skipped_rows_amount
+            self._logging_warning_when_count_reached()
+
+        reduced_data = self._reduced_data
+        for key, value in zip(groups.keys, reduce_function(batch, groups)):
+            reduced_data[key] = reduced_data.get(key, 0) + value
+
+    def resident_keys_amount(self) -> int:
+        return len(self._reduced_data)
+
+    def spill(self) -> None:
+        if len(self._reduced_data) == 0:
+            return
+
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=self._spill_dir,
+            prefix="reduced-data-",
+            suffix=".run",
+            delete=False,
+        ) as spilled_run_file:
+            for key, value in sorted(self._reduced_data.items()):
+                spilled_run_file.write(json.dumps([key, value]))
+                spilled_run_file.write("\n")
+            self._spilled_run_paths.append(spilled_run_file.name)
 
-        key = tuple(batch_item[k] for k in self._keys)
-        if key not in self._reduced_data:
-            self._reduced_data[key] = 0
+        logging.debug(
+            f"action: spill_reduced_data | result: success | keys: {len(self._reduced_data)} | path: {spilled_run_file.name}"
+        )
+        self._reduced_data = {}
 
-        self._reduced_data[key] = reduce_function(self._reduced_data[key], batch_item)
+    def delete_spilled_runs(self) -> None:
+        for path in self._spilled_run_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        self._spilled_run_paths = []
 
     def pop_next_batch_item(self) -> dict[str, str]:
-        key, value = self._reduced_data.popitem()
+        key, value = self._pop_next_entry()
         batch_item: dict[str, str] = {}
         for i, k in enumerate(self._keys):
             batch_item[k] = key[i]
@@ -44,4 +136,7 @@ class ReducedData:
         return batch_item
 
     def is_empty(self) -> bool:
+        self._start_merging_if_spilled()
+        if self._merged_entries is not None:
+            return self._next_merged_entry is None
         return len(self._reduced_data) == 0
@@ -3,7 +3,9 @@ from abc import abstractmethod
 from typing import Any
 
 from controllers.reducers.shared.reduced_data import ReducedData
+from controllers.shared import reduce_functions
 from controllers.shared.controller import Controller
+from middleware.dispatcher import build_dispatcher
 from middleware.middleware import MessageMiddleware
 from shared import communication_protocol
 
@@ -45,7 +47,6 @@ class Reducer(Controller):
         rabbitmq_host: str,
         producers_config: dict[str, Any],
     ) -> None:
-        self._current_producer_id = 0
         self._mom_producers: list[MessageMiddleware] = []
 
         next_controllers_amount = producers_config["next_controllers_amount"]
@@ -55,6 +56,11 @@ class Reducer(Controller):
             )
             self._mom_producers.append(mom_producer)
 
+        # [IMPORTANT] key-partitioned subclasses send by key instead
+        self._dispatcher = build_dispatcher(
+            self._mom_producers, producers_config.get("dispatching_config")
+        )
+
     def __init__(
         self,
         controller_id: int,
@@ -62,6 +68,8 @@ class Reducer(Controller):
         consumers_config: dict[str, Any],
         producers_config: dict[str, Any],
         batch_max_size: int,
+        max_keys_in_memory: int,
+        spill_dir: str,
     ) -> None:
         super().__init__(
             controller_id,
@@ -72,6 +80,11 @@ class Reducer(Controller):
 
         self._batch_max_size = batch_max_size
 
+        # [IMPORTANT] memory budget shared by all sessions, past it the biggest
+        # session's reduced data is spilled to disk (0 means no budget)
+        self._max_keys_in_memory = max_keys_in_memory
+        self._spill_dir = spill_dir
+
         self._reduced_data_by_session_id: dict[str, ReducedData] = {}
 
     # ============================== PRIVATE - SIGNAL HANDLER ============================== #
@@ -97,16 +110,37 @@ class Reducer(Controller):
     # ============================== PRIVATE - HANDLE DATA ============================== #
 
     @abstractmethod
-    def _reduce_function(
-        self, current_value: float, batch_item: dict[str, str]
-    ) -> float:
+    def _reduce_function(self) -> reduce_functions.ReduceFunction:
         raise NotImplementedError("subclass responsibility")
 
-    def _reduce_by_keys(self, session_id: str, batch_item: dict[str, str]) -> None:
-        self._reduced_data_by_session_id.setdefault(
-            session_id,
-            ReducedData(self._keys(), self._accumulator_name()),
-        ).reduce_using(batch_item, self._reduce_function)
+    def _reduced_data_of(self, session_id: str) -> ReducedData:
+        reduced_data = self._reduced_data_by_session_id.get(session_id)
+        if reduced_data is None:
+            reduced_data = ReducedData(
+                self._keys(), self._accumulator_name(), self._spill_dir
+            )
+            self._reduced_data_by_session_id[session_id] = reduced_data
+        return reduced_data
+
+    def _spill_when_memory_budget_exceeded(self) -> None:
+        if self._max_keys_in_memory <= 0:
+            return
+
+        resident_keys_amount = sum(
+            reduced_data.resident_keys_amount()
+            for reduced_data in self._reduced_data_by_session_id.values()
+        )
+        if resident_keys_amount <= self._max_keys_in_memory:
+            return
+
+        session_id, reduced_data = max(
+            self._reduced_data_by_session_id.items(),
+            key=lambda item: item[1].resident_keys_amount(),
+        )
+        reduced_data.spill()
+        logging.info(
+            f"action: spill_reduced_data | result: success | session_id: {session_id} | resident_keys: {resident_keys_amount}"
+        )
 
     def _pop_next_batch_item(self, session_id: str) -> dict[str, str]:
         return self._reduced_data_by_session_id[session_id].pop_next_batch_item()
@@ -134,12 +168,7 @@ class Reducer(Controller):
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
     def _mom_send_message_to_next(self, message: str) -> None:
-        mom_cleaned_data_producer = self._mom_producers[self._current_producer_id]
-        mom_cleaned_data_producer.send(message)
-
-        self._current_producer_id += 1
-        if self._current_producer_id >= len(self._mom_producers):
-            self._current_producer_id = 0
+        self._dispatcher.send(message)
 
     def _send_all_data_using_batchs(self, session_id: str) -> None:
         logging.debug(
@@ -158,16 +187,28 @@ class Reducer(Controller):
             )
             batch = self._take_next_batch(session_id)
 
-        del self._reduced_data_by_session_id[session_id]
+        reduced_data = self._reduced_data_by_session_id.pop(session_id, None)
+        if reduced_data is not None:
+            reduced_data.delete_spilled_runs()
         logging.info(
             f"action: all_data_sent | result: success | session_id: {session_id}"
         )
 
     def _handle_data_batch_message(self, message: str) -> None:
         session_id = communication_protocol.get_message_session_id(message)
-        batch = communication_protocol.decode_batch_message(message)
-        for batch_item in batch:
-            self._reduce_by_keys(session_id, batch_item)
+        batch = communication_protocol.decode_batch(message)
+        if batch.is_empty():
+            return
+
+        reduce_function = self._reduce_function()
+        if self._accumulator_name() in batch.columns():
+            # [IMPORTANT] the batch was already combined by the previous
+            # controller, its partial results are merged by adding them up
+            reduce_function = reduce_functions.sum_of(self._accumulator_name())
+
+        self._reduced_data_of(session_id).reduce_batch(batch, reduce_function)
+
+        self._spill_when_memory_budget_exceeded()
 
     def _clean_session_data_of(self, session_id: str) -> None:
         logging.info(
@@ -225,6 +266,9 @@ class Reducer(Controller):
         self._mom_consumer.start_consuming(self._handle_received_data)
 
     def _close_all(self) -> None:
+        for reduced_data in self._reduced_data_by_session_id.values():
+            reduced_data.delete_spilled_runs()
+
         for mom_producer in self._mom_producers:
             mom_producer.close()
             logging.debug("action: mom_producer_producer_close | result: success")
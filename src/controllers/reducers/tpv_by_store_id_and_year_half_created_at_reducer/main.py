@@ -15,7 +15,15 @@ def main():
             "PREV_CONTROLLERS_AMOUNT",
             "NEXT_CONTROLLERS_AMOUNT",
             "BATCH_MAX_SIZE",
-        ]
+            "PREFETCH_COUNT",
+            "ACK_EVERY_MESSAGES",
+            "ACK_EVERY_MS",
+            "DISPATCH_POLICY",
+            "DISPATCH_REFRESH_EVERY_MESSAGES",
+            "REDUCER_MAX_KEYS_IN_MEMORY",
+            "REDUCER_SPILL_DIR",
+        ],
+        default_values=constants.CONSUMING_CONFIG_DEFAULT_VALUES,
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
     logging.info(f"action: init_config | result: success | params: {config_params}")
@@ -23,10 +31,21 @@ def main():
     consumers_config = {
         "queue_name_prefix": constants.MAPPED_TRN_SEMESTER_QUEUE_PREFIX,
         "prev_controllers_amount": int(config_params["PREV_CONTROLLERS_AMOUNT"]),
+        "consuming_config": {
+            "prefetch_count": int(config_params["PREFETCH_COUNT"]),
+            "ack_every_messages": int(config_params["ACK_EVERY_MESSAGES"]),
+            "ack_every_seconds": int(config_params["ACK_EVERY_MS"]) / 1000,
+        },
     }
     producers_config = {
         "queue_name_prefix": constants.SUM_TRN_TPV_BY_STORE_QUEUE_PREFIX,
         "next_controllers_amount": int(config_params["NEXT_CONTROLLERS_AMOUNT"]),
+        "dispatching_config": {
+            "policy": config_params["DISPATCH_POLICY"],
+            "refresh_every_messages": int(
+                config_params["DISPATCH_REFRESH_EVERY_MESSAGES"]
+            ),
+        },
     }
 
     controller = TpvByStoreIdAndYearHalfCreatedAtReducer(
@@ -35,6 +54,8 @@ def main():
         consumers_config=consumers_config,
         producers_config=producers_config,
         batch_max_size=int(config_params["BATCH_MAX_SIZE"]),
+        max_keys_in_memory=int(config_params["REDUCER_MAX_KEYS_IN_MEMORY"]),
+        spill_dir=config_params["REDUCER_SPILL_DIR"],
     )
     controller.run()
 
@@ -1,6 +1,8 @@
 from typing import Any
 
 from controllers.reducers.shared.reducer import Reducer
+from controllers.shared import reduce_functions
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
 from shared import communication_protocol
@@ -17,7 +19,12 @@ class TpvByStoreIdAndYearHalfCreatedAtReducer(Reducer):
     ) -> MessageMiddleware:
         queue_name_prefix = consumers_config["queue_name_prefix"]
         queue_name = f"{queue_name_prefix}-{self._controller_id}"
-        return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
+        return RabbitMQMessageMiddlewareQueue(
+            host=rabbitmq_host,
+            queue_name=queue_name,
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+            **consumers_config["consuming_config"],
+        )
 
     def _build_mom_producer_using(
         self,
@@ -42,7 +49,5 @@ class TpvByStoreIdAndYearHalfCreatedAtReducer(Reducer):
 
     # ============================== PRIVATE - HANDLE DATA ============================== #
 
-    def _reduce_function(
-        self, current_value: float, batch_item: dict[str, str]
-    ) -> float:
-        return current_value + float(batch_item["final_amount"])
+    def _reduce_function(self) -> reduce_functions.ReduceFunction:
+        return reduce_functions.sum_final_amount
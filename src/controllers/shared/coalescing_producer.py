@@ -0,0 +1,227 @@
+import logging
+import time
+from typing import Any, Callable, Optional
+
+from middleware.middleware import MessageMiddleware
+from shared import communication_protocol
+
+
+class PendingBatch:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, encoded_columns: str, first_message_time: float) -> None:
+        self.encoded_columns = encoded_columns
+        self.first_message_time = first_message_time
+        self.messages: list[str] = []
+        self.rows_amount = 0
+        self.bytes_amount = 0
+
+    # ============================== PUBLIC ============================== #
+
+    def append(self, message: str, rows_amount: int) -> None:
+        self.messages.append(message)
+        self.rows_amount += rows_amount
+        self.bytes_amount += len(message)
+
+
+class CoalescingProducer(MessageMiddleware):
+
+    # [IMPORTANT] batches sent to one destination are gathered per session and
+    # message type and forwarded as a single batch once max_rows or max_bytes
+    # are reached (max_bytes = 0 means no bytes limit) or the oldest one waited
+    # max_seconds (checked on send and by the linger timer of the consumer this
+    # producer is bound to), so selective controllers do not forward a tiny
+    # message per received batch; the rows of a session are always forwarded
+    # before its EOF
+    # [IMPORTANT] the consumer flushes every pending batch before acking the
+    # received ones, so the ack window also bounds how many received batches
+    # are coalesced together
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        mom_producer: MessageMiddleware,
+        max_rows: int,
+        max_bytes: int,
+        max_seconds: float,
+    ) -> None:
+        self._mom_producer = mom_producer
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+        self._max_seconds = max_seconds
+
+        self._pending_batch_by_key: dict[tuple[str, str], PendingBatch] = {}
+
+        self._call_later: Optional[Callable] = None
+        self._linger_timer_pending = False
+
+        self._sent_batches_amount = 0
+        self._sent_rows_amount = 0
+        self._sent_fill_sum = 0.0
+
+    # ============================== PRIVATE - FLUSH ============================== #
+
+    def _fill_of(self, pending_batch: PendingBatch) -> float:
+        # how full the outgoing batch is, relative to the nearest target
+        fill = pending_batch.rows_amount / self._max_rows
+        if self._max_bytes > 0:
+            fill = max(fill, pending_batch.bytes_amount / self._max_bytes)
+        return min(fill, 1.0)
+
+    def _flush_pending_batch_of(self, key: tuple[str, str]) -> None:
+        pending_batch = self._pending_batch_by_key.pop(key, None)
+        if pending_batch is None:
+            return
+
+        message = communication_protocol.merge_batch_messages(pending_batch.messages)
+        self._mom_producer.send(message)
+
+        fill = self._fill_of(pending_batch)
+        self._sent_batches_amount += 1
+        self._sent_rows_amount += pending_batch.rows_amount
+        self._sent_fill_sum += fill
+        logging.debug(
+            f"action: coalesced_batch_send | result: success | session_id: {key[0]} | merged_messages: {len(pending_batch.messages)} | rows: {pending_batch.rows_amount} | fill: {fill:.2f}"
+        )
+
+    def _flush_pending_batches_where(
+        self, condition: Callable[[tuple[str, str], PendingBatch], bool]
+    ) -> None:
+        keys = [
+            key
+            for key, pending_batch in self._pending_batch_by_key.items()
+            if condition(key, pending_batch)
+        ]
+        for key in keys:
+            self._flush_pending_batch_of(key)
+
+    def _flush_lingering_batches(self, now: float) -> None:
+        self._flush_pending_batches_where(
+            lambda _, pending_batch: now - pending_batch.first_message_time
+            >= self._max_seconds
+        )
+
+    def _schedule_linger_timer(self, now: float) -> None:
+        if (
+            self._call_later is None
+            or self._linger_timer_pending
+            or len(self._pending_batch_by_key) == 0
+        ):
+            return
+
+        oldest_message_time = min(
+            pending_batch.first_message_time
+            for pending_batch in self._pending_batch_by_key.values()
+        )
+        self._linger_timer_pending = True
+        self._call_later(
+            max(oldest_message_time + self._max_seconds - now, 0.0),
+            self._on_linger_timer,
+        )
+
+    def _on_linger_timer(self) -> None:
+        self._linger_timer_pending = False
+        now = time.monotonic()
+        self._flush_lingering_batches(now)
+        self._schedule_linger_timer(now)
+
+    # ============================== PRIVATE - SEND ============================== #
+
+    def _send_eof(self, message: str) -> None:
+        session_id = communication_protocol.get_message_session_id(message)
+        self._flush_pending_batches_where(lambda key, _: key[0] == session_id)
+        self._mom_producer.send(message)
+
+    def _send_batch(self, message: str, now: float) -> None:
+        key = (
+            communication_protocol.get_message_session_id(message),
+            communication_protocol.get_message_type(message),
+        )
+        encoded_columns, rows_amount = communication_protocol.get_batch_shape(message)
+        if rows_amount == 0:
+            # not a v2 batch, forwarded as it is after the previous rows
+            self._flush_pending_batch_of(key)
+            self._mom_producer.send(message)
+            return
+
+        pending_batch = self._pending_batch_by_key.get(key)
+        if (
+            pending_batch is not None
+            and pending_batch.encoded_columns != encoded_columns
+        ):
+            self._flush_pending_batch_of(key)
+            pending_batch = None
+        if pending_batch is None:
+            pending_batch = PendingBatch(encoded_columns, now)
+            self._pending_batch_by_key[key] = pending_batch
+
+        pending_batch.append(message, rows_amount)
+        if self._fill_of(pending_batch) >= 1.0:
+            self._flush_pending_batch_of(key)
+
+    # ============================== PUBLIC - ACCESSING ============================== #
+
+    def sent_batches_amount(self) -> int:
+        return self._sent_batches_amount
+
+    def sent_rows_amount(self) -> int:
+        return self._sent_rows_amount
+
+    def average_fill(self) -> float:
+        if self._sent_batches_amount == 0:
+            return 0.0
+        return self._sent_fill_sum / self._sent_batches_amount
+
+    # ============================== PUBLIC ============================== #
+
+    def start_consuming(self, on_message_callback: Callable) -> None:
+        self._mom_producer.start_consuming(on_message_callback)
+
+    def stop_consuming(self) -> None:
+        self._mom_producer.stop_consuming()
+
+    def send(self, message: str) -> None:
+        now = time.monotonic()
+        if (
+            communication_protocol.get_message_type(message)
+            == communication_protocol.EOF
+        ):
+            self._send_eof(message)
+        else:
+            self._send_batch(message, now)
+        self._flush_lingering_batches(now)
+        self._schedule_linger_timer(now)
+
+    def schedule_flushes_using(self, call_later: Callable) -> None:
+        self._call_later = call_later
+        self._mom_producer.schedule_flushes_using(call_later)
+
+    def flush(self) -> None:
+        self._flush_pending_batches_where(lambda _key, _pending_batch: True)
+        self._mom_producer.flush()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._mom_producer.close()
+            logging.info(
+                f"action: coalescing_producer_close | result: success | sent_batches: {self._sent_batches_amount} | sent_rows: {self._sent_rows_amount} | average_fill: {self.average_fill():.2f}"
+            )
+
+    def delete(self) -> None:
+        self._mom_producer.delete()
+
+
+# ============================== BUILD ============================== #
+
+
+def coalescing(
+    mom_producer: MessageMiddleware, coalescing_config: dict[str, Any]
+) -> MessageMiddleware:
+    # coalescing is disabled with max_rows = 0
+    if coalescing_config["max_rows"] <= 0:
+        return mom_producer
+    return CoalescingProducer(mom_producer, **coalescing_config)
@@ -0,0 +1,34 @@
+from controllers.shared import group_by
+from controllers.shared.reduce_functions import ReduceFunction
+from shared.batch import Batch
+
+
+class Combiner:
+    def __init__(
+        self,
+        keys: list[str],
+        reduce_function_by_accumulator_name: dict[str, ReduceFunction],
+    ):
+        self._keys = keys
+        self._accumulator_names = list(reduce_function_by_accumulator_name)
+        self._reduce_functions = list(reduce_function_by_accumulator_name.values())
+
+    def combine(self, batch: Batch) -> Batch:
+        # items with empty keys are skipped, the reducers skip them anyway
+        groups = group_by.group_by_keys([batch.column(k) for k in self._keys])
+        accumulated_values_by_accumulator_name = [
+            reduce_function(batch, groups) for reduce_function in self._reduce_functions
+        ]
+
+        combined_batch_items: list[dict[str, str]] = []
+        for key, *accumulated_values in zip(
+            groups.keys, *accumulated_values_by_accumulator_name
+        ):
+            combined_batch_item = dict(zip(self._keys, key))
+            for accumulator_name, value in zip(
+                self._accumulator_names, accumulated_values
+            ):
+                combined_batch_item[accumulator_name] = str(value)
+            combined_batch_items.append(combined_batch_item)
+
+        return Batch.from_rows(combined_batch_items)
@@ -0,0 +1,77 @@
+from typing import Optional
+
+import numpy as np
+
+
+class Groups:
+
+    # [IMPORTANT] the rows with an empty key are skipped: keys and group codes
+    # only cover the kept rows, and kept_rows (None when every row is kept)
+    # selects them from any other column of the batch
+
+    def __init__(
+        self,
+        keys: list[tuple],
+        group_codes: np.ndarray,
+        kept_rows: Optional[np.ndarray],
+        skipped_rows_amount: int,
+    ) -> None:
+        self.keys = keys
+        self.group_codes = group_codes
+        self.kept_rows = kept_rows
+        self.skipped_rows_amount = skipped_rows_amount
+
+
+# ============================== GROUP BY ============================== #
+
+
+def group_by_keys(key_columns: list[list[str]]) -> Groups:
+    rows_amount = len(key_columns[0]) if key_columns else 0
+    if rows_amount == 0:
+        return Groups([], np.zeros(0, dtype=np.int64), None, 0)
+
+    key_arrays = [np.asarray(key_column) for key_column in key_columns]
+
+    non_empty_keys = np.ones(rows_amount, dtype=bool)
+    for key_array in key_arrays:
+        non_empty_keys &= key_array != ""
+    skipped_rows_amount = rows_amount - int(np.count_nonzero(non_empty_keys))
+    if skipped_rows_amount == rows_amount:
+        return Groups([], np.zeros(0, dtype=np.int64), None, skipped_rows_amount)
+    kept_rows = None
+    if skipped_rows_amount > 0:
+        kept_rows = non_empty_keys
+        key_arrays = [key_array[kept_rows] for key_array in key_arrays]
+
+    # [IMPORTANT] the codes of every key column are folded into one group code,
+    # renumbered on each step so it never exceeds the amount of rows
+    group_codes = np.zeros(len(key_arrays[0]), dtype=np.int64)
+    first_rows = np.zeros(0, dtype=np.int64)
+    for key_array in key_arrays:
+        key_uniques, key_codes = np.unique(key_array, return_inverse=True)
+        _, first_rows, group_codes = np.unique(
+            group_codes * len(key_uniques) + key_codes,
+            return_index=True,
+            return_inverse=True,
+        )
+
+    keys = list(zip(*(key_array[first_rows].tolist() for key_array in key_arrays)))
+    return Groups(keys, group_codes, kept_rows, skipped_rows_amount)
+
+
+def sum_by_groups(groups: Groups, value_column: Optional[list[str]]) -> list:
+    # without a value column the rows of each group are counted (as integers)
+    if value_column is None:
+        return np.bincount(groups.group_codes, minlength=len(groups.keys)).tolist()
+    if len(groups.keys) == 0:
+        return []
+
+    value_array = np.asarray(value_column)
+    if groups.kept_rows is not None:
+        value_array = value_array[groups.kept_rows]
+    # [IMPORTANT] values are converted only after skipping the rows with an
+    # empty key, whose value may be empty (or invalid) too
+    values = value_array.astype(np.float64)
+    return np.bincount(
+        groups.group_codes, weights=values, minlength=len(groups.keys)
+    ).tolist()
@@ -0,0 +1,230 @@
+import bisect
+import logging
+import zlib
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from middleware.middleware import MessageMiddleware
+from shared import communication_protocol
+
+# strategies names
+MODULO = "modulo"
+CONSISTENT_HASH = "consistent_hash"
+HOT_KEY_SPLIT = "hot_key_split"
+
+VIRTUAL_NODES_PER_SHARD = 64
+SKEW_LOG_EVERY_ROWS = 100_000
+
+# ============================== PRIVATE - HASHING ============================== #
+
+
+def _string_hash(value: str) -> int:
+    # unlike hash(), it is the same in every process
+    hash_value = 0
+    prime_multiplier = 31
+    for char in value:
+        hash_value = (hash_value * prime_multiplier) + ord(char)
+    return hash_value
+
+
+def _normalized_integer_key(key: str) -> str:
+    # [IMPORTANT] ids may come as floats ("3.0"), they are rewritten as
+    # integers so every producer hashes (and the next controllers group) them
+    # the same way
+    if key.isdigit():
+        return key
+    return str(int(float(key)))
+
+
+# ============================== STRATEGIES ============================== #
+
+
+class PartitionStrategy(ABC):
+
+    # ============================== PUBLIC ============================== #
+
+    @abstractmethod
+    def shard_of(self, key: str, row: dict[str, str]) -> int:
+        raise NotImplementedError("subclass responsibility")
+
+
+class ModuloStrategy(PartitionStrategy):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, shards_amount: int) -> None:
+        self._shards_amount = shards_amount
+
+    # ============================== PUBLIC ============================== #
+
+    def shard_of(self, key: str, row: dict[str, str]) -> int:
+        if key.isdigit():
+            return int(key) % self._shards_amount
+        return _string_hash(key) % self._shards_amount
+
+
+class ConsistentHashStrategy(PartitionStrategy):
+
+    # [IMPORTANT] every shard owns many points of a hash ring and a key goes to
+    # the next point clockwise, so adding or removing a shard only moves the
+    # keys of its own points instead of almost all of them
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self, shards_amount: int, virtual_nodes: int = VIRTUAL_NODES_PER_SHARD
+    ) -> None:
+        ring = sorted(
+            (zlib.crc32(f"shard-{shard}-{virtual_node}".encode()), shard)
+            for shard in range(shards_amount)
+            for virtual_node in range(virtual_nodes)
+        )
+        self._ring_hashes = [point_hash for point_hash, _ in ring]
+        self._ring_shards = [shard for _, shard in ring]
+
+    # ============================== PUBLIC ============================== #
+
+    def shard_of(self, key: str, row: dict[str, str]) -> int:
+        point = bisect.bisect(self._ring_hashes, zlib.crc32(key.encode()))
+        return self._ring_shards[point % len(self._ring_shards)]
+
+
+class HotKeySplittingStrategy(PartitionStrategy):
+
+    # [IMPORTANT] the rows of a hot key are spread over split_amount shards by
+    # the value of split_column, so each shard only holds a partial result of
+    # the key; the results are merged back by grouping by the key and the
+    # split column, which the next controllers already do when split_column
+    # is part of their grouping key (e.g. the year half of the TPV reducers)
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        strategy: PartitionStrategy,
+        shards_amount: int,
+        split_column: str,
+        split_amount: int,
+        hot_keys: Optional[set[str]] = None,
+    ) -> None:
+        self._strategy = strategy
+        self._shards_amount = shards_amount
+        self._split_column = split_column
+        self._split_amount = min(split_amount, shards_amount)
+        # every key is split when no hot keys are given
+        self._hot_keys = hot_keys
+
+    # ============================== PUBLIC ============================== #
+
+    def shard_of(self, key: str, row: dict[str, str]) -> int:
+        shard = self._strategy.shard_of(key, row)
+        if self._hot_keys is not None and key not in self._hot_keys:
+            return shard
+
+        split_offset = _string_hash(row[self._split_column]) % self._split_amount
+        return (shard + split_offset) % self._shards_amount
+
+
+def build_strategy(
+    name: str, shards_amount: int, split_column: Optional[str] = None
+) -> PartitionStrategy:
+    if name == MODULO:
+        return ModuloStrategy(shards_amount)
+    if name == CONSISTENT_HASH:
+        return ConsistentHashStrategy(shards_amount)
+    if name == HOT_KEY_SPLIT and split_column is not None:
+        return HotKeySplittingStrategy(
+            ModuloStrategy(shards_amount), shards_amount, split_column, shards_amount
+        )
+    raise ValueError(f"Unknown partition strategy: {name}")
+
+
+# ============================== PARTITIONER ============================== #
+
+
+class Partitioner:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        key_column: str,
+        strategy: PartitionStrategy,
+        shards_amount: int,
+        skip_empty_keys: bool = False,
+        normalize_integer_keys: bool = True,
+    ) -> None:
+        self._key_column = key_column
+        self._strategy = strategy
+        self._skip_empty_keys = skip_empty_keys
+        self._normalize_integer_keys = normalize_integer_keys
+
+        self._rows_amount_by_shard = [0] * shards_amount
+        self._rows_amount_at_last_skew_log = 0
+
+    # ============================== PRIVATE - SKEW ============================== #
+
+    def _log_skew_every_some_rows(self) -> None:
+        rows_amount = sum(self._rows_amount_by_shard)
+        if rows_amount - self._rows_amount_at_last_skew_log < SKEW_LOG_EVERY_ROWS:
+            return
+        self._rows_amount_at_last_skew_log = rows_amount
+
+        logging.info(
+            f"action: partition_skew | result: success | key: {self._key_column} | rows_by_shard: {self._rows_amount_by_shard} | skew: {self.skew():.2f}"
+        )
+
+    # ============================== PUBLIC - ACCESSING ============================== #
+
+    def rows_amount_by_shard(self) -> list[int]:
+        return list(self._rows_amount_by_shard)
+
+    def skew(self) -> float:
+        # rows of the busiest shard over the mean, 1.0 when perfectly balanced
+        rows_amount = sum(self._rows_amount_by_shard)
+        if rows_amount == 0:
+            return 1.0
+        mean_rows_amount = rows_amount / len(self._rows_amount_by_shard)
+        return max(self._rows_amount_by_shard) / mean_rows_amount
+
+    # ============================== PUBLIC ============================== #
+
+    def partition(self, rows: list[dict[str, str]]) -> dict[int, list[dict[str, str]]]:
+        rows_by_shard: dict[int, list[dict[str, str]]] = {}
+        for row in rows:
+            key = row[self._key_column]
+            if key == "":
+                if self._skip_empty_keys:
+                    logging.warning(
+                        f"action: invalid_{self._key_column} | {self._key_column}: {key} | result: skipped"
+                    )
+                    continue
+                # [IMPORTANT] empty keys can not be hashed, they all go
+                # to the first shard
+                shard = 0
+            else:
+                if self._normalize_integer_keys:
+                    key = _normalized_integer_key(key)
+                    row[self._key_column] = key
+                shard = self._strategy.shard_of(key, row)
+
+            rows_by_shard.setdefault(shard, [])
+            rows_by_shard[shard].append(row)
+
+        for shard, shard_rows in rows_by_shard.items():
+            self._rows_amount_by_shard[shard] += len(shard_rows)
+        self._log_skew_every_some_rows()
+
+        return rows_by_shard
+
+    def send_partitioned(
+        self, message: str, mom_producers: list[MessageMiddleware]
+    ) -> None:
+        message_type = communication_protocol.get_message_type(message)
+        session_id = communication_protocol.get_message_session_id(message)
+        rows = communication_protocol.decode_batch_message(message)
+        for shard, shard_rows in self.partition(rows).items():
+            shard_message = communication_protocol.encode_batch_message(
+                message_type, session_id, shard_rows
+            )
+            mom_producers[shard].send(shard_message)
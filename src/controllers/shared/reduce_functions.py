@@ -0,0 +1,35 @@
+from typing import Callable
+
+from controllers.shared import group_by
+from shared.batch import Batch
+
+# [IMPORTANT] reduce functions add up the rows of a batch already grouped by
+# key, one result per group; they are used both by the combiners that
+# pre-aggregate the input of the reducers upstream and by the reducers, and
+# must stay additive: partial results are merged by the reducers adding them
+# up by key
+ReduceFunction = Callable[[Batch, group_by.Groups], list]
+
+
+def count(batch: Batch, groups: group_by.Groups) -> list:
+    return group_by.sum_by_groups(groups, None)
+
+
+def sum_final_amount(batch: Batch, groups: group_by.Groups) -> list:
+    return group_by.sum_by_groups(groups, batch.column("final_amount"))
+
+
+def sum_quantity(batch: Batch, groups: group_by.Groups) -> list:
+    return group_by.sum_by_groups(groups, batch.column("quantity"))
+
+
+def sum_subtotal(batch: Batch, groups: group_by.Groups) -> list:
+    return group_by.sum_by_groups(groups, batch.column("subtotal"))
+
+
+def sum_of(column_name: str) -> ReduceFunction:
+    # adds up an accumulator column, e.g. the partial results of a combiner
+    def sum_column(batch: Batch, groups: group_by.Groups) -> list:
+        return group_by.sum_by_groups(groups, batch.column(column_name))
+
+    return sum_column
@@ -16,7 +16,11 @@ def main():
             "NEXT_CONTROLLERS_AMOUNT",
             "BATCH_MAX_SIZE",
             "AMOUNT_PER_GROUP",
-        ]
+            "PREFETCH_COUNT",
+            "ACK_EVERY_MESSAGES",
+            "ACK_EVERY_MS",
+        ],
+        default_values=constants.CONSUMING_CONFIG_DEFAULT_VALUES,
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
     logging.info(f"action: init_config | result: success | params: {config_params}")
@@ -24,6 +28,11 @@ def main():
     consumers_config = {
         "queue_name_prefix": constants.PURCHASES_QTY_BY_USR_ID__STORE_ID_QUEUE_PREFIX,
         "prev_controllers_amount": int(config_params["PREV_CONTROLLERS_AMOUNT"]),
+        "consuming_config": {
+            "prefetch_count": int(config_params["PREFETCH_COUNT"]),
+            "ack_every_messages": int(config_params["ACK_EVERY_MESSAGES"]),
+            "ack_every_seconds": int(config_params["ACK_EVERY_MS"]) / 1000,
+        },
     }
     producers_config = {
         "queue_name_prefix": constants.SORTED_DESC_BY_STORE_ID__PURCHASES_QTY_WITH_USER_ID,
@@ -1,6 +1,7 @@
 from typing import Any
 
 from controllers.sorters.shared.sorter import Sorter
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
 from shared import communication_protocol
@@ -17,7 +18,12 @@ class DescByYearMonthCreatedAtAndProfitSumSorter(Sorter):
     ) -> MessageMiddleware:
         queue_name_prefix = consumers_config["queue_name_prefix"]
         queue_name = f"{queue_name_prefix}-{self._controller_id}"
-        return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
+        return RabbitMQMessageMiddlewareQueue(
+            host=rabbitmq_host,
+            queue_name=queue_name,
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+            **consumers_config["consuming_config"],
+        )
 
     def _build_mom_producer_using(
         self,
@@ -34,10 +40,7 @@ class DescByYearMonthCreatedAtAndProfitSumSorter(Sorter):
     def _grouping_key(self) -> str:
         return "year_month_created_at"
 
-    def _primary_sort_key(self) -> str:
-        return "year_month_created_at"
-
-    def _secondary_sort_key(self) -> str:
+    def _sort_key(self) -> str:
         return "profit_sum"
 
     def _message_type(self) -> str:
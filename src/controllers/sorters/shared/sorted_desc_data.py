@@ -1,53 +1,82 @@
+import heapq
+import logging
+
+# (sort value, -arrival number, batch item): among equal sort values the item
+# that arrived first is the greater one, so it is kept and sent first; the
+# first two fields are unique, so batch items are never compared
+SortedDescEntry = tuple[float, int, dict[str, str]]
+
+
 class SortedDescData:
 
     def __init__(
         self,
         grouping_key: str,
-        primary_sort_key: str,
-        secondary_sort_key: str,
+        sort_key: str,
         amount_per_group: int,
     ):
         self._grouping_key = grouping_key
-
-        self._primary_sort_key = primary_sort_key
-        self._secondary_sort_key = secondary_sort_key
+        self._sort_key = sort_key
 
         self._amount_per_group = amount_per_group
 
-        self._sorted_desc_by_grouping_key: dict[str, list[dict[str, str]]] = {}
+        # [IMPORTANT] each group keeps a min-heap bounded to amount_per_group, so
+        # the smallest kept item is evicted in O(log K) when a greater one arrives
+        self._min_heap_by_grouping_key: dict[str, list[SortedDescEntry]] = {}
+        self._received_items_amount = 0
 
-    def add_batch_item_keeping_sort_desc(self, batch_item: dict[str, str]) -> None:
-        grouping_key_value = batch_item[self._grouping_key]
-        primary_sort_value = batch_item[self._primary_sort_key]
-        secondary_sort_value = batch_item[self._secondary_sort_key]
+        self._sorted_asc_by_grouping_key: dict[str, list[SortedDescEntry]] = {}
 
-        sorted_desc_batch_items = self._sorted_desc_by_grouping_key.setdefault(
-            grouping_key_value, []
-        )
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _sort_value_of(self, batch_item: dict[str, str]) -> float:
+        return float(batch_item[self._sort_key])
 
-        index = 0
-        while index < len(sorted_desc_batch_items):
-            current_batch_item = sorted_desc_batch_items[index]
-            current_primary_sort_value = current_batch_item[self._primary_sort_key]
-            current_secondary_sort_value = current_batch_item[self._secondary_sort_key]
+    # ============================== PRIVATE - HANDLE DATA ============================== #
 
-            if primary_sort_value > current_primary_sort_value:
-                break
-            if primary_sort_value == current_primary_sort_value:
-                if secondary_sort_value > current_secondary_sort_value:
-                    break
-            index += 1
+    def _add_entry(self, grouping_key_value: str, entry: SortedDescEntry) -> None:
+        min_heap = self._min_heap_by_grouping_key.setdefault(grouping_key_value, [])
+        if len(min_heap) < self._amount_per_group:
+            heapq.heappush(min_heap, entry)
+        elif entry > min_heap[0]:
+            heapq.heapreplace(min_heap, entry)
 
-        sorted_desc_batch_items.insert(index, batch_item)
-        if len(sorted_desc_batch_items) > self._amount_per_group:
-            sorted_desc_batch_items.pop()
+    def _sort_all_groups(self) -> None:
+        # entries are ascending so the greatest one is popped from the end
+        for grouping_key_value, min_heap in self._min_heap_by_grouping_key.items():
+            min_heap.sort()
+            self._sorted_asc_by_grouping_key[grouping_key_value] = min_heap
+        self._min_heap_by_grouping_key = {}
+
+    # ============================== PUBLIC ============================== #
+
+    def add_batch_item_keeping_sort_desc(self, batch_item: dict[str, str]) -> None:
+        try:
+            sort_value = self._sort_value_of(batch_item)
+        except ValueError:
+            logging.warning(
+                f"action: invalid_{self._sort_key} | {self._sort_key}: {batch_item[self._sort_key]} | result: skipped"
+            )
+            return
+
+        self._received_items_amount += 1
+        self._add_entry(
+            batch_item[self._grouping_key],
+            (sort_value, -self._received_items_amount, batch_item),
+        )
 
     def pop_next_batch_item(self) -> dict[str, str]:
-        key = next(iter(self._sorted_desc_by_grouping_key))
-        batch_item = self._sorted_desc_by_grouping_key[key].pop(0)
-        if not self._sorted_desc_by_grouping_key[key]:
-            del self._sorted_desc_by_grouping_key[key]
+        if len(self._min_heap_by_grouping_key) > 0:
+            self._sort_all_groups()
+
+        key = next(iter(self._sorted_asc_by_grouping_key))
+        _, _, batch_item = self._sorted_asc_by_grouping_key[key].pop()
+        if not self._sorted_asc_by_grouping_key[key]:
+            del self._sorted_asc_by_grouping_key[key]
         return batch_item
 
     def is_empty(self) -> bool:
-        return len(self._sorted_desc_by_grouping_key.keys()) == 0
+        return (
+            len(self._min_heap_by_grouping_key) == 0
+            and len(self._sorted_asc_by_grouping_key) == 0
+        )
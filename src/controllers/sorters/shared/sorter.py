@@ -88,11 +88,7 @@ class Sorter(Controller):
         raise NotImplementedError("subclass responsibility")
 
     @abstractmethod
-    def _primary_sort_key(self) -> str:
-        raise NotImplementedError("subclass responsibility")
-
-    @abstractmethod
-    def _secondary_sort_key(self) -> str:
+    def _sort_key(self) -> str:
         raise NotImplementedError("subclass responsibility")
 
     @abstractmethod
@@ -108,8 +104,7 @@ class Sorter(Controller):
             session_id,
             SortedDescData(
                 self._grouping_key(),
-                self._primary_sort_key(),
-                self._secondary_sort_key(),
+                self._sort_key(),
                 self._amount_per_group,
             ),
         ).add_batch_item_keeping_sort_desc(batch_item)
@@ -0,0 +1,129 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Sequence
+
+from middleware.middleware import MessageMiddleware
+
+# policies names
+ROUND_ROBIN = "round_robin"
+LEAST_LOADED = "least_loaded"
+
+
+class Dispatcher(ABC):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, mom_producers: Sequence[MessageMiddleware]) -> None:
+        self._mom_producers = mom_producers
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    @abstractmethod
+    def _next_producer_id(self) -> int:
+        raise NotImplementedError("subclass responsibility")
+
+    # ============================== PUBLIC ============================== #
+
+    def send(self, message: str) -> None:
+        self._mom_producers[self._next_producer_id()].send(message)
+
+
+class RoundRobinDispatcher(Dispatcher):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, mom_producers: Sequence[MessageMiddleware]) -> None:
+        super().__init__(mom_producers)
+        self._current_producer_id = 0
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _next_producer_id(self) -> int:
+        producer_id = self._current_producer_id
+
+        self._current_producer_id += 1
+        if self._current_producer_id >= len(self._mom_producers):
+            self._current_producer_id = 0
+        return producer_id
+
+
+class LeastLoadedDispatcher(Dispatcher):
+
+    # [IMPORTANT] the depth of every destination queue is asked to the broker
+    # every refresh_every_messages sends and, in between, each message sent is
+    # added to the depth of its queue, so a burst does not pile up on the
+    # queue that was the shortest at the last refresh; ties are broken in
+    # round robin order, so unknown depths (always 0) mean plain round robin
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self, mom_producers: Sequence[MessageMiddleware], refresh_every_messages: int
+    ) -> None:
+        super().__init__(mom_producers)
+        self._refresh_every_messages = refresh_every_messages
+
+        self._estimated_depths = [0] * len(mom_producers)
+        # the depths are refreshed before the first send
+        self._sent_messages_since_refresh = refresh_every_messages
+        self._first_tie_break_producer_id = 0
+
+    # ============================== PRIVATE - DEPTHS ============================== #
+
+    def _refresh_depths_every_some_messages(self) -> None:
+        if self._sent_messages_since_refresh < self._refresh_every_messages:
+            return
+        self._sent_messages_since_refresh = 0
+
+        self._estimated_depths = [
+            mom_producer.pending_messages_amount()
+            for mom_producer in self._mom_producers
+        ]
+        logging.debug(
+            f"action: refresh_queue_depths | result: success | depths: {self._estimated_depths}"
+        )
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _next_producer_id(self) -> int:
+        self._refresh_depths_every_some_messages()
+
+        producers_amount = len(self._mom_producers)
+        producer_ids = [
+            (self._first_tie_break_producer_id + offset) % producers_amount
+            for offset in range(producers_amount)
+        ]
+        producer_id = min(
+            producer_ids, key=lambda producer_id: self._estimated_depths[producer_id]
+        )
+
+        self._estimated_depths[producer_id] += 1
+        self._sent_messages_since_refresh += 1
+        self._first_tie_break_producer_id = (producer_id + 1) % producers_amount
+        return producer_id
+
+    # ============================== PUBLIC - ACCESSING ============================== #
+
+    def estimated_depths(self) -> list[int]:
+        return list(self._estimated_depths)
+
+
+# ============================== BUILD ============================== #
+
+
+def build_dispatcher(
+    mom_producers: Sequence[MessageMiddleware],
+    dispatching_config: Optional[dict[str, Any]] = None,
+) -> Dispatcher:
+    # round robin when no dispatching config is given
+    if dispatching_config is None:
+        return RoundRobinDispatcher(mom_producers)
+
+    policy = dispatching_config["policy"]
+    if policy == ROUND_ROBIN:
+        return RoundRobinDispatcher(mom_producers)
+    if policy == LEAST_LOADED:
+        return LeastLoadedDispatcher(
+            mom_producers, dispatching_config["refresh_every_messages"]
+        )
+    raise ValueError(f"Unknown dispatching policy: {policy}")
@@ -43,7 +43,42 @@ class MessageMiddleware(ABC):
     def send(self, message: str) -> None:
         pass
 
-    # Se desconecta de la cola o exchange al que estaba conectado.
+    # Envía varios mensajes a la cola o al tópico con el que se inicializó el exchange,
+    # respetando el orden recibido.
+    # Si se pierde la conexión con el middleware eleva MessageMiddlewareDisconnectedError.
+    # Si ocurre un error interno que no puede resolverse eleva MessageMiddlewareMessageError.
+    def send_many(self, messages: List[str]) -> None:
+        for message in messages:
+            self.send(message)
+
+    # Envía los mensajes que hayan quedado pendientes en el buffer de envío.
+    # Si no hay mensajes pendientes, no tiene efecto, ni levanta.
+    # Si se pierde la conexión con el middleware eleva MessageMiddlewareDisconnectedError.
+    # Si ocurre un error interno que no puede resolverse eleva MessageMiddlewareMessageError.
+    def flush(self) -> None:
+        pass
+
+    # Programa el envío por tiempo de los mensajes pendientes en el buffer de envío
+    # con call_later(segundos, callback), que invoca callback en el hilo que envía.
+    # Sin call_later, el tiempo máximo en el buffer solo se controla al enviar.
+    def schedule_flushes_using(self, call_later: Callable) -> None:
+        pass
+
+    # Asocia los productores que envían lo producido a partir de los mensajes
+    # consumidos: sus buffers de envío se vacían antes de confirmar (ack) los
+    # mensajes consumidos, y sus envíos por tiempo corren en el hilo que consume.
+    def bind_producers(self, mom_producers: List["MessageMiddleware"]) -> None:
+        pass
+
+    # Devuelve la cantidad de mensajes que esperan ser consumidos en la cola
+    # (incluyendo los pendientes en el buffer de envío), o 0 si no se conoce.
+    # Si se pierde la conexión con el middleware eleva MessageMiddlewareDisconnectedError.
+    # Si ocurre un error interno que no puede resolverse eleva MessageMiddlewareMessageError.
+    def pending_messages_amount(self) -> int:
+        return 0
+
+    # Se desconecta de la cola o exchange al que estaba conectado,
+    # enviando antes los mensajes pendientes en el buffer de envío.
     # Si ocurre un error interno que no puede resolverse eleva MessageMiddlewareCloseError.
     @abstractmethod
     def close(self) -> None:
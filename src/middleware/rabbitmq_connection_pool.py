@@ -0,0 +1,91 @@
+import os
+import threading
+from typing import Optional
+
+import pika
+
+# [IMPORTANT] pika connections are not thread-safe and must not be used across
+# a fork, so a connection is only shared by the middlewares created in the same
+# process and thread; each middleware still opens its own channel on it
+
+# [IMPORTANT] consumers and publishers never share a connection: the broker
+# blocks publishing connections under a memory or disk alarm, and a consumer
+# on a blocked connection could not ack the messages that would clear it
+CONSUMER_CONNECTION_ROLE = "consumer"
+PUBLISHER_CONNECTION_ROLE = "publisher"
+
+_connections: dict[tuple, pika.BlockingConnection] = {}
+_references_amount: dict[tuple, int] = {}
+_lock = threading.Lock()
+
+# ============================= PRIVATE - ACCESSING ============================== #
+
+
+def _connection_key_for(
+    parameters: pika.ConnectionParameters, connection_role: str
+) -> tuple:
+    return (
+        os.getpid(),
+        threading.get_ident(),
+        connection_role,
+        parameters.host,
+        parameters.port,
+    )
+
+
+def _connection_key_of(connection: pika.BlockingConnection) -> Optional[tuple]:
+    for connection_key, pooled_connection in _connections.items():
+        if pooled_connection is connection:
+            return connection_key
+    return None
+
+
+# ============================= CONNECTIONS ============================== #
+
+
+def acquire_connection(
+    parameters: pika.ConnectionParameters,
+    connection_role: str = PUBLISHER_CONNECTION_ROLE,
+) -> pika.BlockingConnection:
+    connection_key = _connection_key_for(parameters, connection_role)
+    with _lock:
+        connection = _connections.get(connection_key)
+        if connection is None or not connection.is_open:
+            connection = pika.BlockingConnection(parameters)
+            _connections[connection_key] = connection
+            _references_amount[connection_key] = 0
+
+        _references_amount[connection_key] += 1
+        return connection
+
+
+def release_connection(connection: pika.BlockingConnection) -> None:
+    with _lock:
+        connection_key = _connection_key_of(connection)
+        if connection_key is not None:
+            _references_amount[connection_key] -= 1
+            if _references_amount[connection_key] > 0:
+                return
+            del _connections[connection_key]
+            del _references_amount[connection_key]
+
+    # the last middleware using the connection closes it
+    if connection.is_open:
+        connection.close()
+
+
+def open_connections_amount() -> int:
+    with _lock:
+        return len(_connections)
+
+
+def reset() -> None:
+    # closes every pooled connection, whoever still references them
+    with _lock:
+        connections = list(_connections.values())
+        _connections.clear()
+        _references_amount.clear()
+
+    for connection in connections:
+        if connection.is_open:
+            connection.close()
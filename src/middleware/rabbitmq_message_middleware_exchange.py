@@ -1,9 +1,9 @@
-import logging
 from typing import Callable, List
 
 import pika
 from pika.exceptions import AMQPConnectionError
 
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import (
     MessageMiddlewareCloseError,
     MessageMiddlewareDeleteError,
@@ -11,9 +11,15 @@ from middleware.middleware import (
     MessageMiddlewareExchange,
     MessageMiddlewareMessageError,
 )
+from middleware.rabbitmq_message_middleware_mixins import (
+    RabbitMQConsumingAcksMixin,
+    RabbitMQPublishingBufferMixin,
+)
 
 
-class RabbitMQMessageMiddlewareExchange(MessageMiddlewareExchange):
+class RabbitMQMessageMiddlewareExchange(
+    RabbitMQConsumingAcksMixin, RabbitMQPublishingBufferMixin, MessageMiddlewareExchange
+):
 
     # ============================== PRIVATE - RABBIT INFO ============================== #
 
@@ -28,15 +34,31 @@ class RabbitMQMessageMiddlewareExchange(MessageMiddlewareExchange):
 
     # ============================== PRIVATE - INITIALIZATION ============================== #
 
-    def __init__(self, host: str, exchange_name: str, route_keys: List):
+    def __init__(
+        self,
+        host: str,
+        exchange_name: str,
+        route_keys: List,
+        buffer_max_messages: int = 1,
+        buffer_max_seconds: float = 0.0,
+        confirms: bool = False,
+        prefetch_count: int = 0,
+        ack_every_messages: int = 1,
+        ack_every_seconds: float = 0.0,
+        connection_role: str = rabbitmq_connection_pool.PUBLISHER_CONNECTION_ROLE,
+    ):
         super().__init__(host, exchange_name, route_keys)
 
         self._queue_name = ""
         self._exchange_name = exchange_name
         self._routing_keys = route_keys
 
+        self._init_publishing_buffer(buffer_max_messages, buffer_max_seconds, confirms)
+        self._init_consuming_acks(prefetch_count, ack_every_messages, ack_every_seconds)
+
+        self._connection_released = False
         try:
-            self._connection = pika.BlockingConnection(
+            self._connection = rabbitmq_connection_pool.acquire_connection(
                 pika.ConnectionParameters(
                     host=host,
                     port=self._rabbitmq_port(),
@@ -44,38 +66,29 @@ class RabbitMQMessageMiddlewareExchange(MessageMiddlewareExchange):
                         self._rabbitmq_user(), self._rabbitmq_password()
                     ),
                     heartbeat=3600,
-                )
+                ),
+                connection_role,
             )
             self._channel = self._connection.channel()
+            self._channel.basic_qos(prefetch_count=self._prefetch_count)
             self._channel.exchange_declare(
                 exchange=self._exchange_name,
                 exchange_type="topic",  # type: ignore
             )
+            if self._confirms:
+                self._channel.tx_select()
         except Exception as e:
             raise MessageMiddlewareDisconnectedError(
                 f"Error connecting to RabbitMQ server: {e}"
             )
 
-    # ============================== PRIVATE - ACCESSING ============================== #
-
-    def _pika_on_message_callback_wrapping(
-        self, on_message_callback: Callable
-    ) -> Callable:
-        def pika_on_message_callback(
-            channel: pika.adapters.blocking_connection.BlockingChannel,
-            method: pika.spec.Basic.Deliver,
-            properties: pika.spec.BasicProperties,
-            body: bytes,
-        ) -> None:
-            try:
-                on_message_callback(body)
-                channel.basic_ack(delivery_tag=method.delivery_tag, multiple=False)  # type: ignore
-            except Exception as e:
-                channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)  # type: ignore
-                logging.error(f"action: receive_message | result: fail | error: {e}")
-                raise e
-
-        return pika_on_message_callback
+    def _release_connection(self) -> None:
+        # [IMPORTANT] the connection may be shared with other middlewares of this
+        # thread and role, so it is only closed once every one of them released it
+        if self._connection_released:
+            return
+        self._connection_released = True
+        rabbitmq_connection_pool.release_connection(self._connection)
 
     # ============================== PRIVATE - ASSERTIONS ============================== #
 
@@ -122,9 +135,10 @@ class RabbitMQMessageMiddlewareExchange(MessageMiddlewareExchange):
         self._channel.start_consuming()
 
     def _stop_consuming(self) -> None:
+        self._ack_pending_messages()
         self._channel.stop_consuming()
 
-    def _send(self, message: str) -> None:
+    def _publish(self, message: str) -> None:
         for routing_key in self._routing_keys:
             self._channel.basic_publish(
                 exchange=self._exchange_name,
@@ -158,15 +172,37 @@ class RabbitMQMessageMiddlewareExchange(MessageMiddlewareExchange):
             exc_prefix="Error sending message:",
         )
 
+    def send_many(self, messages: list[str]) -> None:
+        self._assert_connection_is_open()
+        self._handle_amqp_errors_during(
+            self._send_many,
+            args=(messages,),
+            exc_prefix="Error sending messages:",
+        )
+
+    def flush(self) -> None:
+        if len(self._buffered_messages) == 0:
+            return
+        self._assert_connection_is_open()
+        self._handle_amqp_errors_during(
+            self._flush,
+            exc_prefix="Error flushing messages:",
+        )
+
     def close(self) -> None:
         try:
+            if self._connection.is_open and self._channel.is_open:
+                self._ack_pending_messages()
+                self._flush()
             self._channel.close()
-            self._connection.close()
+            self._release_connection()
         except Exception as e:
             raise MessageMiddlewareCloseError(f"Error closing connection: {e}")
 
     def delete(self) -> None:
         try:
+            if self._connection.is_open and self._channel.is_open:
+                self._ack_pending_messages()
             self._channel.exchange_delete(exchange=self._exchange_name, if_unused=False)
         except Exception as e:
             raise MessageMiddlewareDeleteError(f"Error deleting queue: {e}")
@@ -180,3 +216,12 @@ class RabbitMQMessageMiddlewareExchange(MessageMiddlewareExchange):
             args=(self.stop_consuming,),
             exc_prefix="Error scheduling stop consuming:",
         )
+
+    def schedule_callback(self, callback: Callable) -> None:
+        # callback runs in the thread consuming from this middleware
+        self._assert_connection_is_open()
+        self._handle_amqp_errors_during(
+            self._connection.add_callback_threadsafe,
+            args=(callback,),
+            exc_prefix="Error scheduling callback:",
+        )
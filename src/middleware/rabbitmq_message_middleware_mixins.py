@@ -0,0 +1,185 @@
+import logging
+import time
+from typing import Callable, Optional
+
+import pika
+
+from middleware.middleware import MessageMiddleware
+
+
+class RabbitMQPublishingBufferMixin:
+
+    _channel: pika.adapters.blocking_connection.BlockingChannel
+
+    # ============================== PRIVATE - INITIALIZATION ============================== #
+
+    def _init_publishing_buffer(
+        self, buffer_max_messages: int, buffer_max_seconds: float, confirms: bool
+    ) -> None:
+        # the buffer is flushed when it reaches buffer_max_messages or when
+        # its oldest message is older than buffer_max_seconds
+        # [IMPORTANT] the publisher connection never processes events, so the
+        # time limit is enforced by a timer of the consumer this producer is
+        # bound to (see schedule_flushes_using); an unbound producer only
+        # checks it on send
+        self._buffer_max_messages = buffer_max_messages
+        self._buffer_max_seconds = buffer_max_seconds
+        # [IMPORTANT] confirms are implemented with a channel transaction committed
+        # once per flushed window, so acks sent on this channel are committed too
+        self._confirms = confirms
+
+        self._buffered_messages: list[str] = []
+        self._oldest_buffered_message_time = 0.0
+
+        self._call_later: Optional[Callable] = None
+        self._flush_timer_pending = False
+
+    # ============================== PRIVATE - SUPPORT ============================== #
+
+    def _publish(self, message: str) -> None:
+        raise NotImplementedError("subclass responsibility")
+
+    def _should_flush(self) -> bool:
+        if len(self._buffered_messages) >= self._buffer_max_messages:
+            return True
+        buffered_seconds = time.monotonic() - self._oldest_buffered_message_time
+        return buffered_seconds >= self._buffer_max_seconds
+
+    def _flush(self) -> None:
+        if len(self._buffered_messages) == 0:
+            return
+
+        buffered_messages = self._buffered_messages
+        self._buffered_messages = []
+        for message in buffered_messages:
+            self._publish(message)
+        if self._confirms:
+            self._channel.tx_commit()
+
+    def _schedule_flush_timer(self, seconds: float) -> None:
+        if self._call_later is None or self._flush_timer_pending:
+            return
+        self._flush_timer_pending = True
+        self._call_later(seconds, self._on_flush_timer)
+
+    def _on_flush_timer(self) -> None:
+        self._flush_timer_pending = False
+        if len(self._buffered_messages) == 0 or not self._channel.is_open:
+            return
+
+        # the buffer may have been flushed and refilled since the timer was set
+        buffered_seconds = time.monotonic() - self._oldest_buffered_message_time
+        if buffered_seconds >= self._buffer_max_seconds:
+            self._flush()
+        else:
+            self._schedule_flush_timer(self._buffer_max_seconds - buffered_seconds)
+
+    def _send_many(self, messages: list[str]) -> None:
+        if len(self._buffered_messages) == 0:
+            self._oldest_buffered_message_time = time.monotonic()
+        self._buffered_messages.extend(messages)
+
+        if self._should_flush():
+            self._flush()
+        elif len(self._buffered_messages) > 0:
+            self._schedule_flush_timer(self._buffer_max_seconds)
+
+    def _send(self, message: str) -> None:
+        self._send_many([message])
+
+    # ============================== PUBLIC - INTERFACE ============================== #
+
+    def schedule_flushes_using(self, call_later: Callable) -> None:
+        self._call_later = call_later
+
+
+class RabbitMQConsumingAcksMixin:
+
+    _connection: pika.BlockingConnection
+    _channel: pika.adapters.blocking_connection.BlockingChannel
+
+    # ============================== PRIVATE - INITIALIZATION ============================== #
+
+    def _init_consuming_acks(
+        self, prefetch_count: int, ack_every_messages: int, ack_every_seconds: float
+    ) -> None:
+        # processed messages are acked together (multiple=True) every
+        # ack_every_messages or ack_every_seconds after the first unacked one
+        self._prefetch_count = prefetch_count
+        self._ack_every_messages = ack_every_messages
+        if prefetch_count > 0:
+            # [IMPORTANT] the broker stops delivering once prefetch_count
+            # messages are unacked, so the ack window must fit in it
+            self._ack_every_messages = min(ack_every_messages, prefetch_count)
+        self._ack_every_seconds = ack_every_seconds
+
+        self._unacked_messages_amount = 0
+        self._last_unacked_delivery_tag = 0
+        self._ack_timer_id: Optional[object] = None
+
+        # [IMPORTANT] the producers sending what is produced from the consumed
+        # messages are flushed before acking them, so an acked message never
+        # has outputs still buffered (lost if this process crashes)
+        self._bound_producers: list[MessageMiddleware] = []
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _pika_on_message_callback_wrapping(
+        self, on_message_callback: Callable
+    ) -> Callable:
+        def pika_on_message_callback(
+            channel: pika.adapters.blocking_connection.BlockingChannel,
+            method: pika.spec.Basic.Deliver,
+            properties: pika.spec.BasicProperties,
+            body: bytes,
+        ) -> None:
+            try:
+                on_message_callback(body)
+            except Exception as e:
+                # only the messages processed before the failing one are acked
+                self._ack_pending_messages()
+                channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)  # type: ignore
+                logging.error(f"action: receive_message | result: fail | error: {e}")
+                raise e
+            self._register_processed_message(method.delivery_tag)  # type: ignore
+
+        return pika_on_message_callback
+
+    # ============================== PRIVATE - ACKS ============================== #
+
+    def _ack_pending_messages(self) -> None:
+        if self._ack_timer_id is not None:
+            self._connection.remove_timeout(self._ack_timer_id)
+            self._ack_timer_id = None
+
+        if self._unacked_messages_amount == 0:
+            return
+
+        for mom_producer in self._bound_producers:
+            mom_producer.flush()
+        self._channel.basic_ack(
+            delivery_tag=self._last_unacked_delivery_tag, multiple=True
+        )
+        self._unacked_messages_amount = 0
+
+    def _on_ack_timer(self) -> None:
+        self._ack_timer_id = None
+        self._ack_pending_messages()
+
+    def _register_processed_message(self, delivery_tag: int) -> None:
+        self._last_unacked_delivery_tag = delivery_tag
+        self._unacked_messages_amount += 1
+
+        if self._unacked_messages_amount >= self._ack_every_messages:
+            self._ack_pending_messages()
+        elif self._ack_timer_id is None:
+            self._ack_timer_id = self._connection.call_later(
+                self._ack_every_seconds, self._on_ack_timer
+            )
+
+    # ============================== PUBLIC - INTERFACE ============================== #
+
+    def bind_producers(self, mom_producers: list[MessageMiddleware]) -> None:
+        self._bound_producers = list(mom_producers)
+        for mom_producer in self._bound_producers:
+            mom_producer.schedule_flushes_using(self._connection.call_later)
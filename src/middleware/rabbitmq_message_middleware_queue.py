@@ -1,9 +1,9 @@
-import logging
 from typing import Callable
 
 import pika
 from pika.exceptions import AMQPConnectionError
 
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import (
     MessageMiddlewareCloseError,
     MessageMiddlewareDeleteError,
@@ -11,9 +11,15 @@ from middleware.middleware import (
     MessageMiddlewareMessageError,
     MessageMiddlewareQueue,
 )
+from middleware.rabbitmq_message_middleware_mixins import (
+    RabbitMQConsumingAcksMixin,
+    RabbitMQPublishingBufferMixin,
+)
 
 
-class RabbitMQMessageMiddlewareQueue(MessageMiddlewareQueue):
+class RabbitMQMessageMiddlewareQueue(
+    RabbitMQConsumingAcksMixin, RabbitMQPublishingBufferMixin, MessageMiddlewareQueue
+):
 
     # ============================== PRIVATE - RABBIT INFO ============================== #
 
@@ -28,14 +34,29 @@ class RabbitMQMessageMiddlewareQueue(MessageMiddlewareQueue):
 
     # ============================== PRIVATE - INITIALIZATION ============================== #
 
-    def __init__(self, host, queue_name):
+    def __init__(
+        self,
+        host,
+        queue_name,
+        buffer_max_messages: int = 1,
+        buffer_max_seconds: float = 0.0,
+        confirms: bool = False,
+        prefetch_count: int = 1,
+        ack_every_messages: int = 1,
+        ack_every_seconds: float = 0.0,
+        connection_role: str = rabbitmq_connection_pool.PUBLISHER_CONNECTION_ROLE,
+    ):
         super().__init__(host, queue_name)
 
         self._queue_name = queue_name
         self._exchange_name = ""
 
+        self._init_publishing_buffer(buffer_max_messages, buffer_max_seconds, confirms)
+        self._init_consuming_acks(prefetch_count, ack_every_messages, ack_every_seconds)
+
+        self._connection_released = False
         try:
-            self._connection = pika.BlockingConnection(
+            self._connection = rabbitmq_connection_pool.acquire_connection(
                 pika.ConnectionParameters(
                     host=host,
                     port=self._rabbitmq_port(),
@@ -43,36 +64,26 @@ class RabbitMQMessageMiddlewareQueue(MessageMiddlewareQueue):
                         self._rabbitmq_user(), self._rabbitmq_password()
                     ),
                     heartbeat=3600,
-                )
+                ),
+                connection_role,
             )
             self._channel = self._connection.channel()
-            self._channel.basic_qos(prefetch_count=1)
+            self._channel.basic_qos(prefetch_count=self._prefetch_count)
             self._channel.queue_declare(queue=queue_name)
+            if self._confirms:
+                self._channel.tx_select()
         except Exception as e:
             raise MessageMiddlewareDisconnectedError(
                 f"Error connecting to RabbitMQ server: {e}"
             )
 
-    # ============================== PRIVATE - ACCESSING ============================== #
-
-    def _pika_on_message_callback_wrapping(
-        self, on_message_callback: Callable
-    ) -> Callable:
-        def pika_on_message_callback(
-            channel: pika.adapters.blocking_connection.BlockingChannel,
-            method: pika.spec.Basic.Deliver,
-            properties: pika.spec.BasicProperties,
-            body: bytes,
-        ) -> None:
-            try:
-                on_message_callback(body)
-                channel.basic_ack(delivery_tag=method.delivery_tag, multiple=False)  # type: ignore
-            except Exception as e:
-                channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)  # type: ignore
-                logging.error(f"action: receive_message | result: fail | error: {e}")
-                raise e
-
-        return pika_on_message_callback
+    def _release_connection(self) -> None:
+        # [IMPORTANT] the connection may be shared with other middlewares of this
+        # thread and role, so it is only closed once every one of them released it
+        if self._connection_released:
+            return
+        self._connection_released = True
+        rabbitmq_connection_pool.release_connection(self._connection)
 
     # ============================== PRIVATE - ASSERTIONS ============================== #
 
@@ -105,9 +116,10 @@ class RabbitMQMessageMiddlewareQueue(MessageMiddlewareQueue):
         self._channel.start_consuming()
 
     def _stop_consuming(self) -> None:
+        self._ack_pending_messages()
         self._channel.stop_consuming()
 
-    def _send(self, message: str) -> None:
+    def _publish(self, message: str) -> None:
         self._channel.basic_publish(
             exchange=self._exchange_name,
             routing_key=self._queue_name,
@@ -115,6 +127,15 @@ class RabbitMQMessageMiddlewareQueue(MessageMiddlewareQueue):
             properties=pika.BasicProperties(delivery_mode=pika.DeliveryMode.Transient),  # type: ignore
         )
 
+    def _pending_messages_amount(self) -> int:
+        # [IMPORTANT] a passive declare only reads the queue, the messages
+        # already delivered to its consumers (up to prefetch_count) are not
+        # counted by the broker
+        declare_ok = self._channel.queue_declare(queue=self._queue_name, passive=True)
+        # an unknown depth is taken as an empty queue
+        message_count = declare_ok.method.message_count or 0
+        return message_count + len(self._buffered_messages)
+
     # ============================== PUBLIC - INTERFACE ============================== #
 
     def start_consuming(self, on_message_callback: Callable) -> None:
@@ -140,15 +161,46 @@ class RabbitMQMessageMiddlewareQueue(MessageMiddlewareQueue):
             exc_prefix="Error sending message:",
         )
 
+    def send_many(self, messages: list[str]) -> None:
+        self._assert_connection_is_open()
+        self._handle_amqp_errors_during(
+            self._send_many,
+            args=(messages,),
+            exc_prefix="Error sending messages:",
+        )
+
+    def flush(self) -> None:
+        if len(self._buffered_messages) == 0:
+            return
+        self._assert_connection_is_open()
+        self._handle_amqp_errors_during(
+            self._flush,
+            exc_prefix="Error flushing messages:",
+        )
+
+    def pending_messages_amount(self) -> int:
+        self._assert_connection_is_open()
+        try:
+            return self._pending_messages_amount()
+        except AMQPConnectionError as e:
+            raise MessageMiddlewareDisconnectedError(f"Error reading queue depth: {e}")
+        except Exception as e:
+            raise MessageMiddlewareMessageError(f"Error reading queue depth: {e}")
+
     def close(self) -> None:
         try:
+            if self._connection.is_open and self._channel.is_open:
+                self._ack_pending_messages()
+                self._flush()
             self._channel.close()
-            self._connection.close()
+            self._release_connection()
         except Exception as e:
             raise MessageMiddlewareCloseError(f"Error closing connection: {e}")
 
     def delete(self) -> None:
         try:
+            if self._connection.is_open and self._channel.is_open:
+                self._ack_pending_messages()
             self._channel.queue_delete(
                 queue=self._queue_name, if_unused=False, if_empty=False
             )
@@ -164,3 +216,12 @@ class RabbitMQMessageMiddlewareQueue(MessageMiddlewareQueue):
             args=(self.stop_consuming,),
             exc_prefix="Error scheduling stop consuming:",
         )
+
+    def schedule_callback(self, callback: Callable) -> None:
+        # callback runs in the thread consuming from this middleware
+        self._assert_connection_is_open()
+        self._handle_amqp_errors_during(
+            self._connection.add_callback_threadsafe,
+            args=(callback,),
+            exc_prefix="Error scheduling callback:",
+        )
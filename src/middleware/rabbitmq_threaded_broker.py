@@ -0,0 +1,189 @@
+import logging
+import threading
+from typing import Callable, Optional
+
+import pika
+
+from middleware.middleware import MessageMiddlewareDisconnectedError
+
+OnDoneCallback = Callable[[Optional[Exception]], None]
+OnMessageCallback = Callable[[bytes, int], None]
+
+
+class RabbitMQThreadedBroker:
+
+    # [IMPORTANT] pika connections are not thread-safe, so the connection and its
+    # only channel live in the broker thread; any other thread just schedules
+    # work on it (add_callback_threadsafe) and is notified through callbacks,
+    # which are always called from the broker thread
+
+    # ============================== PRIVATE - RABBIT INFO ============================== #
+
+    def _rabbitmq_port(self) -> int:
+        return 5672
+
+    def _rabbitmq_user(self) -> str:
+        return "guest"
+
+    def _rabbitmq_password(self) -> str:
+        return "guest"
+
+    # ============================== PRIVATE - INITIALIZATION ============================== #
+
+    def __init__(self, host: str, prefetch_count: int = 32) -> None:
+        self._host = host
+        self._prefetch_count = prefetch_count
+
+        self._connection: Optional[pika.BlockingConnection] = None
+        self._connected = threading.Event()
+        self._connection_error: Optional[Exception] = None
+        self._running = False
+
+        self._declared_queue_names: set[str] = set()
+        self._consumer_tag_by_queue_name: dict[str, str] = {}
+
+        self._thread = threading.Thread(
+            target=self._run, name="rabbitmq_threaded_broker", daemon=True
+        )
+
+    def _connect(self) -> pika.BlockingConnection:
+        connection = pika.BlockingConnection(
+            pika.ConnectionParameters(
+                host=self._host,
+                port=self._rabbitmq_port(),
+                credentials=pika.PlainCredentials(
+                    self._rabbitmq_user(), self._rabbitmq_password()
+                ),
+                heartbeat=3600,
+            )
+        )
+        self._channel = connection.channel()
+        # the prefetch count applies to each consumer (one per session)
+        self._channel.basic_qos(prefetch_count=self._prefetch_count)
+        self._connection = connection
+        return connection
+
+    # ============================== PRIVATE - BROKER THREAD ============================== #
+
+    def _run(self) -> None:
+        try:
+            connection = self._connect()
+        except Exception as e:
+            self._connection_error = e
+            self._connected.set()
+            return
+
+        self._running = True
+        self._connected.set()
+        try:
+            while self._running:
+                connection.process_data_events(time_limit=1)
+        finally:
+            if connection.is_open:
+                connection.close()
+            logging.debug("action: rabbitmq_threaded_broker_close | result: success")
+
+    def _stop(self) -> None:
+        self._running = False
+
+    def _declare_queue(self, queue_name: str) -> None:
+        if queue_name in self._declared_queue_names:
+            return
+        self._channel.queue_declare(queue=queue_name)
+        self._declared_queue_names.add(queue_name)
+
+    def _publish(
+        self, queue_name: str, message: str, on_published: OnDoneCallback
+    ) -> None:
+        try:
+            self._declare_queue(queue_name)
+            self._channel.basic_publish(
+                exchange="",
+                routing_key=queue_name,
+                body=message,
+                properties=pika.BasicProperties(delivery_mode=pika.DeliveryMode.Transient),  # type: ignore
+            )
+        except Exception as e:
+            on_published(e)
+            return
+        on_published(None)
+
+    def _consume(
+        self,
+        queue_name: str,
+        on_message: OnMessageCallback,
+        on_consuming: OnDoneCallback,
+    ) -> None:
+        def pika_on_message_callback(
+            channel: pika.adapters.blocking_connection.BlockingChannel,
+            method: pika.spec.Basic.Deliver,
+            properties: pika.spec.BasicProperties,
+            body: bytes,
+        ) -> None:
+            on_message(body, method.delivery_tag)  # type: ignore
+
+        try:
+            self._declare_queue(queue_name)
+            self._consumer_tag_by_queue_name[queue_name] = self._channel.basic_consume(
+                queue_name, pika_on_message_callback, auto_ack=False
+            )
+        except Exception as e:
+            on_consuming(e)
+            return
+        on_consuming(None)
+
+    def _delete(self, queue_name: str) -> None:
+        self._declared_queue_names.discard(queue_name)
+        try:
+            consumer_tag = self._consumer_tag_by_queue_name.pop(queue_name, None)
+            if consumer_tag is not None:
+                self._channel.basic_cancel(consumer_tag)
+            self._channel.queue_delete(
+                queue=queue_name, if_unused=False, if_empty=False
+            )
+        except Exception as e:
+            logging.error(
+                f"action: delete_queue | result: fail | queue: {queue_name} | error: {e}"
+            )
+
+    def _schedule(self, callback: Callable) -> None:
+        if self._connection is None or not self._running:
+            raise MessageMiddlewareDisconnectedError(
+                "Error: RabbitMQ threaded broker is not running."
+            )
+        self._connection.add_callback_threadsafe(callback)
+
+    # ============================== PUBLIC ============================== #
+
+    def start(self) -> None:
+        self._thread.start()
+        self._connected.wait()
+        if self._connection_error is not None:
+            raise MessageMiddlewareDisconnectedError(
+                f"Error connecting to RabbitMQ server: {self._connection_error}"
+            )
+
+    def publish(
+        self, queue_name: str, message: str, on_published: OnDoneCallback
+    ) -> None:
+        self._schedule(lambda: self._publish(queue_name, message, on_published))
+
+    def consume(
+        self,
+        queue_name: str,
+        on_message: OnMessageCallback,
+        on_consuming: OnDoneCallback,
+    ) -> None:
+        self._schedule(lambda: self._consume(queue_name, on_message, on_consuming))
+
+    def ack(self, delivery_tag: int) -> None:
+        self._schedule(lambda: self._channel.basic_ack(delivery_tag=delivery_tag))
+
+    def delete(self, queue_name: str) -> None:
+        self._schedule(lambda: self._delete(queue_name))
+
+    def stop(self) -> None:
+        if self._running:
+            self._schedule(self._stop)
+        if self._thread.is_alive():
+            self._thread.join()
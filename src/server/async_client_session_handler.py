@@ -0,0 +1,269 @@
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Optional
+
+from middleware.rabbitmq_threaded_broker import RabbitMQThreadedBroker
+from server.client_session import ClientSession
+from shared import communication_protocol, constants, framed_socket
+
+
+class AsyncClientSessionHandler:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        broker: RabbitMQThreadedBroker,
+        cleaners_data: dict,
+        output_builders_data: dict,
+        session_key: bytes,
+        max_publishes_in_flight: int,
+    ) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._session = ClientSession(session_key, output_builders_data)
+
+        # [IMPORTANT] the broker (and its connection) is shared by every session
+        # of this process, sessions only keep their own routing state
+        self._broker = broker
+        self._loop = asyncio.get_running_loop()
+
+        self._cleaners_data = cleaners_data
+        self._current_worker_id_by_data_type = {
+            data_type: 0 for data_type in self._cleaners_data.keys()
+        }
+        self._output_builders_data = output_builders_data
+
+        self._max_publishes_in_flight = max_publishes_in_flight
+        self._publishes_in_flight = asyncio.Semaphore(max_publishes_in_flight)
+        self._publish_error: Optional[Exception] = None
+
+        self._query_results_queue_name: Optional[str] = None
+        self._query_results: asyncio.Queue[tuple[bytes, int]] = asyncio.Queue()
+
+    # ============================== PRIVATE - LOGGING ============================== #
+
+    def _log_debug(self, text: str) -> None:
+        logging.debug(
+            f"{text} | pid: {os.getpid()} | session_id: {self._session.session_id()}"
+        )
+
+    def _log_info(self, text: str) -> None:
+        logging.info(
+            f"{text} | pid: {os.getpid()} | session_id: {self._session.session_id()}"
+        )
+
+    def _log_error(self, text: str) -> None:
+        logging.error(
+            f"{text} | pid: {os.getpid()} | session_id: {self._session.session_id()}"
+        )
+
+    # ============================== PRIVATE - SOCKET SEND/RECEIVE MESSAGES ============================== #
+
+    async def _socket_send_message(self, message: str) -> None:
+        await framed_socket.write_framed_message(self._writer, message)
+        self._log_debug(
+            f"action: send_message | result: success | msg_size: {len(message)}"
+        )
+
+    async def _socket_receive_message(self) -> str:
+        message = await framed_socket.read_framed_message(self._reader, "client")
+        self._log_debug(
+            f"action: receive_message | result: success | msg_size: {len(message)}"
+        )
+        return message
+
+    # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
+
+    def _call_in_loop(self, callback: Callable, *args: Any) -> None:
+        # broker callbacks run in the broker thread, which may outlive the loop
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    def _on_published(self, error: Optional[Exception]) -> None:
+        self._call_in_loop(self._release_publish, error)
+
+    def _release_publish(self, error: Optional[Exception]) -> None:
+        if error is not None and self._publish_error is None:
+            self._publish_error = error
+        self._publishes_in_flight.release()
+
+    def _raise_publish_error_if_any(self) -> None:
+        if self._publish_error is not None:
+            raise self._publish_error
+
+    async def _mom_send_message_to(self, queue_name: str, message: str) -> None:
+        self._raise_publish_error_if_any()
+        await self._publishes_in_flight.acquire()
+        self._broker.publish(queue_name, message, self._on_published)
+
+    async def _mom_wait_all_messages_sent(self) -> None:
+        for _ in range(self._max_publishes_in_flight):
+            await self._publishes_in_flight.acquire()
+        for _ in range(self._max_publishes_in_flight):
+            self._publishes_in_flight.release()
+        self._raise_publish_error_if_any()
+
+    async def _mom_send_message_to_next(self, data_type: str, message: str) -> None:
+        cleaner_data = self._cleaners_data[data_type]
+        current_worker_id = self._current_worker_id_by_data_type[data_type]
+
+        queue_name = f"{cleaner_data[constants.QUEUE_PREFIX]}-{current_worker_id}"
+        await self._mom_send_message_to(queue_name, message)
+
+        current_worker_id += 1
+        if current_worker_id == cleaner_data[constants.WORKERS_AMOUNT]:
+            current_worker_id = 0
+        self._current_worker_id_by_data_type[data_type] = current_worker_id
+
+    def _on_query_result_message(self, message_as_bytes: bytes, tag: int) -> None:
+        self._call_in_loop(self._query_results.put_nowait, (message_as_bytes, tag))
+
+    async def _mom_start_consuming_query_results(self) -> None:
+        queue_name = self._session.query_results_queue_name()
+
+        consuming: asyncio.Future = self._loop.create_future()
+
+        def on_consuming(error: Optional[Exception]) -> None:
+            self._call_in_loop(consuming.set_result, error)
+
+        self._broker.consume(queue_name, self._on_query_result_message, on_consuming)
+        error = await consuming
+        if error is not None:
+            raise error
+        self._query_results_queue_name = queue_name
+
+    # ============================== PRIVATE - RECEIVE CLIENT HANDSHAKE ============================== #
+
+    async def _send_client_handshake_message(self) -> None:
+        handshake_response_message = self._session.handshake_response_message()
+        await self._socket_send_message(handshake_response_message)
+        self._log_info(
+            f"action: handshake_response_sent | result: success | client_id: {self._session.client_id()}"
+        )
+
+    async def _accept_client_handshake_message(self) -> str:
+        received_message = await self._socket_receive_message()
+        payload = self._session.accept_handshake_message(received_message)
+        self._log_info(
+            f"action: handshake_received | result: success | client_id: {self._session.client_id()} | payload: {payload}"
+        )
+        if payload in (
+            communication_protocol.ALL_QUERIES,
+            communication_protocol.ALL_QUERIES_OVER_DATA_STREAMS,
+        ):
+            await self._mom_start_consuming_query_results()
+
+        await self._send_client_handshake_message()
+        return payload
+
+    # ============================== PRIVATE - RECEIVE CLIENT DATA ============================== #
+
+    async def _handle_data_batch_eof_message(
+        self, data_type: str, message: str
+    ) -> None:
+        self._log_info(f"action: {data_type}_eof_received | result: success")
+
+        cleaner_data = self._cleaners_data[data_type]
+        for id in range(cleaner_data[constants.WORKERS_AMOUNT]):
+            queue_name = f"{cleaner_data[constants.QUEUE_PREFIX]}-{id}"
+            await self._mom_send_message_to(queue_name, message)
+
+    async def _handle_client_message(self, message: str) -> None:
+        data_type, is_eof = self._session.accept_client_message(message)
+        if is_eof:
+            await self._handle_data_batch_eof_message(data_type, message)
+        else:
+            await self._mom_send_message_to_next(data_type, message)
+
+    async def _receive_all_data_from_client(self) -> None:
+        while not self._session.all_data_received():
+            received_message = await self._socket_receive_message()
+            await self._handle_client_message(received_message)
+
+        await self._mom_wait_all_messages_sent()
+        self._log_info(f"action: all_data_received | result: success")
+
+    # ============================== PRIVATE - RECEIVE RESULTS ============================== #
+
+    async def _handle_output_builder_message(self, message: str) -> None:
+        message_type, must_be_sent = self._session.accept_output_builder_message(
+            message
+        )
+        if must_be_sent:
+            await self._socket_send_message(message)
+        if message_type == communication_protocol.EOF and must_be_sent:
+            data_type = communication_protocol.decode_eof_message(message)
+            self._log_info(
+                f"action: eof_{data_type}_results_to_client_sent | result: success"
+            )
+
+    async def _receive_all_query_results_from_output_builders(self) -> None:
+        while not self._session.all_query_results_received():
+            message_as_bytes, delivery_tag = await self._query_results.get()
+            await self._handle_output_builder_message(message_as_bytes.decode("utf-8"))
+            # acked once forwarded, so a slow client holds back its own results
+            self._broker.ack(delivery_tag)
+
+        self._log_info(f"action: all_results_received | result: success")
+
+    # ============================== PRIVATE - HANDLE CLIENT CONNECTION ============================== #
+
+    async def _handle_client_connection(self) -> None:
+        handshake_payload = await self._accept_client_handshake_message()
+        match handshake_payload:
+            case communication_protocol.ALL_QUERIES:
+                # results are forwarded while the data is still being received,
+                # if any of them fails the other one is cancelled
+                try:
+                    async with asyncio.TaskGroup() as task_group:
+                        task_group.create_task(self._receive_all_data_from_client())
+                        task_group.create_task(
+                            self._receive_all_query_results_from_output_builders()
+                        )
+                except ExceptionGroup as e:
+                    raise e.exceptions[0]
+            case communication_protocol.ALL_QUERIES_OVER_DATA_STREAMS:
+                await self._receive_all_query_results_from_output_builders()
+            case _:
+                await self._receive_all_data_from_client()
+
+    async def _close_all(self) -> None:
+        if self._query_results_queue_name is not None:
+            try:
+                self._broker.delete(self._query_results_queue_name)
+                self._log_debug(
+                    f"action: mom_query_results_queue_delete | result: success"
+                )
+            except Exception as e:
+                self._log_error(
+                    f"action: mom_query_results_queue_delete | result: fail | error: {e}"
+                )
+
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except OSError:
+            pass
+        self._log_debug(f"action: client_socket_close | result: success")
+
+    # ============================== PUBLIC ============================== #
+
+    async def run(self) -> None:
+        self._log_info(f"action: client_session_handler_startup | result: success")
+
+        try:
+            await self._handle_client_connection()
+        except Exception as e:
+            self._log_error(
+                f"action: client_session_handler_run | result: fail | error: {e}"
+            )
+            raise e
+        finally:
+            await self._close_all()
+            self._log_info(f"action: all_mom_connections_close | result: success")
+
+        self._log_info(f"action: client_session_handler_shutdown | result: success")
@@ -0,0 +1,115 @@
+import asyncio
+import multiprocessing
+import signal
+import time
+
+from middleware.rabbitmq_threaded_broker import RabbitMQThreadedBroker
+from server.async_client_session_handler import AsyncClientSessionHandler
+from server.server import Server
+
+
+class AsyncServer(Server):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        port: int,
+        listen_backlog: int,
+        rabbitmq_host: str,
+        cleaners_data: dict,
+        output_builders_data: dict,
+        workers_amount: int,
+        max_publishes_in_flight: int = 64,
+    ) -> None:
+        super().__init__(
+            port, listen_backlog, rabbitmq_host, cleaners_data, output_builders_data
+        )
+
+        # [IMPORTANT] a fixed pool of worker processes accepts on the same
+        # listening socket, each one multiplexing all of its sessions in one
+        # event loop over a single RabbitMQ connection
+        self._workers_amount = workers_amount
+        self._max_publishes_in_flight = max_publishes_in_flight
+
+    # ============================== PRIVATE - WORKER PROCESS ============================== #
+
+    async def _handle_client_connection_async(
+        self,
+        broker: RabbitMQThreadedBroker,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        try:
+            await AsyncClientSessionHandler(
+                reader,
+                writer,
+                broker,
+                self._cleaners_data,
+                self._output_builders_data,
+                self._session_key,
+                self._max_publishes_in_flight,
+            ).run()
+        except Exception as e:
+            # the other sessions of this worker keep running
+            self._log_error(
+                f"action: client_session_handler | result: fail | error: {e}"
+            )
+
+    async def _serve(self, broker: RabbitMQThreadedBroker) -> None:
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        loop.add_signal_handler(signal.SIGTERM, stopped.set)
+
+        session_tasks: set[asyncio.Task] = set()
+
+        def on_client_connected(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            session_task = loop.create_task(
+                self._handle_client_connection_async(broker, reader, writer)
+            )
+            session_tasks.add(session_task)
+            session_task.add_done_callback(session_tasks.discard)
+
+        async_server = await asyncio.start_server(
+            on_client_connected, sock=self._server_socket
+        )
+        self._log_info("action: async_worker_serving | result: success")
+
+        await stopped.wait()
+
+        async_server.close()
+        for session_task in session_tasks:
+            session_task.cancel()
+        await asyncio.gather(*session_tasks, return_exceptions=True)
+        await async_server.wait_closed()
+        self._log_info("action: async_worker_sessions_close | result: success")
+
+    def _run_worker(self) -> None:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+        broker = RabbitMQThreadedBroker(self._rabbitmq_host)
+        broker.start()
+        try:
+            asyncio.run(self._serve(broker))
+        finally:
+            broker.stop()
+
+    # ============================== PRIVATE - RUN ============================== #
+
+    def _spawn_worker_process(self) -> None:
+        process = multiprocessing.Process(target=self._run_worker)
+        process.start()
+        self._spawned_processes.append(process)
+        self._log_info(f"action: spawn_async_worker_process | result: success")
+
+    def _run(self) -> None:
+        self._set_server_as_running()
+
+        for _ in range(self._workers_amount):
+            self._spawn_worker_process()
+
+        # the workers accept the connections, this process only supervises them
+        while self._is_running():
+            time.sleep(1)
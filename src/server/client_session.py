@@ -0,0 +1,171 @@
+from server import session_ids
+from shared import communication_protocol, constants
+
+
+class ClientSession:
+
+    # [IMPORTANT] the protocol state of a client connection, without any I/O:
+    # both session handlers (processes and asyncio) feed it the messages they
+    # receive and do the sending and publishing it tells them to do
+
+    # ============================== INITIALIZE ============================== #
+
+    def _init_client_data_batch_stats(self) -> None:
+        self._client_eof_received = {
+            communication_protocol.MENU_ITEMS_BATCH_MSG_TYPE: False,
+            communication_protocol.STORES_BATCH_MSG_TYPE: False,
+            communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE: False,
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE: False,
+            communication_protocol.USERS_BATCH_MSG_TYPE: False,
+        }
+
+    def _init_output_builders_data_stats(self) -> None:
+        self._output_builders_eof_received = {
+            constants.QUERY_RESULT_1X: 0,
+            constants.QUERY_RESULT_21: 0,
+            constants.QUERY_RESULT_22: 0,
+            constants.QUERY_RESULT_3X: 0,
+            constants.QUERY_RESULT_4X: 0,
+        }
+
+    def __init__(self, session_key: bytes, output_builders_data: dict) -> None:
+        self._session_key = session_key
+        self._session_id = session_ids.new_session_id(session_key)
+        self._client_id = ""
+
+        self._output_builders_data = output_builders_data
+
+        self._init_client_data_batch_stats()
+        self._init_output_builders_data_stats()
+
+    # ============================== ACCESSING ============================== #
+
+    def session_id(self) -> str:
+        return self._session_id
+
+    def client_id(self) -> str:
+        return self._client_id
+
+    def data_types(self) -> list[str]:
+        return list(self._client_eof_received)
+
+    def query_results_queue_name(self) -> str:
+        _, output_builder_data = next(iter(self._output_builders_data.items()))
+        return f"{output_builder_data[constants.QUEUE_PREFIX]}-{self._session_id}"
+
+    # ============================== HANDSHAKE ============================== #
+
+    def accept_handshake_message(self, message: str) -> str:
+        id, payload = communication_protocol.decode_handshake_message(message)
+        match payload:
+            case (
+                communication_protocol.ALL_QUERIES
+                | communication_protocol.ALL_QUERIES_OVER_DATA_STREAMS
+            ):
+                pass
+            case data_type if data_type in self._client_eof_received:
+                # a data stream joins the session of the given id and only
+                # sends the batches of its data type
+                if not session_ids.is_valid_session_id(self._session_key, id):
+                    raise ValueError(
+                        f"Invalid session id received from data stream: {id}"
+                    )
+                self._session_id = id
+                self._client_eof_received = {data_type: False}
+            case _:
+                raise ValueError(
+                    f"Invalid handshake payload received from client: {payload}"
+                )
+
+        self._client_id = id
+        return payload
+
+    def handshake_response_message(self) -> str:
+        return communication_protocol.encode_handshake_message(
+            self._session_id, self._client_id
+        )
+
+    # ============================== CLIENT DATA ============================== #
+
+    def _accept_data_batch_message(self, message: str) -> str:
+        data_type = communication_protocol.get_message_type(message)
+        if data_type not in self._client_eof_received:
+            raise ValueError(
+                f'Invalid batch message type received from client "{data_type}"'
+            )
+        return data_type
+
+    def _accept_data_batch_eof_message(self, message: str) -> str:
+        data_type = communication_protocol.decode_eof_message(message)
+        if data_type not in self._client_eof_received:
+            raise ValueError(
+                f'Invalid EOF message type received from client "{data_type}"'
+            )
+        self._client_eof_received[data_type] = True
+        return data_type
+
+    def accept_client_message(self, message: str) -> tuple[str, bool]:
+        # the data type the message belongs to, and whether it is its EOF
+        message_type = communication_protocol.get_message_type(message)
+        match message_type:
+            case (
+                communication_protocol.MENU_ITEMS_BATCH_MSG_TYPE
+                | communication_protocol.STORES_BATCH_MSG_TYPE
+                | communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE
+                | communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
+                | communication_protocol.USERS_BATCH_MSG_TYPE
+            ):
+                return self._accept_data_batch_message(message), False
+            case communication_protocol.EOF:
+                return self._accept_data_batch_eof_message(message), True
+            case _:
+                raise ValueError(
+                    f'Invalid message type received from client "{message_type}"'
+                )
+
+    def all_data_received(self) -> bool:
+        return all(self._client_eof_received.values())
+
+    # ============================== QUERY RESULTS ============================== #
+
+    def _accept_query_result_eof_message(self, message: str) -> bool:
+        data_type = communication_protocol.decode_eof_message(message)
+        if data_type not in self._output_builders_eof_received:
+            raise ValueError(
+                f'Invalid EOF message type received from output builder "{data_type}"'
+            )
+        self._output_builders_eof_received[data_type] += 1
+
+        # only the last EOF of the query is forwarded to the client
+        workers_amount = int(
+            self._output_builders_data[data_type][constants.WORKERS_AMOUNT]
+        )
+        return self._output_builders_eof_received[data_type] == workers_amount
+
+    def accept_output_builder_message(self, message: str) -> tuple[str, bool]:
+        # the message type, and whether the message must be sent to the client
+        message_type = communication_protocol.get_message_type(message)
+        match message_type:
+            case (
+                communication_protocol.QUERY_RESULT_1X_MSG_TYPE
+                | communication_protocol.QUERY_RESULT_21_MSG_TYPE
+                | communication_protocol.QUERY_RESULT_22_MSG_TYPE
+                | communication_protocol.QUERY_RESULT_3X_MSG_TYPE
+                | communication_protocol.QUERY_RESULT_4X_MSG_TYPE
+            ):
+                return message_type, True
+            case communication_protocol.EOF:
+                return message_type, self._accept_query_result_eof_message(message)
+            case _:
+                raise ValueError(
+                    f'Invalid message type received from output builder "{message_type}"'
+                )
+
+    def all_query_results_received(self) -> bool:
+        for data_type, eof_received in self._output_builders_eof_received.items():
+            workers_amount = self._output_builders_data[data_type][
+                constants.WORKERS_AMOUNT
+            ]
+            if eof_received < workers_amount:
+                return False
+        return True
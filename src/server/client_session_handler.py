@@ -2,11 +2,14 @@ import logging
 import os
 import signal
 import socket
-import uuid
-from typing import Any, Callable
+import threading
+from typing import Any, Callable, Optional
 
+from middleware import rabbitmq_connection_pool
+from middleware.dispatcher import Dispatcher, build_dispatcher
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
-from shared import communication_protocol, constants
+from server.client_session import ClientSession
+from shared import communication_protocol, constants, framed_socket
 
 
 class ClientSessionHandler:
@@ -15,36 +18,15 @@ class ClientSessionHandler:
 
     def _init_cleaners_data(self, cleaners_data: dict) -> None:
         self._cleaners_data = cleaners_data
-        for data_type in self._cleaners_data.keys():
-            self._cleaners_data[data_type]["current_worker_id"] = 0
 
     def _init_output_builders_data(self, output_builders_data: dict) -> None:
         self._output_builders_data = output_builders_data
 
-    def _init_client_data_batch_stats(self) -> None:
-        self._client_eof_received = {
-            communication_protocol.MENU_ITEMS_BATCH_MSG_TYPE: False,
-            communication_protocol.STORES_BATCH_MSG_TYPE: False,
-            communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE: False,
-            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE: False,
-            communication_protocol.USERS_BATCH_MSG_TYPE: False,
-        }
-
-    def _init_output_builders_data_stats(self) -> None:
-        self._output_builders_eof_received = {
-            constants.QUERY_RESULT_1X: 0,
-            constants.QUERY_RESULT_21: 0,
-            constants.QUERY_RESULT_22: 0,
-            constants.QUERY_RESULT_3X: 0,
-            constants.QUERY_RESULT_4X: 0,
-        }
-
-    def _init_mom_producers(self, rabbitmq_host: str) -> None:
-        self._mom_cleaners_connections: dict[
-            str, list[RabbitMQMessageMiddlewareQueue]
-        ] = {}
-
-        for data_type, cleaner_data in self._cleaners_data.items():
+    def _init_mom_producers(self, rabbitmq_host: str, data_types: list[str]) -> None:
+        # [IMPORTANT] only the producers of the data types this connection
+        # receives are opened, a data stream just sends one of them
+        for data_type in data_types:
+            cleaner_data = self._cleaners_data[data_type]
             workers_amount = cleaner_data[constants.WORKERS_AMOUNT]
             for id in range(workers_amount):
                 queue_name = f"{cleaner_data[constants.QUEUE_PREFIX]}-{id}"
@@ -56,11 +38,27 @@ class ClientSessionHandler:
                     self._mom_cleaners_connections[data_type] = []
                 self._mom_cleaners_connections[data_type].append(queue_producer)
 
+        self._cleaners_dispatchers: dict[str, Dispatcher] = {
+            data_type: build_dispatcher(
+                mom_producers,
+                self._cleaners_data[data_type].get(constants.DISPATCHING_CONFIG),
+            )
+            for data_type, mom_producers in self._mom_cleaners_connections.items()
+        }
+
     def _init_mom_consumers(self, rabbitmq_host: str) -> None:
-        (_, output_builder_data) = next(iter(self._output_builders_data.items()))
-        queue_name = f"{output_builder_data[constants.QUEUE_PREFIX]}-{self._session_id}"
-        queue_consumer = RabbitMQMessageMiddlewareQueue(rabbitmq_host, queue_name)
-        self._mom_output_builders_connection = queue_consumer
+        # [IMPORTANT] only the session connection consumes results, the data
+        # streams of the session just publish to the cleaners; the consumer is
+        # created, used and closed by the thread forwarding the results
+        queue_name = self._session.query_results_queue_name()
+        queue_consumer = RabbitMQMessageMiddlewareQueue(
+            rabbitmq_host,
+            queue_name,
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+        )
+        self._mom_output_builders_connection: Optional[
+            RabbitMQMessageMiddlewareQueue
+        ] = queue_consumer
 
     def __init__(
         self,
@@ -68,9 +66,9 @@ class ClientSessionHandler:
         rabbitmq_host: str,
         cleaners_data: dict,
         output_builders_data: dict,
+        session_key: bytes,
     ) -> None:
         self._client_socket = client_socket
-        self._session_id = uuid.uuid4().hex
 
         self._set_as_not_running()
         signal.signal(signal.SIGTERM, self._sigterm_signal_handler)
@@ -80,24 +78,38 @@ class ClientSessionHandler:
         self._init_cleaners_data(cleaners_data)
         self._init_output_builders_data(output_builders_data)
 
-        self._init_client_data_batch_stats()
-        self._init_output_builders_data_stats()
+        self._session = ClientSession(session_key, output_builders_data)
 
-        self._init_mom_producers(rabbitmq_host)
-        self._init_mom_consumers(rabbitmq_host)
+        self._mom_cleaners_connections: dict[
+            str, list[RabbitMQMessageMiddlewareQueue]
+        ] = {}
+        self._cleaners_dispatchers = {}
+        self._mom_output_builders_connection = None
 
-        self._temp_buffer = b""
+        self._results_forwarder: Optional[threading.Thread] = None
+        self._results_consumer_ready = threading.Event()
+        self._results_forwarding_errors: list[Exception] = []
+
+        self._socket_reader = framed_socket.FramedSocketReader(
+            self._client_socket, "client"
+        )
 
     # ============================== PRIVATE - LOGGING ============================== #
 
     def _log_debug(self, text: str) -> None:
-        logging.debug(f"{text} | pid: {os.getpid()} | session_id: {self._session_id}")
+        logging.debug(
+            f"{text} | pid: {os.getpid()} | session_id: {self._session.session_id()}"
+        )
 
     def _log_info(self, text: str) -> None:
-        logging.info(f"{text} | pid: {os.getpid()} | session_id: {self._session_id}")
+        logging.info(
+            f"{text} | pid: {os.getpid()} | session_id: {self._session.session_id()}"
+        )
 
     def _log_error(self, text: str) -> None:
-        logging.error(f"{text} | pid: {os.getpid()} | session_id: {self._session_id}")
+        logging.error(
+            f"{text} | pid: {os.getpid()} | session_id: {self._session.session_id()}"
+        )
 
     # ============================== PRIVATE - ACCESSING ============================== #
 
@@ -120,7 +132,7 @@ class ClientSessionHandler:
         self._client_socket.close()
         self._log_debug(f"action: sigterm_client_socket_close | result: success")
 
-        self._mom_output_builders_connection.stop_consuming()
+        self._stop_forwarding_query_results()
         self._log_debug(f"action: sigterm_mom_stop_consuming | result: success")
 
         self._log_info(f"action: sigterm_signal_handler | result: success")
@@ -128,217 +140,103 @@ class ClientSessionHandler:
     # ============================== PRIVATE - SOCKET SEND/RECEIVE MESSAGES ============================== #
 
     def _socket_send_message(self, socket: socket.socket, message: str) -> None:
-        self._log_debug(f"action: send_message | result: in_progress | msg: {message}")
+        self._log_debug(
+            f"action: send_message | result: in_progress | msg_size: {len(message)}"
+        )
 
-        socket.sendall(message.encode("utf-8"))
+        framed_socket.send_framed_message(socket, message)
 
-        self._log_debug(f"action: send_message | result: success |  msg: {message}")
+        self._log_debug(
+            f"action: send_message | result: success | msg_size: {len(message)}"
+        )
 
-    def _socket_receive_message(self, socket: socket.socket) -> str:
+    def _socket_receive_message(self) -> str:
         self._log_debug(f"action: receive_message | result: in_progress")
 
-        buffsize = constants.KiB
-        bytes_received = self._temp_buffer
-        self._temp_buffer = b""
-
-        all_data_received = False
-        while not all_data_received:
-            chunk = socket.recv(buffsize)
-            if len(chunk) == 0:
-                self._log_error(
-                    f"action: receive_message | result: fail | error: unexpected disconnection",
-                )
-                raise OSError(f"Unexpected disconnection of the client")
-
-            self._log_debug(
-                f"action: receive_chunk | result: success | chunk size: {len(chunk)}"
+        try:
+            message = self._socket_reader.receive_message()
+        except OSError as e:
+            self._log_error(
+                f"action: receive_message | result: fail | error: {e}",
             )
-            if chunk.endswith(communication_protocol.MSG_END_DELIMITER.encode("utf-8")):
-                all_data_received = True
+            raise
 
-            if communication_protocol.MSG_END_DELIMITER.encode("utf-8") in chunk:
-                index = chunk.rindex(
-                    communication_protocol.MSG_END_DELIMITER.encode("utf-8")
-                )
-                bytes_received += chunk[
-                    : index + len(communication_protocol.MSG_END_DELIMITER)
-                ]
-                self._temp_buffer = chunk[
-                    index + len(communication_protocol.MSG_END_DELIMITER) :
-                ]
-                all_data_received = True
-            else:
-                bytes_received += chunk
-
-        message = bytes_received.decode("utf-8")
-        self._log_debug(f"action: receive_message | result: success | msg: {message}")
+        self._log_debug(
+            f"action: receive_message | result: success | msg_size: {len(message)}"
+        )
         return message
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
     def _mom_send_message_to_next(self, data_type: str, message: str) -> None:
-        current_worker_id = self._cleaners_data[data_type]["current_worker_id"]
-
-        mom_producers = self._mom_cleaners_connections[data_type]
-        mom_producer: RabbitMQMessageMiddlewareQueue = mom_producers[current_worker_id]
-        mom_producer.send(message)
-
-        current_worker_id += 1
-
-        workers_amount = self._cleaners_data[data_type][constants.WORKERS_AMOUNT]
-        if current_worker_id == workers_amount:
-            current_worker_id = 0
-        self._cleaners_data[data_type]["current_worker_id"] = current_worker_id
+        self._cleaners_dispatchers[data_type].send(message)
 
     # ============================== PRIVATE - RECEIVE CLIENT HANDSHAKE ============================== #
 
-    def _send_client_handshake_message(
-        self, client_socket: socket.socket, client_id: str
-    ) -> None:
-        handshake_response_message = communication_protocol.encode_handshake_message(
-            self._session_id, client_id
-        )
+    def _send_client_handshake_message(self, client_socket: socket.socket) -> None:
+        handshake_response_message = self._session.handshake_response_message()
         self._socket_send_message(client_socket, handshake_response_message)
         self._log_info(
-            f"action: handshake_response_sent | result: success | client_id: {client_id}"
+            f"action: handshake_response_sent | result: success | client_id: {self._session.client_id()}"
         )
 
-    def _accept_client_handshake_message(self, client_socket: socket.socket) -> None:
-        received_message = self._socket_receive_message(client_socket)
-        (client_id, payload) = communication_protocol.decode_handshake_message(
-            received_message
-        )
-        if payload != communication_protocol.ALL_QUERIES:
-            raise ValueError(
-                f"Invalid handshake payload received from client: {payload}"
-            )
+    def _accept_client_handshake_message(self, client_socket: socket.socket) -> str:
+        received_message = self._socket_receive_message()
+        payload = self._session.accept_handshake_message(received_message)
         self._log_info(
-            f"action: handshake_received | result: success | client_id: {client_id}"
+            f"action: handshake_received | result: success | client_id: {self._session.client_id()} | payload: {payload}"
         )
 
-        self._send_client_handshake_message(client_socket, client_id)
+        self._send_client_handshake_message(client_socket)
+        return payload
 
     # ============================== PRIVATE - RECEIVE CLIENT DATA ============================== #
 
-    def _handle_data_batch_message(self, message: str) -> None:
-        data_type = communication_protocol.get_message_type(message)
-        self._mom_send_message_to_next(data_type, message)
-
-    def _handle_data_batch_eof_message(self, message: str) -> None:
-        data_type = communication_protocol.decode_eof_message(message)
-        if data_type not in self._client_eof_received:
-            raise ValueError(
-                f'Invalid EOF message type received from client "{data_type}"'
-            )
-        self._client_eof_received[data_type] = True
+    def _handle_data_batch_eof_message(self, data_type: str, message: str) -> None:
         self._log_info(f"action: {data_type}_eof_received | result: success")
 
         for mom_producer in self._mom_cleaners_connections[data_type]:
             mom_producer.send(message)
 
     def _handle_client_message(self, message: str) -> None:
-        message_type = communication_protocol.get_message_type(message)
-        match message_type:
-            case (
-                communication_protocol.MENU_ITEMS_BATCH_MSG_TYPE
-                | communication_protocol.STORES_BATCH_MSG_TYPE
-                | communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE
-                | communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
-                | communication_protocol.USERS_BATCH_MSG_TYPE
-            ):
-                self._handle_data_batch_message(message)
-            case communication_protocol.EOF:
-                self._handle_data_batch_eof_message(message)
-            case _:
-                raise ValueError(
-                    f'Invalid message type received from client "{message_type}"'
-                )
-
-    def _with_each_message_do(
-        self,
-        received_message: str,
-        callback: Callable,
-        *args: Any,
-        **kwargs: Any,
-    ) -> None:
-        messages = received_message.split(communication_protocol.MSG_END_DELIMITER)
-        for message in messages:
-            if not self._is_running():
-                break
-            if message == "":
-                continue
-            message += communication_protocol.MSG_END_DELIMITER
-            callback(message, *args, **kwargs)
+        data_type, is_eof = self._session.accept_client_message(message)
+        if is_eof:
+            self._handle_data_batch_eof_message(data_type, message)
+        else:
+            self._mom_send_message_to_next(data_type, message)
 
     def _receive_all_data_from_client(self, client_socket: socket.socket) -> None:
-        while not all(self._client_eof_received.values()):
+        while not self._session.all_data_received():
             if not self._is_running():
                 return
 
-            received_message = self._socket_receive_message(client_socket)
-            self._with_each_message_do(
-                received_message,
-                self._handle_client_message,
-            )
+            received_message = self._socket_receive_message()
+            self._handle_client_message(received_message)
 
         self._log_info(f"action: all_data_received | result: success")
 
     # ============================== PRIVATE - RECEIVE RESULTS ============================== #
 
-    def _all_eof_received_from_output_builders(self) -> bool:
-        for data_type, eof_received in self._output_builders_eof_received.items():
-            workers_amount = self._output_builders_data[data_type][
-                constants.WORKERS_AMOUNT
-            ]
-            if eof_received < workers_amount:
-                return False
-        return True
-
-    def _handle_query_result_batch_message(
-        self, client_socket: socket.socket, message: str
-    ) -> None:
-        self._socket_send_message(client_socket, message)
-
-    def _handle_query_result_eof_message(
-        self, client_socket: socket.socket, message: str
-    ) -> None:
-        data_type = communication_protocol.decode_eof_message(message)
-        if data_type not in self._output_builders_eof_received:
-            raise ValueError(
-                f'Invalid EOF message type received from output builder "{data_type}"'
-            )
-        self._output_builders_eof_received[data_type] += 1
-        self._log_info(f"action: eof_{data_type}_result_received | result: success")
-
-        workers_amount = self._output_builders_data[data_type][constants.WORKERS_AMOUNT]
-        if self._output_builders_eof_received[data_type] == workers_amount:
-            self._socket_send_message(client_socket, message)
-            self._log_info(
-                f"action: eof_{data_type}_results_to_client_sent | result: success"
-            )
-
-    def _handle_output_builder_message(self, client_socket: socket.socket) -> Callable:
+    def _handle_output_builder_message(
+        self,
+        client_socket: socket.socket,
+        mom_consumer: RabbitMQMessageMiddlewareQueue,
+    ) -> Callable:
         def _on_message_callback(message_as_bytes: bytes) -> None:
             message = message_as_bytes.decode("utf-8")
-            message_type = communication_protocol.get_message_type(message)
-            match message_type:
-                case (
-                    communication_protocol.QUERY_RESULT_1X_MSG_TYPE
-                    | communication_protocol.QUERY_RESULT_21_MSG_TYPE
-                    | communication_protocol.QUERY_RESULT_22_MSG_TYPE
-                    | communication_protocol.QUERY_RESULT_3X_MSG_TYPE
-                    | communication_protocol.QUERY_RESULT_4X_MSG_TYPE
-                ):
-                    self._handle_query_result_batch_message(client_socket, message)
-                case communication_protocol.EOF:
-                    self._handle_query_result_eof_message(client_socket, message)
-                case _:
-                    raise ValueError(
-                        f'Invalid message type received from client "{message_type}"'
-                    )
-
-            if self._all_eof_received_from_output_builders():
-                self._mom_output_builders_connection.stop_consuming()
+            message_type, must_be_sent = self._session.accept_output_builder_message(
+                message
+            )
+            if must_be_sent:
+                self._socket_send_message(client_socket, message)
+            if message_type == communication_protocol.EOF and must_be_sent:
+                data_type = communication_protocol.decode_eof_message(message)
+                self._log_info(
+                    f"action: eof_{data_type}_results_to_client_sent | result: success"
+                )
+
+            if self._session.all_query_results_received():
+                mom_consumer.stop_consuming()
                 self._log_info(f"action: all_results_received | result: success")
 
         return _on_message_callback
@@ -346,16 +244,111 @@ class ClientSessionHandler:
     def _receive_all_query_results_from_output_builders(
         self, client_socket: socket.socket
     ) -> None:
-        self._mom_output_builders_connection.start_consuming(
-            self._handle_output_builder_message(client_socket)
+        mom_consumer = self._mom_output_builders_connection
+        if mom_consumer is None:
+            return
+
+        mom_consumer.start_consuming(
+            self._handle_output_builder_message(client_socket, mom_consumer)
+        )
+
+    # ============================== PRIVATE - FORWARD RESULTS ============================== #
+
+    def _close_mom_consumers(self) -> None:
+        if self._mom_output_builders_connection is None:
+            return
+
+        self._mom_output_builders_connection.delete()
+        self._mom_output_builders_connection.close()
+        self._mom_output_builders_connection = None
+        self._log_debug(
+            f"action: mom_output_builder_connection_close | result: success"
+        )
+
+    def _forward_all_query_results(self, client_socket: socket.socket) -> None:
+        try:
+            self._init_mom_consumers(self._rabbitmq_host)
+            self._results_consumer_ready.set()
+            if self._is_running():
+                self._receive_all_query_results_from_output_builders(client_socket)
+        finally:
+            self._results_consumer_ready.set()
+            self._close_mom_consumers()
+
+    def _forward_all_query_results_in_background(
+        self, client_socket: socket.socket
+    ) -> None:
+        try:
+            self._forward_all_query_results(client_socket)
+        except Exception as e:
+            self._log_error(
+                f"action: forward_query_results | result: fail | error: {e}"
+            )
+            self._results_forwarding_errors.append(e)
+
+            # the client will never get its results, stop receiving its data
+            self._set_as_not_running()
+            try:
+                client_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _start_forwarding_query_results(self, client_socket: socket.socket) -> None:
+        # [IMPORTANT] results are forwarded while the data is still being
+        # received, the socket is written by this thread and read by the main one
+        self._results_forwarder = threading.Thread(
+            target=self._forward_all_query_results_in_background,
+            args=(client_socket,),
+            name="results_forwarder",
         )
+        self._results_forwarder.start()
+        # the consumer must exist before it can be asked to stop
+        self._results_consumer_ready.wait()
+
+    def _stop_forwarding_query_results(self) -> None:
+        if self._mom_output_builders_connection is None:
+            return
+        try:
+            self._mom_output_builders_connection.schedule_stop_sonsuming()
+        except Exception as e:
+            # the consumer has already been closed
+            self._log_debug(
+                f"action: schedule_stop_consuming | result: fail | error: {e}"
+            )
+
+    def _join_forwarding_query_results(self) -> None:
+        if self._results_forwarder is None:
+            return
+
+        self._results_forwarder.join()
+        if len(self._results_forwarding_errors) != 0:
+            raise self._results_forwarding_errors[0]
 
     # ============================== PRIVATE - HANDLE CLIENT CONNECTION ============================== #
 
     def _handle_client_connection(self, client_socket: socket.socket) -> None:
-        self._accept_client_handshake_message(client_socket)
-        self._receive_all_data_from_client(client_socket)
-        self._receive_all_query_results_from_output_builders(client_socket)
+        handshake_payload = self._accept_client_handshake_message(client_socket)
+        match handshake_payload:
+            case communication_protocol.ALL_QUERIES:
+                self._init_mom_producers(
+                    self._rabbitmq_host, self._session.data_types()
+                )
+                self._start_forwarding_query_results(client_socket)
+                try:
+                    self._receive_all_data_from_client(client_socket)
+                except Exception:
+                    self._set_as_not_running()
+                    self._stop_forwarding_query_results()
+                    raise
+                finally:
+                    self._join_forwarding_query_results()
+            case communication_protocol.ALL_QUERIES_OVER_DATA_STREAMS:
+                self._forward_all_query_results(client_socket)
+            case _:
+                self._init_mom_producers(
+                    self._rabbitmq_host, self._session.data_types()
+                )
+                self._receive_all_data_from_client(client_socket)
 
     # ============================== PRIVATE - RUN ============================== #
 
@@ -373,12 +366,6 @@ class ClientSessionHandler:
                     f"action: mom_cleaner_connection_close | result: success"
                 )
 
-        self._mom_output_builders_connection.delete()
-        self._mom_output_builders_connection.close()
-        self._log_debug(
-            f"action: mom_output_builder_connection_close | result: success"
-        )
-
     def _ensure_connections_close_after_doing(self, callback: Callable) -> None:
         try:
             callback()
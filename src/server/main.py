@@ -1,5 +1,6 @@
 import logging
 
+from server.async_server import AsyncServer
 from server.server import Server
 from shared import constants, initializer
 
@@ -10,27 +11,36 @@ def _build_cleaners_data(config_params: dict) -> dict:
     transaction_items_workers_amount = config_params["TRANSACTION_ITEMS_CLN_AMOUNT"]
     transactions_workers_amount = int(config_params["TRANSACTIONS_CLN_AMOUNT"])
     users_workers_amount = int(config_params["USERS_CLN_AMOUNT"])
+    dispatching_config = {
+        "policy": config_params["DISPATCH_POLICY"],
+        "refresh_every_messages": int(config_params["DISPATCH_REFRESH_EVERY_MESSAGES"]),
+    }
 
     return {
         constants.MENU_ITEMS: {
             constants.QUEUE_PREFIX: constants.DIRTY_MIT_QUEUE_PREFIX,
             constants.WORKERS_AMOUNT: int(menu_items_workers_amount),
+            constants.DISPATCHING_CONFIG: dispatching_config,
         },
         constants.STORES: {
             constants.QUEUE_PREFIX: constants.DIRTY_STR_QUEUE_PREFIX,
             constants.WORKERS_AMOUNT: int(stores_workers_amount),
+            constants.DISPATCHING_CONFIG: dispatching_config,
         },
         constants.TRANSACTION_ITEMS: {
             constants.QUEUE_PREFIX: constants.DIRTY_TIT_QUEUE_PREFIX,
             constants.WORKERS_AMOUNT: int(transaction_items_workers_amount),
+            constants.DISPATCHING_CONFIG: dispatching_config,
         },
         constants.TRANSACTIONS: {
             constants.QUEUE_PREFIX: constants.DIRTY_TRN_QUEUE_PREFIX,
             constants.WORKERS_AMOUNT: int(transactions_workers_amount),
+            constants.DISPATCHING_CONFIG: dispatching_config,
         },
         constants.USERS: {
             constants.QUEUE_PREFIX: constants.DIRTY_USR_QUEUE_PREFIX,
             constants.WORKERS_AMOUNT: int(users_workers_amount),
+            constants.DISPATCHING_CONFIG: dispatching_config,
         },
     }
 
@@ -83,18 +93,40 @@ def main():
             "Q22_OB_AMOUNT",
             "Q3X_OB_AMOUNT",
             "Q4X_OB_AMOUNT",
-        ]
+            "SERVER_MODE",
+            "SERVER_ASYNC_WORKERS",
+            "DISPATCH_POLICY",
+            "DISPATCH_REFRESH_EVERY_MESSAGES",
+        ],
+        default_values={
+            "SERVER_MODE": "processes",
+            "SERVER_ASYNC_WORKERS": "2",
+        },
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
     logging.info(f"action: init_config | result: success | params: {config_params}")
 
-    server = Server(
-        port=int(config_params["SERVER_PORT"]),
-        listen_backlog=int(config_params["SERVER_LISTEN_BACKLOG"]),
-        rabbitmq_host=config_params["RABBITMQ_HOST"],
-        cleaners_data=_build_cleaners_data(config_params),
-        output_builders_data=_build_output_builders_data(config_params),
-    )
+    server_mode = config_params["SERVER_MODE"]
+    match server_mode:
+        case "processes":
+            server = Server(
+                port=int(config_params["SERVER_PORT"]),
+                listen_backlog=int(config_params["SERVER_LISTEN_BACKLOG"]),
+                rabbitmq_host=config_params["RABBITMQ_HOST"],
+                cleaners_data=_build_cleaners_data(config_params),
+                output_builders_data=_build_output_builders_data(config_params),
+            )
+        case "asyncio":
+            server = AsyncServer(
+                port=int(config_params["SERVER_PORT"]),
+                listen_backlog=int(config_params["SERVER_LISTEN_BACKLOG"]),
+                rabbitmq_host=config_params["RABBITMQ_HOST"],
+                cleaners_data=_build_cleaners_data(config_params),
+                output_builders_data=_build_output_builders_data(config_params),
+                workers_amount=int(config_params["SERVER_ASYNC_WORKERS"]),
+            )
+        case _:
+            raise ValueError(f"Unknown server mode: {server_mode}")
     server.run()
 
 
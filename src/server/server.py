@@ -5,6 +5,7 @@ import socket
 from collections.abc import Callable
 from typing import Any, Optional
 
+from server import session_ids
 from server.client_session_handler import ClientSessionHandler
 
 
@@ -32,6 +33,10 @@ class Server:
         self._cleaners_data = cleaners_data
         self._output_builders_data = output_builders_data
 
+        # [IMPORTANT] created before any session process is spawned, so every
+        # one of them can validate the session ids issued by the others
+        self._session_key = session_ids.new_session_key()
+
         self._spawned_processes: list[multiprocessing.Process] = []
 
     # ============================== PRIVATE - LOGGING ============================== #
@@ -158,6 +163,7 @@ class Server:
             self._rabbitmq_host,
             self._cleaners_data,
             self._output_builders_data,
+            self._session_key,
         ).run()
 
     def _handle_client_connection_spawning_process(
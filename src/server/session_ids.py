@@ -0,0 +1,38 @@
+import hashlib
+import hmac
+import secrets
+
+# a session id is a random nonce followed by its HMAC under the server key,
+# so any process of the server can tell whether a session id was issued by it
+# without sharing the ids of the running sessions
+
+SESSION_KEY_SIZE = 32
+NONCE_SIZE = 16
+TAG_SIZE = 16
+
+# ============================= PRIVATE - SIGNING ============================== #
+
+
+def _tag_of(session_key: bytes, nonce: str) -> str:
+    digest = hmac.new(session_key, nonce.encode("utf-8"), hashlib.sha256)
+    return digest.hexdigest()[: 2 * TAG_SIZE]
+
+
+# ============================= SESSION IDS ============================== #
+
+
+def new_session_key() -> bytes:
+    return secrets.token_bytes(SESSION_KEY_SIZE)
+
+
+def new_session_id(session_key: bytes) -> str:
+    nonce = secrets.token_hex(NONCE_SIZE)
+    return nonce + _tag_of(session_key, nonce)
+
+
+def is_valid_session_id(session_key: bytes, session_id: str) -> bool:
+    if len(session_id) != 2 * (NONCE_SIZE + TAG_SIZE):
+        return False
+
+    nonce, tag = session_id[: 2 * NONCE_SIZE], session_id[2 * NONCE_SIZE :]
+    return hmac.compare_digest(tag, _tag_of(session_key, nonce))
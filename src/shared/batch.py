@@ -0,0 +1,85 @@
+from itertools import compress
+from typing import Iterator
+
+
+# rows are stored column-major: one list of values per column
+class Batch:
+
+    __slots__ = ("_columns", "_values_by_column", "_rows_amount")
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, columns: list[str], values_by_column: list[list[str]]) -> None:
+        if len(columns) != len(values_by_column):
+            raise ValueError(
+                f"Columns amount mismatch. Columns: {len(columns)}, Values: {len(values_by_column)}"
+            )
+
+        self._columns = columns
+        self._values_by_column = values_by_column
+        self._rows_amount = len(values_by_column[0]) if values_by_column else 0
+
+    @classmethod
+    def from_rows(cls, rows: list[dict[str, str]]) -> "Batch":
+        if len(rows) == 0:
+            return cls([], [])
+
+        # all rows in a batch share the columns of the first one
+        columns = list(rows[0])
+        values_by_column = [[row[column] for row in rows] for column in columns]
+        return cls(columns, values_by_column)
+
+    # ============================== ACCESSING ============================== #
+
+    def columns(self) -> list[str]:
+        return self._columns
+
+    def column(self, name: str) -> list[str]:
+        # an empty batch may not know its columns, any of them is empty
+        if self._rows_amount == 0 and name not in self._columns:
+            return []
+        return self._values_by_column[self._columns.index(name)]
+
+    def values_by_column(self) -> list[list[str]]:
+        return self._values_by_column
+
+    def rows(self) -> Iterator[dict[str, str]]:
+        for values in zip(*self._values_by_column):
+            yield dict(zip(self._columns, values))
+
+    def is_empty(self) -> bool:
+        return self._rows_amount == 0
+
+    def __len__(self) -> int:
+        return self._rows_amount
+
+    # ============================== TRANSFORMING ============================== #
+
+    def project(self, columns: list[str]) -> "Batch":
+        # the column lists are shared with the original batch, not copied
+        return Batch(list(columns), [self.column(column) for column in columns])
+
+    def select(self, mask: list[bool]) -> "Batch":
+        if len(mask) != self._rows_amount:
+            raise ValueError(
+                f"Mask length mismatch. Rows: {self._rows_amount}, Mask: {len(mask)}"
+            )
+
+        values_by_column = [
+            list(compress(values, mask)) for values in self._values_by_column
+        ]
+        return Batch(list(self._columns), values_by_column)
+
+    def append_column(self, name: str, values: list[str]) -> None:
+        if self._columns and len(values) != self._rows_amount:
+            raise ValueError(
+                f"Column length mismatch. Rows: {self._rows_amount}, Values: {len(values)}"
+            )
+
+        if name in self._columns:
+            self._values_by_column[self._columns.index(name)] = values
+            return
+
+        self._columns.append(name)
+        self._values_by_column.append(values)
+        self._rows_amount = len(values)
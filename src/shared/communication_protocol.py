@@ -1,3 +1,7 @@
+from itertools import accumulate
+
+from shared.batch import Batch
+
 # the fixed length of the message type prefix in the protocol
 MESSAGE_TYPE_LENGTH = 3
 
@@ -27,8 +31,18 @@ BATCH_END_DELIMITER = "}"
 BATCH_ROW_SEPARATOR = ";"
 ROW_FIELD_SEPARATOR = ","
 
+# batch payload encoding (v2)
+# <version>#<columns amount>#<field lengths>#<fields>
+# fields are the column names followed by the row values (row-major)
+BATCH_ENCODING_VERSION = "2"
+BATCH_HEADER_SEPARATOR = "#"
+BATCH_LENGTHS_SEPARATOR = ","
+
 # payload
 ALL_QUERIES = "Q1X;Q21;Q22;Q3X;Q4X"
+# the client sends its data through one extra connection (data stream) per
+# data type, each one opened with a handshake of the session id and the type
+ALL_QUERIES_OVER_DATA_STREAMS = ALL_QUERIES + ";DST"
 EOF = "EOF"
 
 # ============================= PRIVATE - DECODE ============================== #
@@ -63,6 +77,71 @@ def _decode_row(encoded_row: str) -> dict[str, str]:
     return row
 
 
+def _decode_text_batch_payload(payload: str) -> list[dict[str, str]]:
+    if len(payload) == 0:
+        return []
+
+    encoded_rows = payload.split(BATCH_ROW_SEPARATOR)
+    decoded_rows = []
+
+    for encoded_row in encoded_rows:
+        bet = _decode_row(encoded_row)
+        decoded_rows.append(bet)
+
+    return decoded_rows
+
+
+def _decode_batch_fields(payload: str) -> tuple[int, list[str]]:
+    _, columns_amount, encoded_lengths, data = payload.split(BATCH_HEADER_SEPARATOR, 3)
+    lengths = map(int, encoded_lengths.split(BATCH_LENGTHS_SEPARATOR))
+    offsets = [0, *accumulate(lengths)]
+    fields = [data[start:end] for start, end in zip(offsets, offsets[1:])]
+    return int(columns_amount), fields
+
+
+def _decode_batch_payload(payload: str) -> list[dict[str, str]]:
+    columns_amount, fields = _decode_batch_fields(payload)
+    columns = fields[:columns_amount]
+    return [
+        dict(zip(columns, fields[row_start : row_start + columns_amount]))
+        for row_start in range(columns_amount, len(fields), columns_amount)
+    ]
+
+
+def _decode_batch_payload_as_columns(payload: str) -> Batch:
+    columns_amount, fields = _decode_batch_fields(payload)
+    columns = fields[:columns_amount]
+    values_by_column = [
+        fields[columns_amount + column_index :: columns_amount]
+        for column_index in range(columns_amount)
+    ]
+    return Batch(columns, values_by_column)
+
+
+def _is_text_batch_payload(payload: str) -> bool:
+    return len(payload) == 0 or payload.startswith(BATCH_START_DELIMITER)
+
+
+def _split_batch_payload(payload: str) -> tuple[str, str, str, str, str]:
+    # columns amount, lengths & fields of the column names and lengths &
+    # fields of the row values, without splitting the row values
+    _, encoded_columns_amount, encoded_lengths, data = payload.split(
+        BATCH_HEADER_SEPARATOR, 3
+    )
+    column_lengths = encoded_lengths.split(
+        BATCH_LENGTHS_SEPARATOR, int(encoded_columns_amount)
+    )
+    value_lengths = column_lengths.pop()
+    columns_size = sum(map(int, column_lengths))
+    return (
+        encoded_columns_amount,
+        BATCH_LENGTHS_SEPARATOR.join(column_lengths),
+        data[:columns_size],
+        value_lengths,
+        data[columns_size:],
+    )
+
+
 def _decode_batch_message_with_type(
     message_type: str, message: str
 ) -> list[dict[str, str]]:
@@ -84,13 +163,31 @@ def get_message_session_id(message: str) -> str:
 
 def get_message_payload(message: str) -> str:
     payload_start = message.index(MSG_START_DELIMITER)
-    payload_end = message.index(MSG_END_DELIMITER, payload_start)
+    # batch values may contain the end delimiter, the last one closes the message
+    payload_end = message.rindex(MSG_END_DELIMITER, payload_start)
 
     payload = message[payload_start + 1 : payload_end]
 
     return payload
 
 
+def get_batch_shape(message: str) -> tuple[str, int]:
+    # the encoded columns and the rows amount of a v2 batch, read from its
+    # header; text and empty batches have no encoded columns nor rows
+    payload = get_message_payload(message)
+    if _is_text_batch_payload(payload):
+        return "", 0
+
+    columns_amount, column_lengths, columns, value_lengths, _ = _split_batch_payload(
+        payload
+    )
+    values_amount = value_lengths.count(BATCH_LENGTHS_SEPARATOR) + 1
+    encoded_columns = BATCH_HEADER_SEPARATOR.join(
+        [columns_amount, column_lengths, columns]
+    )
+    return encoded_columns, values_amount // int(columns_amount)
+
+
 def message_without_payload(message: str) -> bool:
     payload = get_message_payload(message)
     return len(payload) == 0
@@ -111,14 +208,21 @@ def decode_handshake_message(message: str) -> tuple[str, str]:
 
 def decode_batch_message(message: str) -> list[dict[str, str]]:
     payload = get_message_payload(message)
-    encoded_rows = payload.split(BATCH_ROW_SEPARATOR)
-    decoded_rows = []
+    if _is_text_batch_payload(payload):
+        return _decode_text_batch_payload(payload)
+    return _decode_batch_payload(payload)
 
-    for encoded_row in encoded_rows:
-        bet = _decode_row(encoded_row)
-        decoded_rows.append(bet)
 
-    return decoded_rows
+def decode_batch(message: str) -> Batch:
+    payload = get_message_payload(message)
+    if _is_text_batch_payload(payload):
+        return Batch.from_rows(_decode_text_batch_payload(payload))
+    return _decode_batch_payload_as_columns(payload)
+
+
+def decode_text_batch_message(message: str) -> list[dict[str, str]]:
+    payload = get_message_payload(message)
+    return _decode_text_batch_payload(payload)
 
 
 def decode_menu_items_batch_message(message: str) -> list[dict[str, str]]:
@@ -169,6 +273,38 @@ def _encode_row(row: dict[str, str]) -> str:
     return BATCH_START_DELIMITER + ecoded_row + BATCH_END_DELIMITER
 
 
+def _encode_batch_fields(columns_amount: int, fields: list[str]) -> str:
+    encoded_lengths = BATCH_LENGTHS_SEPARATOR.join(
+        [str(len(field)) for field in fields]
+    )
+    return BATCH_HEADER_SEPARATOR.join(
+        [
+            BATCH_ENCODING_VERSION,
+            str(columns_amount),
+            encoded_lengths,
+            "".join(fields),
+        ]
+    )
+
+
+def _encode_batch_payload(batch: list[dict[str, str]]) -> str:
+    if len(batch) == 0:
+        return ""
+
+    # all rows in a batch must have the columns of the first one
+    columns = list(batch[0])
+    for item_batch in batch:
+        if item_batch.keys() != batch[0].keys():
+            raise ValueError(
+                f"Invalid batch row, expected columns {columns}: {list(item_batch)}"
+            )
+
+    fields = columns + [
+        item_batch[column] for item_batch in batch for column in columns
+    ]
+    return _encode_batch_fields(len(columns), fields)
+
+
 # ============================= ENCODE ============================== #
 
 
@@ -180,6 +316,37 @@ def encode_batch_message(
     batch_msg_type: str,
     session_id: str,
     batch: list[dict[str, str]],
+) -> str:
+    encoded_payload = _encode_batch_payload(batch)
+    return _encode_message(batch_msg_type, session_id, encoded_payload)
+
+
+def encode_batch(batch_msg_type: str, session_id: str, batch: Batch) -> str:
+    encoded_payload = ""
+    if not batch.is_empty():
+        columns = batch.columns()
+        values = [value for row in zip(*batch.values_by_column()) for value in row]
+        encoded_payload = _encode_batch_fields(len(columns), columns + values)
+    return _encode_message(batch_msg_type, session_id, encoded_payload)
+
+
+def encode_batch_values(
+    batch_msg_type: str,
+    session_id: str,
+    columns: list[str],
+    values: list[str],
+) -> str:
+    # values are the row values already flattened in row-major order
+    encoded_payload = ""
+    if len(values) > 0:
+        encoded_payload = _encode_batch_fields(len(columns), columns + values)
+    return _encode_message(batch_msg_type, session_id, encoded_payload)
+
+
+def encode_text_batch_message(
+    batch_msg_type: str,
+    session_id: str,
+    batch: list[dict[str, str]],
 ) -> str:
     encoded_rows = []
 
@@ -248,3 +415,93 @@ def encode_users_batch_message(
 
 def encode_eof_message(session_id: str, message_type: str) -> str:
     return _encode_message(EOF, session_id, message_type)
+
+
+# ============================= TRANSFORM ============================== #
+
+
+def project_batch_message(message: str, columns: list[str]) -> str:
+    # slices the kept fields straight out of the payload,
+    # without decoding rows nor touching the dropped fields
+    payload_start = message.index(MSG_START_DELIMITER)
+    payload_end = message.rindex(MSG_END_DELIMITER, payload_start)
+    payload = message[payload_start + 1 : payload_end]
+    if len(payload) == 0:
+        # an empty batch has no columns to project
+        return message
+
+    if _is_text_batch_payload(payload):
+        message_type = get_message_type(message)
+        session_id = get_message_session_id(message)
+        return encode_batch(
+            message_type, session_id, decode_batch(message).project(columns)
+        )
+
+    _, encoded_columns_amount, encoded_lengths, data = payload.split(
+        BATCH_HEADER_SEPARATOR, 3
+    )
+    columns_amount = int(encoded_columns_amount)
+    lengths = encoded_lengths.split(BATCH_LENGTHS_SEPARATOR)
+    offsets = [0, *accumulate(map(int, lengths))]
+
+    received_columns = [
+        data[offsets[field_index] : offsets[field_index + 1]]
+        for field_index in range(columns_amount)
+    ]
+    kept_column_indexes = [received_columns.index(column) for column in columns]
+    kept_field_indexes = [
+        row_start + column_index
+        for row_start in range(columns_amount, len(lengths), columns_amount)
+        for column_index in kept_column_indexes
+    ]
+
+    kept_lengths = [str(len(column)) for column in columns]
+    kept_lengths += [lengths[field_index] for field_index in kept_field_indexes]
+    kept_fields = list(columns)
+    kept_fields += [
+        data[offsets[field_index] : offsets[field_index + 1]]
+        for field_index in kept_field_indexes
+    ]
+
+    projected_payload = BATCH_HEADER_SEPARATOR.join(
+        [
+            BATCH_ENCODING_VERSION,
+            str(len(columns)),
+            BATCH_LENGTHS_SEPARATOR.join(kept_lengths),
+            "".join(kept_fields),
+        ]
+    )
+    return message[: payload_start + 1] + projected_payload + MSG_END_DELIMITER
+
+
+def merge_batch_messages(messages: list[str]) -> str:
+    # concatenates the rows of v2 batch messages with the same type, session
+    # and columns, copying the encoded row values without decoding them
+    if len(messages) == 1:
+        return messages[0]
+
+    columns_amount, column_lengths, columns, _, _ = _split_batch_payload(
+        get_message_payload(messages[0])
+    )
+    all_value_lengths = [column_lengths]
+    all_values = [columns]
+    for message in messages:
+        _, _, _, value_lengths, values = _split_batch_payload(
+            get_message_payload(message)
+        )
+        all_value_lengths.append(value_lengths)
+        all_values.append(values)
+
+    merged_payload = BATCH_HEADER_SEPARATOR.join(
+        [
+            BATCH_ENCODING_VERSION,
+            columns_amount,
+            BATCH_LENGTHS_SEPARATOR.join(all_value_lengths),
+            "".join(all_values),
+        ]
+    )
+    return _encode_message(
+        get_message_type(messages[0]),
+        get_message_session_id(messages[0]),
+        merged_payload,
+    )
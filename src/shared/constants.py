@@ -3,6 +3,7 @@ from shared import communication_protocol
 # ============================== COMMON CONSTANTS ============================== #
 
 KiB = 1024
+MiB = 1024 * KiB
 
 # ============================== COMMON TAGS ============================== #
 
@@ -20,6 +21,16 @@ QUERY_RESULT_4X = communication_protocol.QUERY_RESULT_4X_MSG_TYPE
 
 QUEUE_PREFIX = "queue_prefix_name"
 WORKERS_AMOUNT = "workers_amount"
+DISPATCHING_CONFIG = "dispatching_config"
+
+# ============================== MOM CONSUMING ============================== #
+
+# optional environment variables, tuned per controller from compose
+CONSUMING_CONFIG_DEFAULT_VALUES = {
+    "PREFETCH_COUNT": "32",
+    "ACK_EVERY_MESSAGES": "16",
+    "ACK_EVERY_MS": "200",
+}
 
 # ============================== FOLDER NAMES ============================== #
 
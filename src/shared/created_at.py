@@ -0,0 +1,53 @@
+from functools import lru_cache
+
+# [IMPORTANT] columns derived from created_at ("YYYY-MM-DD HH:MM:SS") by the
+# cleaners, so the filters and mappers never parse the timestamp again
+YEAR = "year_created_at"
+HOUR = "hour_created_at"
+YEAR_HALF = "year_half_created_at"
+YEAR_MONTH = "year_month_created_at"
+
+DerivedValues = tuple[str, str, str, str]
+
+_VALUE_INDEX_BY_COLUMN = {YEAR: 0, HOUR: 1, YEAR_HALF: 2, YEAR_MONTH: 3}
+_INVALID_DERIVED_VALUES: DerivedValues = ("", "", "", "")
+
+# ============================== PRIVATE - PARSING ============================== #
+
+
+@lru_cache(maxsize=1 << 15)
+def _derived_values_of(date_and_hour: str) -> DerivedValues:
+    # timestamps repeat a lot up to the hour (days * 24 different values),
+    # so only the first time each one is seen is actually parsed
+    date, _, time = date_and_hour.partition(" ")
+    try:
+        year, month, _ = date.split("-")
+        year_number = int(year)
+        month_number = int(month)
+        hour_number = int(time.partition(":")[0])
+    except ValueError:
+        # rows with an invalid created_at are left out by the filters
+        return _INVALID_DERIVED_VALUES
+
+    year_half = "H1" if month_number <= 6 else "H2"
+    return (
+        str(year_number),
+        str(hour_number),
+        f"{year_number}-{year_half}",
+        f"{year_number}-{month_number:02d}",
+    )
+
+
+# ============================== DERIVED COLUMNS ============================== #
+
+
+def derived_columns_of(
+    created_at_column: list[str], column_names: list[str]
+) -> list[list[str]]:
+    all_derived_values = [
+        _derived_values_of(created_at[:13]) for created_at in created_at_column
+    ]
+    return [
+        [derived_values[value_index] for derived_values in all_derived_values]
+        for value_index in (_VALUE_INDEX_BY_COLUMN[name] for name in column_names)
+    ]
@@ -0,0 +1,153 @@
+import asyncio
+import socket
+import struct
+from collections import deque
+
+from shared import constants
+
+# every message travels as a frame: a fixed-size header with the length of the
+# utf-8 encoded message (unsigned, big endian) followed by the message itself
+FRAME_HEADER = struct.Struct("!I")
+
+# [IMPORTANT] the length comes from the peer, so frames announcing a bigger
+# message are rejected instead of allocating a buffer for them
+MAX_MESSAGE_SIZE = 64 * constants.MiB
+
+RECEIVE_BUFFER_SIZE = 256 * constants.KiB
+
+# ============================= ENCODE ============================== #
+
+
+def encode_frame(message: str) -> bytes:
+    message_as_bytes = message.encode("utf-8")
+    return FRAME_HEADER.pack(len(message_as_bytes)) + message_as_bytes
+
+
+def send_framed_message(sock: socket.socket, message: str) -> None:
+    sock.sendall(encode_frame(message))
+
+
+async def write_framed_message(writer: asyncio.StreamWriter, message: str) -> None:
+    writer.write(encode_frame(message))
+    await writer.drain()
+
+
+# ============================= DECODE ============================== #
+
+
+def _decode_message_size(
+    header: bytes | memoryview, max_message_size: int, peer_name: str
+) -> int:
+    message_size = int(FRAME_HEADER.unpack(header)[0])
+    if message_size > max_message_size:
+        raise OSError(
+            f"Frame of {message_size} bytes from the {peer_name} exceeds the maximum of {max_message_size} bytes"
+        )
+    return message_size
+
+
+async def read_framed_message(
+    reader: asyncio.StreamReader,
+    peer_name: str,
+    max_message_size: int = MAX_MESSAGE_SIZE,
+) -> str:
+    # the stream reader already buffers large reads, so frames are read exactly
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+        message_size = _decode_message_size(header, max_message_size, peer_name)
+        message_as_bytes = await reader.readexactly(message_size)
+    except asyncio.IncompleteReadError:
+        raise OSError(f"Unexpected disconnection of the {peer_name}")
+    return message_as_bytes.decode("utf-8")
+
+
+class FramedSocketReader:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        peer_name: str,
+        buffer_size: int = RECEIVE_BUFFER_SIZE,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+    ) -> None:
+        self._socket = sock
+        self._peer_name = peer_name
+        self._max_message_size = max_message_size
+
+        # [IMPORTANT] bytes are received straight into this buffer, the unread
+        # ones live in [start, end) and are moved to the front before each read
+        self._buffer = bytearray(buffer_size)
+        self._buffer_view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+
+        self._messages: deque[str] = deque()
+
+    # ============================== PRIVATE - BUFFER ============================== #
+
+    def _unread_bytes_amount(self) -> int:
+        return self._end - self._start
+
+    def _compact_buffer(self) -> None:
+        unread_bytes_amount = self._unread_bytes_amount()
+        if self._start > 0 and unread_bytes_amount > 0:
+            self._buffer_view[:unread_bytes_amount] = self._buffer_view[
+                self._start : self._end
+            ]
+        self._start = 0
+        self._end = unread_bytes_amount
+
+    def _grow_buffer_to_fit(self, frame_size: int) -> None:
+        if frame_size <= len(self._buffer):
+            return
+
+        buffer = bytearray(max(frame_size, 2 * len(self._buffer)))
+        buffer[: self._end] = self._buffer_view[: self._end]
+        self._buffer_view.release()
+        self._buffer = buffer
+        self._buffer_view = memoryview(self._buffer)
+
+    # ============================== PRIVATE - RECEIVE ============================== #
+
+    def _pending_frame_size(self) -> int:
+        if self._unread_bytes_amount() < FRAME_HEADER.size:
+            return FRAME_HEADER.size
+        header_end = self._start + FRAME_HEADER.size
+        message_size = _decode_message_size(
+            self._buffer_view[self._start : header_end],
+            self._max_message_size,
+            self._peer_name,
+        )
+        return FRAME_HEADER.size + message_size
+
+    def _parse_buffered_frames(self) -> None:
+        while self._unread_bytes_amount() >= FRAME_HEADER.size:
+            frame_size = self._pending_frame_size()
+            if frame_size > self._unread_bytes_amount():
+                return
+
+            message_start = self._start + FRAME_HEADER.size
+            frame_end = self._start + frame_size
+            self._messages.append(
+                str(self._buffer_view[message_start:frame_end], "utf-8")
+            )
+            self._start = frame_end
+
+    def _receive_into_buffer(self) -> None:
+        self._compact_buffer()
+        self._grow_buffer_to_fit(self._pending_frame_size())
+
+        received_bytes_amount = self._socket.recv_into(self._buffer_view[self._end :])
+        if received_bytes_amount == 0:
+            raise OSError(f"Unexpected disconnection of the {self._peer_name}")
+        self._end += received_bytes_amount
+
+    # ============================== PUBLIC ============================== #
+
+    def receive_message(self) -> str:
+        while len(self._messages) == 0:
+            self._receive_into_buffer()
+            self._parse_buffered_frames()
+        return self._messages.popleft()
@@ -1,7 +1,7 @@
 import logging
 import os
 from configparser import ConfigParser
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 
 def init_log(logging_level: str) -> None:
@@ -22,18 +22,26 @@ def init_log(logging_level: str) -> None:
     pika_logger.setLevel(logging.WARNING)
 
 
-def init_config(env_vars: List[str]) -> Dict:
+def init_config(
+    env_vars: List[str], default_values: Optional[Dict[str, str]] = None
+) -> Dict:
     """
     Get environment variables as a dictionary
 
     :param env_vars: list of environment variables to be collected
+    :param default_values: values for the optional environment variables,
+        used when they are not set (or set empty)
     :return: dictionary with the collected environment variables
     """
 
+    default_values = default_values or {}
     try:
         config_parser = ConfigParser(os.environ)
         config_params = {}
         for env_var in env_vars:
+            if env_var in default_values:
+                config_params[env_var] = os.getenv(env_var) or default_values[env_var]
+                continue
             config_params[env_var] = os.getenv(
                 env_var, config_parser["DEFAULT"][env_var]
             )
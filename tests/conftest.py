@@ -0,0 +1,28 @@
+from typing import Callable, Optional
+
+
+class ProducerSpy:
+    def __init__(self, session_id: str = "", pending_messages_amount: int = 0) -> None:
+        self.session_id = session_id
+        self.sent_messages: list[str] = []
+        self.flushes_amount = 0
+        self.closed = False
+        self.depth_reads_amount = 0
+        self._pending_messages_amount = pending_messages_amount
+        self.call_later: Optional[Callable] = None
+
+    def send(self, message: str) -> None:
+        self.sent_messages.append(message)
+
+    def flush(self) -> None:
+        self.flushes_amount += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+    def schedule_flushes_using(self, call_later: Callable) -> None:
+        self.call_later = call_later
+
+    def pending_messages_amount(self) -> int:
+        self.depth_reads_amount += 1
+        return self._pending_messages_amount
@@ -0,0 +1,78 @@
+import pytest
+
+from shared import communication_protocol
+from shared.batch import Batch
+
+
+class TestBatch:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _rows(self) -> list[dict[str, str]]:
+        return [
+            {"item_id": "1", "quantity": "2", "subtotal": "9.0"},
+            {"item_id": "2", "quantity": "1", "subtotal": "4.5"},
+            {"item_id": "3", "quantity": "5", "subtotal": "22.5"},
+        ]
+
+    # ============================== TESTS - TRANSFORMING ============================== #
+
+    def test_rows_round_trip(self) -> None:
+        batch = Batch.from_rows(self._rows())
+
+        assert len(batch) == 3
+        assert batch.column("quantity") == ["2", "1", "5"]
+        assert list(batch.rows()) == self._rows()
+
+    def test_project_keeps_columns_in_requested_order(self) -> None:
+        batch = Batch.from_rows(self._rows()).project(["subtotal", "item_id"])
+
+        assert batch.columns() == ["subtotal", "item_id"]
+        assert list(batch.rows())[0] == {"subtotal": "9.0", "item_id": "1"}
+
+    def test_select_by_mask(self) -> None:
+        batch = Batch.from_rows(self._rows()).select([True, False, True])
+
+        assert batch.column("item_id") == ["1", "3"]
+
+    def test_append_column(self) -> None:
+        batch = Batch.from_rows(self._rows())
+        batch.append_column("year_month_created_at", ["2024-01"] * 3)
+
+        assert batch.columns()[-1] == "year_month_created_at"
+        assert list(batch.rows())[2]["year_month_created_at"] == "2024-01"
+
+    def test_empty_batch_has_empty_columns(self) -> None:
+        batch = Batch.from_rows([])
+
+        assert batch.column("item_id") == []
+        assert batch.project(["item_id", "quantity"]).columns() == [
+            "item_id",
+            "quantity",
+        ]
+        assert batch.project(["item_id"]).is_empty()
+
+    def test_select_with_wrong_mask_length_fails(self) -> None:
+        with pytest.raises(ValueError):
+            Batch.from_rows(self._rows()).select([True])
+
+    # ============================== TESTS - ENCODING ============================== #
+
+    def test_batch_message_round_trip(self) -> None:
+        batch = Batch.from_rows(self._rows())
+        message = communication_protocol.encode_batch(
+            communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE, "session", batch
+        )
+
+        assert communication_protocol.decode_batch_message(message) == self._rows()
+        assert list(communication_protocol.decode_batch(message).rows()) == self._rows()
+
+    def test_text_batch_message_is_decoded_as_columns(self) -> None:
+        message = communication_protocol.encode_text_batch_message(
+            communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE,
+            "session",
+            self._rows(),
+        )
+
+        batch = communication_protocol.decode_batch(message)
+        assert batch.column("subtotal") == ["9.0", "4.5", "22.5"]
@@ -0,0 +1,96 @@
+import pytest
+
+from server import session_ids
+from server.client_session import ClientSession
+from shared import communication_protocol, constants
+
+
+class TestClientSession:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _output_builders_data(self) -> dict:
+        return {
+            data_type: {
+                constants.QUEUE_PREFIX: constants.QRS_QUEUE_PREFIX,
+                constants.WORKERS_AMOUNT: 2,
+            }
+            for data_type in [
+                constants.QUERY_RESULT_1X,
+                constants.QUERY_RESULT_21,
+                constants.QUERY_RESULT_22,
+                constants.QUERY_RESULT_3X,
+                constants.QUERY_RESULT_4X,
+            ]
+        }
+
+    def _client_session(self, session_key: bytes) -> ClientSession:
+        return ClientSession(session_key, self._output_builders_data())
+
+    # ============================== TESTS - HANDSHAKE ============================== #
+
+    def test_data_stream_joins_session_with_valid_session_id(self) -> None:
+        session_key = session_ids.new_session_key()
+        session_id = self._client_session(session_key).session_id()
+        data_stream_session = self._client_session(session_key)
+
+        payload = data_stream_session.accept_handshake_message(
+            communication_protocol.encode_handshake_message(
+                session_id, communication_protocol.USERS_BATCH_MSG_TYPE
+            )
+        )
+
+        assert payload == communication_protocol.USERS_BATCH_MSG_TYPE
+        assert data_stream_session.session_id() == session_id
+        assert data_stream_session.data_types() == [
+            communication_protocol.USERS_BATCH_MSG_TYPE
+        ]
+
+    def test_data_stream_with_invalid_session_id_is_rejected(self) -> None:
+        client_session = self._client_session(session_ids.new_session_key())
+
+        with pytest.raises(ValueError):
+            client_session.accept_handshake_message(
+                communication_protocol.encode_handshake_message(
+                    "0" * 64, communication_protocol.USERS_BATCH_MSG_TYPE
+                )
+            )
+
+    # ============================== TESTS - CLIENT DATA ============================== #
+
+    def test_all_data_received_after_every_eof(self) -> None:
+        client_session = self._client_session(session_ids.new_session_key())
+        client_session.accept_handshake_message(
+            communication_protocol.encode_handshake_message(
+                "client-1", communication_protocol.ALL_QUERIES
+            )
+        )
+
+        for data_type in client_session.data_types():
+            assert not client_session.all_data_received()
+            eof_message = communication_protocol.encode_eof_message(
+                client_session.session_id(), data_type
+            )
+            assert client_session.accept_client_message(eof_message) == (
+                data_type,
+                True,
+            )
+        assert client_session.all_data_received()
+
+    # ============================== TESTS - QUERY RESULTS ============================== #
+
+    def test_only_last_query_result_eof_must_be_sent(self) -> None:
+        client_session = self._client_session(session_ids.new_session_key())
+        eof_message = communication_protocol.encode_eof_message(
+            client_session.session_id(), constants.QUERY_RESULT_1X
+        )
+
+        assert client_session.accept_output_builder_message(eof_message) == (
+            communication_protocol.EOF,
+            False,
+        )
+        assert client_session.accept_output_builder_message(eof_message) == (
+            communication_protocol.EOF,
+            True,
+        )
+        assert not client_session.all_query_results_received()
@@ -0,0 +1,112 @@
+import time
+from typing import Callable
+
+from tests.conftest import ProducerSpy
+
+from controllers.shared.coalescing_producer import CoalescingProducer
+from shared import communication_protocol
+
+
+class TestCoalescingProducer:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _producer(
+        self, max_rows: int = 4, max_bytes: int = 1 << 20, max_seconds: float = 60.0
+    ) -> CoalescingProducer:
+        self._spy = ProducerSpy()
+        return CoalescingProducer(self._spy, max_rows, max_bytes, max_seconds)  # type: ignore
+
+    def _message(self, session_id: str, *transaction_ids: str) -> str:
+        return communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            session_id,
+            [{"transaction_id": transaction_id} for transaction_id in transaction_ids],
+        )
+
+    def _sent_transaction_ids(self) -> list[list[str]]:
+        return [
+            [
+                row["transaction_id"]
+                for row in communication_protocol.decode_batch_message(m)
+            ]
+            for m in self._spy.sent_messages
+            if communication_protocol.get_message_type(m) != communication_protocol.EOF
+        ]
+
+    # ============================== TESTS - COALESCING ============================== #
+
+    def test_rows_are_sent_once_max_rows_is_reached(self) -> None:
+        producer = self._producer(max_rows=4)
+        producer.send(self._message("session-1", "t-1"))
+        producer.send(self._message("session-1", "t-2", "t-3"))
+        assert self._spy.sent_messages == []
+
+        producer.send(self._message("session-1", "t-4", "t-5"))
+
+        assert self._sent_transaction_ids() == [["t-1", "t-2", "t-3", "t-4", "t-5"]]
+        assert producer.average_fill() == 1.0
+
+    def test_zero_max_bytes_means_no_bytes_limit(self) -> None:
+        producer = self._producer(max_rows=2, max_bytes=0)
+        producer.send(self._message("session-1", "t-1"))
+        assert self._spy.sent_messages == []
+
+        producer.send(self._message("session-1", "t-2"))
+
+        assert self._sent_transaction_ids() == [["t-1", "t-2"]]
+        assert producer.average_fill() == 1.0
+
+    def test_sessions_are_coalesced_apart(self) -> None:
+        producer = self._producer(max_rows=2)
+        producer.send(self._message("session-1", "t-1"))
+        producer.send(self._message("session-2", "t-2"))
+        producer.send(self._message("session-1", "t-3"))
+
+        assert self._sent_transaction_ids() == [["t-1", "t-3"]]
+
+    def test_rows_are_sent_before_the_eof(self) -> None:
+        producer = self._producer()
+        producer.send(self._message("session-1", "t-1"))
+        producer.send(self._message("session-2", "t-2"))
+        eof = communication_protocol.encode_eof_message(
+            "session-1", communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
+        )
+        producer.send(eof)
+
+        assert self._sent_transaction_ids() == [["t-1"]]
+        assert self._spy.sent_messages[-1] == eof
+        assert producer.average_fill() == 0.25
+
+    def test_lingering_rows_are_sent_on_the_next_send(self) -> None:
+        producer = self._producer(max_seconds=0.05)
+        producer.send(self._message("session-1", "t-1"))
+        time.sleep(0.06)
+        producer.send(self._message("session-2", "t-2"))
+
+        assert self._sent_transaction_ids() == [["t-1"]]
+
+    def test_lingering_rows_are_sent_by_the_linger_timer(self) -> None:
+        timers: list[Callable] = []
+        producer = self._producer(max_seconds=0.05)
+        producer.schedule_flushes_using(
+            lambda _seconds, callback: timers.append(callback)
+        )
+        producer.send(self._message("session-1", "t-1"))
+        producer.send(self._message("session-2", "t-2"))
+        assert len(timers) == 1
+        assert self._spy.call_later is not None
+
+        time.sleep(0.06)
+        timers.pop()()
+
+        assert self._sent_transaction_ids() == [["t-1"], ["t-2"]]
+        assert timers == []
+
+    def test_close_sends_pending_rows(self) -> None:
+        producer = self._producer()
+        producer.send(self._message("session-1", "t-1"))
+        producer.close()
+
+        assert self._sent_transaction_ids() == [["t-1"]]
+        assert self._spy.closed
@@ -0,0 +1,70 @@
+from controllers.shared import reduce_functions
+from controllers.shared.combiner import Combiner
+from shared.batch import Batch
+
+
+class TestCombiner:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _combiner(self) -> Combiner:
+        return Combiner(
+            ["item_id", "year_month_created_at"],
+            {
+                "sellings_qty": reduce_functions.sum_quantity,
+                "profit_sum": reduce_functions.sum_subtotal,
+            },
+        )
+
+    def _batch(self) -> Batch:
+        return Batch.from_rows(
+            [
+                {
+                    "item_id": "1",
+                    "quantity": "2",
+                    "subtotal": "9.0",
+                    "year_month_created_at": "2024-01",
+                },
+                {
+                    "item_id": "2",
+                    "quantity": "1",
+                    "subtotal": "4.5",
+                    "year_month_created_at": "2024-01",
+                },
+                {
+                    "item_id": "1",
+                    "quantity": "3",
+                    "subtotal": "13.5",
+                    "year_month_created_at": "2024-01",
+                },
+                {
+                    "item_id": "",
+                    "quantity": "1",
+                    "subtotal": "4.5",
+                    "year_month_created_at": "2024-01",
+                },
+            ]
+        )
+
+    # ============================== TESTS - COMBINING ============================== #
+
+    def test_combine_aggregates_by_keys(self) -> None:
+        combined_batch = self._combiner().combine(self._batch())
+
+        assert list(combined_batch.rows()) == [
+            {
+                "item_id": "1",
+                "year_month_created_at": "2024-01",
+                "sellings_qty": "5.0",
+                "profit_sum": "22.5",
+            },
+            {
+                "item_id": "2",
+                "year_month_created_at": "2024-01",
+                "sellings_qty": "1.0",
+                "profit_sum": "4.5",
+            },
+        ]
+
+    def test_combine_empty_batch(self) -> None:
+        assert self._combiner().combine(Batch.from_rows([])).is_empty()
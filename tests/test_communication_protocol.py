@@ -0,0 +1,174 @@
+import pytest
+
+from shared import communication_protocol
+
+
+class TestCommunicationProtocol:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _session_id(self) -> str:
+        return "0123456789abcdef"
+
+    def _batch(self) -> list[dict[str, str]]:
+        return [
+            {"transaction_id": "t-1", "final_amount": "75.5"},
+            {"transaction_id": "t-2", "final_amount": ""},
+        ]
+
+    # ============================== TESTS - BATCH ENCODING ============================== #
+
+    def test_batch_message_round_trip(self) -> None:
+        message = communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            self._batch(),
+        )
+
+        assert communication_protocol.get_message_type(message) == "TRN"
+        assert (
+            communication_protocol.get_message_session_id(message) == self._session_id()
+        )
+        assert communication_protocol.decode_batch_message(message) == self._batch()
+
+    def test_batch_message_round_trip_with_delimiters_in_values(self) -> None:
+        batch = [{"item_name": 'a,b;c:d]e{f}g"h#1|2[3', "item_id": "1"}]
+        message = communication_protocol.encode_batch_message(
+            communication_protocol.MENU_ITEMS_BATCH_MSG_TYPE,
+            self._session_id(),
+            batch,
+        )
+
+        assert communication_protocol.decode_batch_message(message) == batch
+
+    def test_batch_message_names_columns_once(self) -> None:
+        message = communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            self._batch(),
+        )
+
+        assert message.count("transaction_id") == 1
+
+    def test_empty_batch_message_has_no_payload(self) -> None:
+        message = communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            [],
+        )
+
+        assert communication_protocol.message_without_payload(message)
+        assert communication_protocol.decode_batch_message(message) == []
+
+    def test_batch_message_rejects_rows_with_other_columns(self) -> None:
+        for row in [
+            {"transaction_id": "t-2"},
+            {"transaction_id": "t-2", "final_amount": "1", "store_id": "3"},
+            {"transaction_id": "t-2", "store_id": "3"},
+        ]:
+            with pytest.raises(ValueError):
+                communication_protocol.encode_batch_message(
+                    communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+                    self._session_id(),
+                    [{"transaction_id": "t-1", "final_amount": "75.5"}, row],
+                )
+
+    def test_text_batch_message_is_decoded_by_fallback(self) -> None:
+        message = communication_protocol.encode_text_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            self._batch(),
+        )
+
+        assert communication_protocol.decode_batch_message(message) == self._batch()
+
+    # ============================== TESTS - BATCH PROJECTION ============================== #
+
+    def test_project_batch_message(self) -> None:
+        message = communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            self._batch(),
+        )
+
+        projected_message = communication_protocol.project_batch_message(
+            message, ["final_amount"]
+        )
+
+        assert communication_protocol.get_message_type(projected_message) == "TRN"
+        assert communication_protocol.decode_batch_message(projected_message) == [
+            {"final_amount": "75.5"},
+            {"final_amount": ""},
+        ]
+
+    def test_project_text_batch_message(self) -> None:
+        message = communication_protocol.encode_text_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            self._batch(),
+        )
+
+        projected_message = communication_protocol.project_batch_message(
+            message, ["final_amount", "transaction_id"]
+        )
+
+        assert communication_protocol.decode_batch_message(projected_message) == [
+            {"final_amount": "75.5", "transaction_id": "t-1"},
+            {"final_amount": "", "transaction_id": "t-2"},
+        ]
+
+    def test_project_empty_batch_message(self) -> None:
+        message = communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            [],
+        )
+
+        projected_message = communication_protocol.project_batch_message(
+            message, ["final_amount"]
+        )
+
+        assert projected_message == message
+        assert communication_protocol.decode_batch_message(projected_message) == []
+
+    # ============================== TESTS - MERGING ============================== #
+
+    def test_batch_shape(self) -> None:
+        message = communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            self._batch(),
+        )
+        other_message = communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            self._batch()[:1],
+        )
+
+        columns, rows_amount = communication_protocol.get_batch_shape(message)
+        other_columns, other_rows_amount = communication_protocol.get_batch_shape(
+            other_message
+        )
+        assert (rows_amount, other_rows_amount) == (2, 1)
+        assert columns == other_columns
+
+    def test_merge_batch_messages(self) -> None:
+        messages = [
+            communication_protocol.encode_batch_message(
+                communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+                self._session_id(),
+                batch,
+            )
+            for batch in [
+                self._batch(),
+                [{"transaction_id": "t-3", "final_amount": "1"}],
+            ]
+        ]
+
+        merged_message = communication_protocol.merge_batch_messages(messages)
+
+        assert communication_protocol.get_message_type(merged_message) == "TRN"
+        assert communication_protocol.decode_batch_message(merged_message) == [
+            *self._batch(),
+            {"transaction_id": "t-3", "final_amount": "1"},
+        ]
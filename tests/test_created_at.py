@@ -0,0 +1,38 @@
+from shared import created_at
+
+
+class TestCreatedAt:
+
+    # ============================== TESTS - DERIVED COLUMNS ============================== #
+
+    def test_derived_columns_of_valid_timestamps(self) -> None:
+        columns = created_at.derived_columns_of(
+            ["2024-03-01 07:15:00", "2025-11-30 23:59:59"],
+            [
+                created_at.YEAR,
+                created_at.HOUR,
+                created_at.YEAR_HALF,
+                created_at.YEAR_MONTH,
+            ],
+        )
+
+        assert columns == [
+            ["2024", "2025"],
+            ["7", "23"],
+            ["2024-H1", "2025-H2"],
+            ["2024-03", "2025-11"],
+        ]
+
+    def test_only_requested_columns_are_derived_in_order(self) -> None:
+        columns = created_at.derived_columns_of(
+            ["2024-07-01 10:00:00"], [created_at.YEAR_MONTH, created_at.YEAR]
+        )
+
+        assert columns == [["2024-07"], ["2024"]]
+
+    def test_invalid_timestamps_derive_empty_values(self) -> None:
+        columns = created_at.derived_columns_of(
+            ["", "not a date"], [created_at.YEAR, created_at.HOUR]
+        )
+
+        assert columns == [["", ""], ["", ""]]
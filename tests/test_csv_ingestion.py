@@ -0,0 +1,73 @@
+from client.csv_ingestion import CsvIngestion
+from shared import communication_protocol
+
+SESSION_ID = "0123456789abcdef0123456789abcdef"
+
+
+class TestCsvIngestion:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _write_csv(self, tmp_path, name: str, rows_amount: int):
+        path = tmp_path / name
+        lines = ["transaction_id,store_id,final_amount\n"]
+        lines += [f"t-{name}-{i},{i % 10},{i}.5\r\n" for i in range(rows_amount)]
+        path.write_text("".join(lines))
+        return path
+
+    def _decoded_rows(self, messages: list[str]) -> list[dict[str, str]]:
+        return [
+            row
+            for message in messages
+            for row in communication_protocol.decode_transactions_batch_message(message)
+        ]
+
+    def _encoded_batches(self, csv_ingestion: CsvIngestion, paths) -> list[str]:
+        try:
+            return list(
+                csv_ingestion.encoded_batches_of(
+                    paths,
+                    communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+                    SESSION_ID,
+                )
+            )
+        finally:
+            csv_ingestion.close()
+
+    # ============================== TESTS - BATCHING ============================== #
+
+    def test_batches_are_cut_by_rows_and_by_bytes(self, tmp_path) -> None:
+        path = self._write_csv(tmp_path, "a.csv", 25)
+
+        by_rows = self._encoded_batches(CsvIngestion(1, 10, 1_000_000), [path])
+        by_bytes = self._encoded_batches(CsvIngestion(1, 10, 40), [path])
+
+        assert len(by_rows) == 3
+        assert len(by_bytes) == 9
+        assert self._decoded_rows(by_bytes) == self._decoded_rows(by_rows)
+        assert self._decoded_rows(by_rows)[24] == {
+            "transaction_id": "t-a.csv-24",
+            "store_id": "4",
+            "final_amount": "24.5",
+        }
+
+    def test_workers_keep_the_rows_order_across_segments(self, tmp_path) -> None:
+        paths = [
+            self._write_csv(tmp_path, "a.csv", 500),
+            self._write_csv(tmp_path, "b.csv", 300),
+        ]
+
+        sequential = self._encoded_batches(
+            CsvIngestion(1, 64, 1_000_000, segment_size=512), paths
+        )
+        parallel = self._encoded_batches(
+            CsvIngestion(2, 64, 1_000_000, segment_size=512), paths
+        )
+
+        rows = self._decoded_rows(parallel)
+        assert len(rows) == 800
+        assert rows == self._decoded_rows(sequential)
+        assert [row["transaction_id"] for row in rows[499:501]] == [
+            "t-a.csv-499",
+            "t-b.csv-0",
+        ]
@@ -0,0 +1,69 @@
+from tests.conftest import ProducerSpy
+
+from middleware.dispatcher import (
+    LeastLoadedDispatcher,
+    RoundRobinDispatcher,
+    build_dispatcher,
+)
+
+
+class TestDispatcher:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _sent_messages_amounts(self, producers: list[ProducerSpy]) -> list[int]:
+        return [len(producer.sent_messages) for producer in producers]
+
+    # ============================== TESTS - ROUND ROBIN ============================== #
+
+    def test_round_robin_rotates_through_every_producer(self) -> None:
+        producers = [ProducerSpy(), ProducerSpy(), ProducerSpy()]
+        dispatcher = RoundRobinDispatcher(producers)  # type: ignore
+
+        for message in ["a", "b", "c", "d"]:
+            dispatcher.send(message)
+
+        assert [producer.sent_messages for producer in producers] == [
+            ["a", "d"],
+            ["b"],
+            ["c"],
+        ]
+
+    def test_round_robin_is_used_without_dispatching_config(self) -> None:
+        dispatcher = build_dispatcher([ProducerSpy()])  # type: ignore
+
+        assert isinstance(dispatcher, RoundRobinDispatcher)
+
+    # ============================== TESTS - LEAST LOADED ============================== #
+
+    def test_least_loaded_fills_the_shortest_queues_first(self) -> None:
+        producers = [
+            ProducerSpy(pending_messages_amount=5),
+            ProducerSpy(pending_messages_amount=0),
+            ProducerSpy(pending_messages_amount=2),
+        ]
+        dispatcher = LeastLoadedDispatcher(producers, refresh_every_messages=100)  # type: ignore
+
+        for _ in range(6):
+            dispatcher.send("message")
+
+        assert self._sent_messages_amounts(producers) == [0, 4, 2]
+        assert dispatcher.estimated_depths() == [5, 4, 4]
+
+    def test_least_loaded_is_round_robin_with_equal_depths(self) -> None:
+        producers = [ProducerSpy(), ProducerSpy(), ProducerSpy()]
+        dispatcher = LeastLoadedDispatcher(producers, refresh_every_messages=1)  # type: ignore
+
+        for _ in range(6):
+            dispatcher.send("message")
+
+        assert self._sent_messages_amounts(producers) == [2, 2, 2]
+
+    def test_least_loaded_reads_depths_every_some_messages(self) -> None:
+        producers = [ProducerSpy(), ProducerSpy()]
+        dispatcher = LeastLoadedDispatcher(producers, refresh_every_messages=4)  # type: ignore
+
+        for _ in range(9):
+            dispatcher.send("message")
+
+        assert [producer.depth_reads_amount for producer in producers] == [3, 3]
@@ -0,0 +1,66 @@
+import socket
+
+import pytest
+
+from shared import framed_socket
+
+
+class TestFramedSocket:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _messages(self) -> list[str]:
+        return [
+            "HANDSHAKE;client-1[ALL_QUERIES]",
+            "TRANSACTIONS;session-1[created_at]2024-07-01 07:00:00]",
+            "EOF;session-1[TRANSACTIONS]",
+            "MENU_ITEMS;session-1[Café con leche]",
+        ]
+
+    # ============================== TESTS - RECEIVING ============================== #
+
+    def test_several_frames_received_in_one_read_are_split(self) -> None:
+        sender_socket, receiver_socket = socket.socketpair()
+        with sender_socket, receiver_socket:
+            sender_socket.sendall(
+                b"".join(framed_socket.encode_frame(m) for m in self._messages())
+            )
+            reader = framed_socket.FramedSocketReader(receiver_socket, "client")
+
+            received_messages = [reader.receive_message() for _ in self._messages()]
+
+        assert received_messages == self._messages()
+
+    def test_frames_bigger_than_the_buffer_are_received_whole(self) -> None:
+        sender_socket, receiver_socket = socket.socketpair()
+        message = "TRANSACTIONS;session-1[" + "x" * 1000 + "]"
+        with sender_socket, receiver_socket:
+            framed_socket.send_framed_message(sender_socket, message)
+            framed_socket.send_framed_message(sender_socket, message)
+            reader = framed_socket.FramedSocketReader(
+                receiver_socket, "client", buffer_size=16
+            )
+
+            assert reader.receive_message() == message
+            assert reader.receive_message() == message
+
+    def test_disconnection_in_the_middle_of_a_frame_raises(self) -> None:
+        sender_socket, receiver_socket = socket.socketpair()
+        with receiver_socket:
+            sender_socket.sendall(framed_socket.encode_frame(self._messages()[0])[:10])
+            sender_socket.close()
+            reader = framed_socket.FramedSocketReader(receiver_socket, "server")
+
+            with pytest.raises(OSError, match="disconnection of the server"):
+                reader.receive_message()
+
+    def test_frames_bigger_than_the_maximum_are_rejected(self) -> None:
+        sender_socket, receiver_socket = socket.socketpair()
+        with sender_socket, receiver_socket:
+            framed_socket.send_framed_message(sender_socket, "x" * 100)
+            reader = framed_socket.FramedSocketReader(
+                receiver_socket, "client", max_message_size=64
+            )
+
+            with pytest.raises(OSError, match="exceeds the maximum"):
+                reader.receive_message()
@@ -0,0 +1,137 @@
+import tempfile
+import threading
+from typing import Callable, Union
+
+from tests.conftest import ProducerSpy
+
+from controllers.joiners.shared import join_session
+from controllers.joiners.shared.base_data_index import BaseDataIndex
+from controllers.joiners.shared.join_session import JoinSession
+from controllers.joiners.shared.stream_data_buffer import StreamDataBuffer
+from controllers.joiners.shared.stream_data_handler import StreamDataHandler
+from shared import communication_protocol
+
+SESSION_ID = "0123456789abcdef0123456789abcdef"
+
+
+class ConsumerSpy:
+    def __init__(self) -> None:
+        # received messages and callbacks scheduled from other threads, in order
+        self.deliveries: list[Union[bytes, Callable]] = []
+        self.sent_messages: list[str] = []
+
+    def start_consuming(self, on_message_callback: Callable) -> None:
+        while len(self.deliveries) > 0:
+            delivery = self.deliveries.pop(0)
+            if isinstance(delivery, bytes):
+                on_message_callback(delivery)
+            else:
+                delivery()
+
+    def stop_consuming(self) -> None:
+        pass
+
+    def schedule_callback(self, callback: Callable) -> None:
+        self.deliveries.append(callback)
+
+    def send(self, message: str) -> None:
+        self.sent_messages.append(message)
+
+    def delete(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class TestJoinSession:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _stream_data_handler(self, prev_controllers_amount: int) -> StreamDataHandler:
+        self._consumer = ConsumerSpy()
+        self._producer = ProducerSpy()
+        self._base_data_by_session_id: dict[str, BaseDataIndex] = {}
+        self._all_base_data_received: dict[str, bool] = {}
+        return StreamDataHandler(
+            controller_id=0,
+            rabbitmq_host="",
+            consumers_config={
+                "stream_data_prev_controllers_amount": prev_controllers_amount,
+                "stream_data_buffering_config": {
+                    "max_bytes_in_memory": 0,
+                    "spill_dir": tempfile.gettempdir(),
+                },
+            },
+            producers_config={"next_controllers_amount": 1},
+            build_mom_consumer=lambda *_: self._consumer,
+            build_mom_producer=lambda *_: self._producer,
+            base_data_by_session_id=self._base_data_by_session_id,
+            base_data_by_session_id_lock=threading.Lock(),
+            all_base_data_received=self._all_base_data_received,
+            all_base_data_received_lock=threading.Lock(),
+            is_stopped=threading.Event(),
+        )
+
+    def _join_session(self, prev_controllers_amount: int) -> JoinSession:
+        stream_data_buffer = StreamDataBuffer(SESSION_ID, 0, tempfile.gettempdir())
+        return JoinSession(SESSION_ID, prev_controllers_amount, stream_data_buffer)
+
+    def _receive_all_base_data(self, stream_data_handler: StreamDataHandler) -> None:
+        # what the base data thread does once all its EOFs are received
+        base_data_index = BaseDataIndex("store_id", int)
+        base_data_index.add({"store_id": "1", "store_name": "Central"})
+        self._base_data_by_session_id[SESSION_ID] = base_data_index
+        self._all_base_data_received[SESSION_ID] = True
+        stream_data_handler.schedule_all_base_data_received(SESSION_ID)
+
+    def _stream_batch_message(self) -> bytes:
+        return communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            SESSION_ID,
+            [{"store_id": "1", "final_amount": "10.0"}],
+        ).encode("utf-8")
+
+    def _eof_message(self) -> bytes:
+        return communication_protocol.encode_eof_message(
+            SESSION_ID, communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
+        ).encode("utf-8")
+
+    # ============================== TESTS - STATES ============================== #
+
+    def test_session_finishes_when_the_last_side_is_received(self) -> None:
+        base_data_last = self._join_session(prev_controllers_amount=2)
+        base_data_last.eof_received("eof")
+        assert not base_data_last.all_eofs_received()
+        base_data_last.eof_received("eof")
+        assert base_data_last.state() == join_session.RECEIVING_BASE_DATA
+        base_data_last.base_data_received()
+
+        stream_data_last = self._join_session(prev_controllers_amount=1)
+        stream_data_last.base_data_received()
+        assert stream_data_last.state() == join_session.RECEIVING_STREAM_DATA
+        stream_data_last.eof_received("eof")
+
+        assert base_data_last.is_finished()
+        assert stream_data_last.is_finished()
+
+    # ============================== TESTS - STREAM DATA HANDLER ============================== #
+
+    def test_eofs_received_before_base_data_are_not_republished(self) -> None:
+        stream_data_handler = self._stream_data_handler(prev_controllers_amount=1)
+        self._consumer.deliveries = [self._stream_batch_message(), self._eof_message()]
+        self._consumer.deliveries.append(
+            lambda: self._receive_all_base_data(stream_data_handler)
+        )
+
+        stream_data_handler.run()
+
+        assert self._consumer.sent_messages == []
+        joined_message, eof_message = self._producer.sent_messages
+        assert communication_protocol.decode_batch_message(joined_message) == [
+            {"store_id": "1", "final_amount": "10.0", "store_name": "Central"}
+        ]
+        assert communication_protocol.get_message_type(eof_message) == (
+            communication_protocol.EOF
+        )
+        assert self._all_base_data_received == {}
@@ -0,0 +1,109 @@
+from controllers.shared.partitioner import (
+    ConsistentHashStrategy,
+    HotKeySplittingStrategy,
+    ModuloStrategy,
+    Partitioner,
+)
+
+
+class TestPartitioner:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _rows(self, *store_ids: str) -> list[dict[str, str]]:
+        return [{"store_id": store_id} for store_id in store_ids]
+
+    def _store_ids_by_shard(
+        self, rows_by_shard: dict[int, list[dict[str, str]]]
+    ) -> dict[int, list[str]]:
+        return {
+            shard: [row["store_id"] for row in rows]
+            for shard, rows in rows_by_shard.items()
+        }
+
+    # ============================== TESTS - MODULO ============================== #
+
+    def test_integer_keys_are_normalized_and_sent_by_modulo(self) -> None:
+        partitioner = Partitioner("store_id", ModuloStrategy(3), 3)
+
+        rows_by_shard = partitioner.partition(self._rows("3.0", "4", "7.0", "5"))
+
+        assert self._store_ids_by_shard(rows_by_shard) == {
+            0: ["3"],
+            1: ["4", "7"],
+            2: ["5"],
+        }
+
+    def test_text_keys_are_sent_by_their_hash(self) -> None:
+        partitioner = Partitioner(
+            "store_id", ModuloStrategy(3), 3, normalize_integer_keys=False
+        )
+
+        first_rows_by_shard = partitioner.partition(self._rows("2024-01"))
+        second_rows_by_shard = partitioner.partition(self._rows("2024-01"))
+
+        assert first_rows_by_shard.keys() == second_rows_by_shard.keys()
+
+    # ============================== TESTS - EMPTY KEYS ============================== #
+
+    def test_empty_keys_are_sent_to_the_first_shard(self) -> None:
+        partitioner = Partitioner("store_id", ModuloStrategy(3), 3)
+
+        rows_by_shard = partitioner.partition(self._rows("", "2"))
+
+        assert self._store_ids_by_shard(rows_by_shard) == {0: [""], 2: ["2"]}
+
+    def test_empty_keys_can_be_skipped(self) -> None:
+        partitioner = Partitioner(
+            "store_id", ModuloStrategy(3), 3, skip_empty_keys=True
+        )
+
+        rows_by_shard = partitioner.partition(self._rows("", "2"))
+
+        assert self._store_ids_by_shard(rows_by_shard) == {2: ["2"]}
+
+    # ============================== TESTS - STRATEGIES ============================== #
+
+    def test_consistent_hash_moves_few_keys_when_a_shard_is_added(self) -> None:
+        keys = [str(key) for key in range(2_000)]
+        four_shards = ConsistentHashStrategy(4)
+        five_shards = ConsistentHashStrategy(5)
+
+        moved_keys = [
+            key
+            for key in keys
+            if four_shards.shard_of(key, {}) != five_shards.shard_of(key, {})
+        ]
+
+        # modulo would move about 4/5 of them
+        assert len(moved_keys) < len(keys) / 2
+
+    def test_hot_keys_are_split_by_the_split_column(self) -> None:
+        strategy = HotKeySplittingStrategy(
+            ModuloStrategy(4), 4, "year_half_created_at", 2, hot_keys={"1"}
+        )
+        partitioner = Partitioner("store_id", strategy, 4)
+        rows = [
+            {"store_id": store_id, "year_half_created_at": year_half}
+            for store_id in ("1", "2")
+            for year_half in ("2024-H1", "2024-H2")
+        ]
+
+        rows_by_shard = partitioner.partition(rows)
+
+        shards_by_store_id: dict[str, set[int]] = {}
+        for shard, shard_rows in rows_by_shard.items():
+            for row in shard_rows:
+                shards_by_store_id.setdefault(row["store_id"], set()).add(shard)
+        assert len(shards_by_store_id["1"]) == 2
+        assert shards_by_store_id["2"] == {2}
+
+    # ============================== TESTS - SKEW ============================== #
+
+    def test_rows_are_counted_by_shard(self) -> None:
+        partitioner = Partitioner("store_id", ModuloStrategy(2), 2)
+
+        partitioner.partition(self._rows("1", "1", "1", "2"))
+
+        assert partitioner.rows_amount_by_shard() == [1, 3]
+        assert partitioner.skew() == 1.5
@@ -0,0 +1,46 @@
+from controllers.filters.shared.filter import Predicate, PredicateChain
+from shared.batch import Batch
+
+
+class TestPredicateChain:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _batch(self) -> Batch:
+        return Batch.from_rows(
+            [
+                {"year_created_at": "2024", "final_amount": "80.0"},
+                {"year_created_at": "2023", "final_amount": "90.0"},
+                {"year_created_at": "2025", "final_amount": "10.0"},
+                {"year_created_at": "2025", "final_amount": ""},
+            ]
+        )
+
+    # ============================== TESTS - FILTERING ============================== #
+
+    def test_rows_must_satisfy_every_predicate(self) -> None:
+        chain = PredicateChain(
+            [
+                Predicate.value_in("year_created_at", {"2024", "2025"}),
+                Predicate.at_least("final_amount", 75.0),
+            ]
+        )
+
+        assert chain.inclusion_mask(self._batch()) == [True, False, False, False]
+
+    def test_invalid_numbers_do_not_satisfy_at_least(self) -> None:
+        chain = PredicateChain([Predicate.at_least("final_amount", 0.0)])
+
+        assert chain.inclusion_mask(self._batch()) == [True, True, True, False]
+
+    # ============================== TESTS - ORDERING ============================== #
+
+    def test_most_selective_predicate_runs_first(self) -> None:
+        years_predicate = Predicate.value_in("year_created_at", {"2024", "2025"})
+        amount_predicate = Predicate.at_least("final_amount", 75.0)
+        chain = PredicateChain([years_predicate, amount_predicate])
+
+        for _ in range(3):
+            chain.inclusion_mask(self._batch())
+
+        assert chain.predicates() == [amount_predicate, years_predicate]
@@ -0,0 +1,50 @@
+from client.query_result_sink import build_query_result_sink
+
+
+class TestQueryResultSink:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _batch(self) -> list[dict[str, str]]:
+        return [
+            {"transaction_id": "t-1", "final_amount": "75.5"},
+            {"transaction_id": "t-2", "final_amount": "80.0"},
+        ]
+
+    # ============================== TESTS - WRITING ============================== #
+
+    def test_text_sink_keeps_the_previous_result_format(self, tmp_path) -> None:
+        sink = build_query_result_sink("txt", tmp_path / "Q1X_result", 0.0)
+        sink.write_batch(self._batch())
+        sink.write_batch(self._batch()[:1])
+        sink.close()
+
+        assert sink.path().name == "Q1X_result.txt"
+        assert sink.path().read_text() == "t-1,75.5\nt-2,80.0\nt-1,75.5\n"
+        assert sink.rows_amount() == 3
+
+    def test_csv_sink_writes_a_header(self, tmp_path) -> None:
+        sink = build_query_result_sink("csv", tmp_path / "Q1X_result", 0.0)
+        sink.write_batch(self._batch())
+        sink.close()
+
+        assert sink.path().read_text().splitlines() == [
+            "transaction_id,final_amount",
+            "t-1,75.5",
+            "t-2,80.0",
+        ]
+
+    def test_jsonl_sink_writes_one_object_per_row(self, tmp_path) -> None:
+        sink = build_query_result_sink("jsonl", tmp_path / "Q1X_result", 0.0)
+        sink.write_batch(self._batch())
+        sink.close()
+
+        assert sink.path().read_text().splitlines()[1] == (
+            '{"transaction_id": "t-2", "final_amount": "80.0"}'
+        )
+
+    def test_sink_without_rows_creates_no_file(self, tmp_path) -> None:
+        sink = build_query_result_sink("txt", tmp_path / "Q1X_result", 0.0)
+        sink.close()
+
+        assert not sink.path().exists()
@@ -3,6 +3,7 @@ import time
 
 import pytest
 
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import (
     MessageMiddlewareCloseError,
     MessageMiddlewareDeleteError,
@@ -21,6 +22,12 @@ RABBITMQ_PASSWORD = "guest"
 
 class TestRabbitMQMessageMiddlewareExchange:
 
+    # ============================== SETUP ============================== #
+
+    def setup_method(self) -> None:
+        # the connection pool is global, so each test starts without connections
+        rabbitmq_connection_pool.reset()
+
     # ============================== PRIVATE - ACCESSING ============================== #
 
     def _rabbitmq_host(self) -> str:
@@ -0,0 +1,117 @@
+import time
+from typing import Callable
+
+from tests.conftest import ProducerSpy
+
+from middleware.rabbitmq_message_middleware_mixins import (
+    RabbitMQConsumingAcksMixin,
+    RabbitMQPublishingBufferMixin,
+)
+
+
+class ChannelSpy:
+    def __init__(self) -> None:
+        self.is_open = True
+        self.acked_delivery_tags: list[int] = []
+
+    def basic_ack(self, delivery_tag: int, multiple: bool) -> None:
+        self.acked_delivery_tags.append(delivery_tag)
+
+    def tx_commit(self) -> None:
+        pass
+
+
+class ConnectionSpy:
+    def __init__(self) -> None:
+        self.timers: list[tuple[float, Callable]] = []
+
+    def call_later(self, seconds: float, callback: Callable) -> int:
+        self.timers.append((seconds, callback))
+        return len(self.timers)
+
+    def remove_timeout(self, timer_id: int) -> None:
+        pass
+
+    def fire_timers(self) -> None:
+        timers = self.timers
+        self.timers = []
+        for _, callback in timers:
+            callback()
+
+
+class BufferedProducer(RabbitMQPublishingBufferMixin):
+    def __init__(self, buffer_max_messages: int, buffer_max_seconds: float) -> None:
+        self._channel = ChannelSpy()  # type: ignore
+        self._init_publishing_buffer(buffer_max_messages, buffer_max_seconds, False)
+        self.published_messages: list[str] = []
+
+    def _publish(self, message: str) -> None:
+        self.published_messages.append(message)
+
+    def send(self, message: str) -> None:
+        self._send(message)
+
+
+class AckingConsumer(RabbitMQConsumingAcksMixin):
+    def __init__(self, ack_every_messages: int) -> None:
+        self._connection = ConnectionSpy()  # type: ignore
+        self._channel = ChannelSpy()  # type: ignore
+        self._init_consuming_acks(0, ack_every_messages, 0.2)
+
+
+class TestRabbitMQMessageMiddlewareMixins:
+
+    # ============================== TESTS - PUBLISHING BUFFER ============================== #
+
+    def test_buffered_messages_are_published_by_the_flush_timer(self) -> None:
+        connection = ConnectionSpy()
+        producer = BufferedProducer(16, 0.05)
+        producer.schedule_flushes_using(connection.call_later)
+
+        producer.send("message-1")
+        producer.send("message-2")
+        assert producer.published_messages == []
+        assert len(connection.timers) == 1
+
+        time.sleep(0.05)
+        connection.fire_timers()
+        assert producer.published_messages == ["message-1", "message-2"]
+        assert connection.timers == []
+
+    def test_flush_timer_is_rescheduled_for_messages_buffered_after_a_flush(
+        self,
+    ) -> None:
+        connection = ConnectionSpy()
+        producer = BufferedProducer(2, 60)
+        producer.schedule_flushes_using(connection.call_later)
+
+        producer.send("message-1")
+        producer.send("message-2")
+        producer.send("message-3")
+        assert producer.published_messages == ["message-1", "message-2"]
+
+        connection.fire_timers()
+        assert producer.published_messages == ["message-1", "message-2"]
+        assert len(connection.timers) == 1
+
+    # ============================== TESTS - CONSUMING ACKS ============================== #
+
+    def test_bound_producers_are_flushed_before_acking(self) -> None:
+        consumer = AckingConsumer(2)
+        producer = ProducerSpy()
+        consumer.bind_producers([producer])  # type: ignore
+
+        consumer._register_processed_message(1)
+        assert producer.flushes_amount == 0
+        assert consumer._channel.acked_delivery_tags == []  # type: ignore
+
+        consumer._register_processed_message(2)
+        assert producer.flushes_amount == 1
+        assert consumer._channel.acked_delivery_tags == [2]  # type: ignore
+
+    def test_bound_producers_flush_on_the_consumer_connection(self) -> None:
+        consumer = AckingConsumer(2)
+        producer = ProducerSpy()
+        consumer.bind_producers([producer])  # type: ignore
+
+        assert producer.call_later == consumer._connection.call_later
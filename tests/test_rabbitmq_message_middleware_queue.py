@@ -2,6 +2,7 @@ import threading
 
 import pytest
 
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import (
     MessageMiddlewareCloseError,
     MessageMiddlewareDeleteError,
@@ -13,6 +14,12 @@ from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewa
 
 class TestRabbitMQMessageMiddlewareQueue:
 
+    # ============================== SETUP ============================== #
+
+    def setup_method(self) -> None:
+        # the connection pool is global, so each test starts without connections
+        rabbitmq_connection_pool.reset()
+
     # ============================== PRIVATE - ACCESSING ============================== #
 
     def _rabbitmq_host(self) -> str:
@@ -114,6 +121,112 @@ class TestRabbitMQMessageMiddlewareQueue:
         middleware.delete()
         middleware.close()
 
+    def test_buffered_messages_are_received_in_order_after_flush(self) -> None:
+        queue_name = "testing-buffered-publishing-queue"
+        messages_published = [f"message {i}" for i in range(5)]
+        messages_received: list[str] = []
+
+        queue_publisher = RabbitMQMessageMiddlewareQueue(
+            self._rabbitmq_host(),
+            queue_name,
+            buffer_max_messages=10,
+            buffer_max_seconds=60.0,
+            confirms=True,
+        )
+        queue_publisher.send_many(messages_published[:3])
+        queue_publisher.send(messages_published[3])
+        queue_publisher.send(messages_published[4])
+        queue_publisher.flush()
+
+        queue_consumer = RabbitMQMessageMiddlewareQueue(
+            self._rabbitmq_host(), queue_name
+        )
+
+        def on_message_callback(message_as_bytes: bytes) -> None:
+            messages_received.append(message_as_bytes.decode("utf-8"))
+            if len(messages_received) == len(messages_published):
+                queue_consumer.stop_consuming()
+
+        queue_consumer.start_consuming(on_message_callback)
+
+        assert messages_received == messages_published
+
+        queue_consumer.close()
+        queue_publisher.delete()
+        queue_publisher.close()
+
+    def test_cumulative_acks_are_sent_when_stopping_consuming(self) -> None:
+        queue_name = "testing-cumulative-acks-queue"
+        messages_published = [f"message {i}" for i in range(5)]
+        messages_received: list[str] = []
+
+        queue_publisher = RabbitMQMessageMiddlewareQueue(
+            self._rabbitmq_host(), queue_name
+        )
+        queue_publisher.send_many(messages_published)
+
+        queue_consumer = RabbitMQMessageMiddlewareQueue(
+            self._rabbitmq_host(),
+            queue_name,
+            prefetch_count=10,
+            ack_every_messages=4,
+            ack_every_seconds=60.0,
+        )
+
+        def on_message_callback(message_as_bytes: bytes) -> None:
+            messages_received.append(message_as_bytes.decode("utf-8"))
+            if len(messages_received) == len(messages_published):
+                queue_consumer.stop_consuming()
+
+        queue_consumer.start_consuming(on_message_callback)
+        queue_consumer.close()
+
+        assert messages_received == messages_published
+        assert (
+            queue_publisher._channel.queue_declare(
+                queue=queue_name, passive=True
+            ).method.message_count
+            == 0
+        )
+
+        queue_publisher.delete()
+        queue_publisher.close()
+
+    def test_middlewares_of_the_same_thread_share_one_connection(self) -> None:
+        queue_producers = [
+            RabbitMQMessageMiddlewareQueue(
+                self._rabbitmq_host(), f"testing-shared-connection-queue-{i}"
+            )
+            for i in range(5)
+        ]
+
+        assert rabbitmq_connection_pool.open_connections_amount() == 1
+
+        for queue_producer in queue_producers:
+            queue_producer.delete()
+            queue_producer.close()
+
+        assert rabbitmq_connection_pool.open_connections_amount() == 0
+
+    def test_consumers_and_publishers_do_not_share_a_connection(self) -> None:
+        queue_name = "testing-connection-roles-queue"
+        queue_consumer = RabbitMQMessageMiddlewareQueue(
+            self._rabbitmq_host(),
+            queue_name,
+            connection_role=rabbitmq_connection_pool.CONSUMER_CONNECTION_ROLE,
+        )
+        queue_producer = RabbitMQMessageMiddlewareQueue(
+            self._rabbitmq_host(), queue_name
+        )
+
+        assert rabbitmq_connection_pool.open_connections_amount() == 2
+
+        queue_producer.close()
+        queue_consumer.delete()
+        queue_consumer.close()
+
+        assert rabbitmq_connection_pool.open_connections_amount() == 0
+
     # ============================== TESTS - EXCEPTIONS ============================== #
 
     def test_error_while_creating_connection_with_wrong_host(self) -> None:
@@ -0,0 +1,113 @@
+import os
+
+from controllers.reducers.shared.reduced_data import ReducedData
+from controllers.shared import reduce_functions
+from shared.batch import Batch
+
+
+class TestReducedData:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _batch_items(self) -> list[dict[str, str]]:
+        return [
+            {"store_id": "1", "user_id": "10"},
+            {"store_id": "1", "user_id": "20"},
+            {"store_id": "1", "user_id": "10"},
+            {"store_id": "2", "user_id": "10"},
+            {"store_id": "1", "user_id": "10"},
+            {"store_id": "", "user_id": "30"},
+        ]
+
+    def _pop_all(self, reduced_data: ReducedData) -> dict[tuple, str]:
+        values_by_key = {}
+        while not reduced_data.is_empty():
+            batch_item = reduced_data.pop_next_batch_item()
+            key = (batch_item["store_id"], batch_item["user_id"])
+            values_by_key[key] = batch_item["purchases_qty"]
+        return values_by_key
+
+    # ============================== TESTS - SPILLING ============================== #
+
+    def test_spilled_runs_are_merged_with_resident_data(self, tmp_path) -> None:
+        reduced_data = ReducedData(
+            ["store_id", "user_id"], "purchases_qty", str(tmp_path)
+        )
+        batch_items = self._batch_items()
+        for i in range(0, len(batch_items), 2):
+            reduced_data.reduce_batch(
+                Batch.from_rows(batch_items[i : i + 2]), reduce_functions.count
+            )
+            reduced_data.spill()
+
+        assert reduced_data.resident_keys_amount() == 0
+        assert len(os.listdir(tmp_path)) == 3
+        assert self._pop_all(reduced_data) == {
+            ("1", "10"): "3",
+            ("1", "20"): "1",
+            ("2", "10"): "1",
+        }
+        assert os.listdir(tmp_path) == []
+
+    def test_without_spilling_nothing_is_written(self, tmp_path) -> None:
+        reduced_data = ReducedData(
+            ["store_id", "user_id"], "purchases_qty", str(tmp_path)
+        )
+        reduced_data.reduce_batch(
+            Batch.from_rows(self._batch_items()), reduce_functions.count
+        )
+
+        assert self._pop_all(reduced_data)[("1", "10")] == "3"
+        assert os.listdir(tmp_path) == []
+
+    # ============================== TESTS - BATCH REDUCING ============================== #
+
+    def test_batches_are_counted_like_batch_items(self, tmp_path) -> None:
+        reduced_data = ReducedData(
+            ["store_id", "user_id"], "purchases_qty", str(tmp_path)
+        )
+        reduced_data.reduce_batch(
+            Batch.from_rows(self._batch_items()[:3]), reduce_functions.count
+        )
+        reduced_data.reduce_batch(
+            Batch.from_rows(self._batch_items()[3:]), reduce_functions.count
+        )
+
+        assert self._pop_all(reduced_data) == {
+            ("1", "10"): "3",
+            ("1", "20"): "1",
+            ("2", "10"): "1",
+        }
+
+    def test_batches_add_up_the_value_column(self, tmp_path) -> None:
+        reduced_data = ReducedData(["store_id"], "tpv", str(tmp_path))
+        reduced_data.reduce_batch(
+            Batch(
+                ["store_id", "final_amount"],
+                [["1", "2", "1", ""], ["1.5", "2", "3", "9"]],
+            ),
+            reduce_functions.sum_final_amount,
+        )
+        reduced_data.reduce_batch(
+            Batch.from_rows([{"store_id": "2", "tpv": "0.5"}]),
+            reduce_functions.sum_of("tpv"),
+        )
+
+        values_by_store_id = {}
+        while not reduced_data.is_empty():
+            batch_item = reduced_data.pop_next_batch_item()
+            values_by_store_id[batch_item["store_id"]] = batch_item["tpv"]
+        assert values_by_store_id == {"1": "4.5", "2": "2.5"}
+
+    def test_rows_with_empty_keys_are_skipped_before_reading_values(
+        self, tmp_path
+    ) -> None:
+        reduced_data = ReducedData(["store_id"], "tpv", str(tmp_path))
+        reduced_data.reduce_batch(
+            Batch(["store_id", "final_amount"], [["1", "", "1"], ["1.5", "", "3"]]),
+            reduce_functions.sum_final_amount,
+        )
+
+        batch_item = reduced_data.pop_next_batch_item()
+        assert batch_item == {"store_id": "1", "tpv": "4.5"}
+        assert reduced_data.is_empty()
@@ -0,0 +1,28 @@
+from server import session_ids
+
+
+class TestSessionIds:
+
+    # ============================== TESTS - VALIDATION ============================== #
+
+    def test_issued_session_id_is_valid(self) -> None:
+        session_key = session_ids.new_session_key()
+        session_id = session_ids.new_session_id(session_key)
+
+        assert session_ids.is_valid_session_id(session_key, session_id)
+
+    def test_session_id_issued_with_another_key_is_invalid(self) -> None:
+        session_id = session_ids.new_session_id(session_ids.new_session_key())
+
+        assert not session_ids.is_valid_session_id(
+            session_ids.new_session_key(), session_id
+        )
+
+    def test_tampered_or_malformed_session_ids_are_invalid(self) -> None:
+        session_key = session_ids.new_session_key()
+        session_id = session_ids.new_session_id(session_key)
+        tampered_session_id = ("0" if session_id[0] != "0" else "1") + session_id[1:]
+
+        assert not session_ids.is_valid_session_id(session_key, tampered_session_id)
+        assert not session_ids.is_valid_session_id(session_key, session_id[:-1])
+        assert not session_ids.is_valid_session_id(session_key, "")
@@ -0,0 +1,69 @@
+import time
+
+from tests.conftest import ProducerSpy
+
+from controllers.output_builders.shared.session_producer_cache import (
+    SessionProducerCache,
+)
+
+
+class TestSessionProducerCache:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _cache(self, idle_seconds: float = 60.0) -> SessionProducerCache:
+        self._built_producers: list[ProducerSpy] = []
+
+        def build_producer(session_id: str) -> ProducerSpy:
+            producer = ProducerSpy(session_id=session_id)
+            self._built_producers.append(producer)
+            return producer
+
+        return SessionProducerCache(build_producer, idle_seconds)  # type: ignore
+
+    # ============================== TESTS - CACHING ============================== #
+
+    def test_producers_are_built_once_per_session(self) -> None:
+        cache = self._cache()
+        for _ in range(3):
+            cache.producer_for("session-1").send("batch")
+        cache.producer_for("session-2").send("batch")
+
+        assert [p.session_id for p in self._built_producers] == [
+            "session-1",
+            "session-2",
+        ]
+        assert self._built_producers[0].sent_messages == ["batch"] * 3
+        assert cache.hits() == 2
+        assert cache.misses() == 2
+
+    # ============================== TESTS - EVICTION ============================== #
+
+    def test_evicted_producers_are_closed(self) -> None:
+        cache = self._cache()
+        producer = cache.producer_for("session-1")
+        cache.evict("session-1")
+        cache.evict("session-1")
+
+        assert producer.closed  # type: ignore
+        assert cache.cached_amount() == 0
+        assert cache.evictions() == 1
+
+    def test_idle_producers_are_evicted_on_access(self) -> None:
+        cache = self._cache(idle_seconds=0.05)
+        idle_producer = cache.producer_for("session-1")
+        time.sleep(0.06)
+        cache.producer_for("session-2")
+
+        assert idle_producer.closed  # type: ignore
+        assert cache.cached_amount() == 1
+        assert cache.evictions() == 1
+
+    def test_close_all_closes_every_producer(self) -> None:
+        cache = self._cache()
+        cache.producer_for("session-1")
+        cache.producer_for("session-2")
+        cache.close_all()
+
+        assert all(p.closed for p in self._built_producers)
+        assert cache.cached_amount() == 0
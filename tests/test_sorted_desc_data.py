@@ -0,0 +1,72 @@
+from controllers.sorters.shared.sorted_desc_data import SortedDescData
+
+
+class TestSortedDescData:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _sorted_desc_data(self, amount_per_group: int) -> SortedDescData:
+        return SortedDescData("store_id", "purchases_qty", amount_per_group)
+
+    def _pop_all(self, sorted_desc_data: SortedDescData) -> list[dict[str, str]]:
+        batch_items = []
+        while not sorted_desc_data.is_empty():
+            batch_items.append(sorted_desc_data.pop_next_batch_item())
+        return batch_items
+
+    # ============================== TESTS - SORTING ============================== #
+
+    def test_keeps_top_k_per_group_sorted_desc(self) -> None:
+        sorted_desc_data = self._sorted_desc_data(2)
+        for store_id, user_id, purchases_qty in [
+            ("1", "a", "3"),
+            ("2", "b", "1"),
+            ("1", "c", "7"),
+            ("1", "d", "5"),
+            ("2", "e", "4"),
+        ]:
+            sorted_desc_data.add_batch_item_keeping_sort_desc(
+                {
+                    "store_id": store_id,
+                    "user_id": user_id,
+                    "purchases_qty": purchases_qty,
+                }
+            )
+
+        assert [item["user_id"] for item in self._pop_all(sorted_desc_data)] == [
+            "c",
+            "d",
+            "e",
+            "b",
+        ]
+
+    def test_sort_values_are_compared_as_numbers(self) -> None:
+        sorted_desc_data = self._sorted_desc_data(1)
+        sorted_desc_data.add_batch_item_keeping_sort_desc(
+            {"store_id": "1", "purchases_qty": "9"}
+        )
+        sorted_desc_data.add_batch_item_keeping_sort_desc(
+            {"store_id": "1", "purchases_qty": "10"}
+        )
+
+        assert self._pop_all(sorted_desc_data)[0]["purchases_qty"] == "10"
+
+    def test_ties_keep_the_first_received_item(self) -> None:
+        sorted_desc_data = self._sorted_desc_data(2)
+        for user_id in ["a", "b", "c"]:
+            sorted_desc_data.add_batch_item_keeping_sort_desc(
+                {"store_id": "1", "user_id": user_id, "purchases_qty": "2"}
+            )
+
+        assert [item["user_id"] for item in self._pop_all(sorted_desc_data)] == [
+            "a",
+            "b",
+        ]
+
+    def test_invalid_sort_values_are_skipped(self) -> None:
+        sorted_desc_data = self._sorted_desc_data(3)
+        sorted_desc_data.add_batch_item_keeping_sort_desc(
+            {"store_id": "1", "purchases_qty": ""}
+        )
+
+        assert sorted_desc_data.is_empty()
@@ -0,0 +1,51 @@
+import os
+
+from controllers.joiners.shared.stream_data_buffer import StreamDataBuffer
+
+
+class TestStreamDataBuffer:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _spilled_files(self, spill_dir: str) -> list[str]:
+        return [name for name in os.listdir(spill_dir) if name.endswith(".log")]
+
+    # ============================== TESTS - BUFFERING ============================== #
+
+    def test_messages_past_the_memory_limit_are_spilled(self, tmp_path) -> None:
+        stream_data_buffer = StreamDataBuffer("session", 10, str(tmp_path))
+
+        for message in ["12345", "67890", "abcde", "fg\nhi"]:
+            stream_data_buffer.append(message)
+
+        assert stream_data_buffer.buffered_messages_amount() == 4
+        assert stream_data_buffer.bytes_in_memory() == 10
+        assert stream_data_buffer.spilled_bytes() == 10
+        assert len(self._spilled_files(str(tmp_path))) == 1
+
+    def test_messages_are_replayed_in_arrival_order(self, tmp_path) -> None:
+        stream_data_buffer = StreamDataBuffer("session", 10, str(tmp_path))
+        messages = ["12345", "67890", "abcde", "fg\nhi", "xyz"]
+        for message in messages:
+            stream_data_buffer.append(message)
+
+        assert list(stream_data_buffer.take_all()) == messages
+        assert stream_data_buffer.buffered_messages_amount() == 0
+        assert self._spilled_files(str(tmp_path)) == []
+
+    def test_nothing_is_spilled_without_memory_limit(self, tmp_path) -> None:
+        stream_data_buffer = StreamDataBuffer("session", 0, str(tmp_path))
+
+        for _ in range(100):
+            stream_data_buffer.append("message")
+
+        assert stream_data_buffer.spilled_bytes() == 0
+        assert self._spilled_files(str(tmp_path)) == []
+
+    def test_deleting_removes_the_spilled_messages(self, tmp_path) -> None:
+        stream_data_buffer = StreamDataBuffer("session", 1, str(tmp_path))
+        stream_data_buffer.append("message")
+
+        stream_data_buffer.delete()
+
+        assert self._spilled_files(str(tmp_path)) == []